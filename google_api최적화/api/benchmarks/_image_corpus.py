@@ -0,0 +1,78 @@
+"""
+벤치마크용 이미지 코퍼스 생성 - 휴대폰 사진처럼 EXIF/GPS/MakerNote를 포함합니다.
+"""
+import io
+import random
+from typing import Dict, List, Tuple
+
+from PIL import Image, TiffImagePlugin
+
+GPS_IFD = 0x8825
+EXIF_IFD = 0x8769
+
+
+def _phone_exif(latitude: float = 37.5796, longitude: float = 126.9770, maker_note_size: int = 32 * 1024) -> Image.Exif:
+    rational = TiffImagePlugin.IFDRational
+
+    def dms(value: float):
+        degrees = int(value)
+        minutes = int((value - degrees) * 60)
+        seconds = round(((value - degrees) * 60 - minutes) * 60 * 100)
+        return (rational(degrees, 1), rational(minutes, 1), rational(seconds, 100))
+
+    exif = Image.Exif()
+    exif[0x010F] = "Samsung"               # Make
+    exif[0x0110] = "Galaxy S23"            # Model
+    exif[0x0112] = 1                       # Orientation
+    exif[0x0132] = "2024:05:01 14:30:00"   # DateTime
+
+    exif[EXIF_IFD] = {
+        0x8827: 100,                       # ISOSpeedRatings
+        0x829A: rational(1, 120),          # ExposureTime
+        0x829D: rational(18, 10),          # FNumber
+        0x920A: rational(63, 10),          # FocalLength
+        0x927C: bytes(random.getrandbits(8) for _ in range(maker_note_size)),  # MakerNote
+    }
+    exif[GPS_IFD] = {
+        1: "N",
+        2: dms(latitude),
+        3: "E",
+        4: dms(longitude),
+    }
+    return exif
+
+
+def _noise_image(width: int, height: int) -> Image.Image:
+    """압축률이 실제 사진과 비슷하도록 저해상도 노이즈를 확대해 사용"""
+    small = Image.frombytes("RGB", (max(width // 16, 1), max(height // 16, 1)),
+                            bytes(random.getrandbits(8) for _ in range(max(width // 16, 1) * max(height // 16, 1) * 3)))
+    return small.resize((width, height), Image.BILINEAR)
+
+
+def make_image(fmt: str, size: Tuple[int, int], with_exif: bool = True) -> bytes:
+    image = _noise_image(*size)
+    buffer = io.BytesIO()
+    kwargs = {"exif": _phone_exif()} if with_exif else {}
+    if fmt == "JPEG":
+        image.save(buffer, "JPEG", quality=90, **kwargs)
+    elif fmt == "PNG":
+        image.save(buffer, "PNG", **kwargs)
+    elif fmt == "WEBP":
+        image.save(buffer, "WEBP", quality=85, **kwargs)
+    else:
+        raise ValueError(fmt)
+    return buffer.getvalue()
+
+
+def build_corpus(size: Tuple[int, int] = (1920, 1440), seed: int = 7) -> List[Dict]:
+    """JPEG/PNG/WebP, EXIF 유무 조합의 코퍼스"""
+    random.seed(seed)
+    corpus = []
+    for fmt in ("JPEG", "PNG", "WEBP"):
+        for with_exif in (True, False):
+            corpus.append({
+                "name": f"{fmt.lower()}{'' if with_exif else '-noexif'}",
+                "format": fmt,
+                "data": make_image(fmt, size, with_exif),
+            })
+    return corpus
@@ -0,0 +1,176 @@
+"""
+벤치마크용 로컬 스텁 서버 - 카카오/구글 API 응답을 흉내냅니다.
+요청마다 지연을 주입해 업스트림 지연 상황을 재현합니다.
+"""
+import json
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Union
+from urllib.parse import parse_qs, urlsplit
+
+Handler = Callable[[Dict[str, str]], dict]
+Delay = Union[float, Callable[[str, Dict[str, str]], float]]
+
+
+def kakao_routes(hit_categories=("AT4",)) -> Dict[str, Handler]:
+    """카카오 로컬 API 경로별 응답 (hit_categories에 포함된 카테고리만 결과 반환)"""
+    def coord2address(query):
+        return {"documents": [{
+            "address": {"address_name": "서울 종로구 세종로 1-1", "region_3depth_name": "세종로"},
+            "road_address": {"address_name": "서울 종로구 사직로 161"},
+        }]}
+
+    def category(query):
+        code = query.get("category_group_code")
+        if code not in hit_categories:
+            return {"documents": []}
+        return {"documents": [{
+            "place_name": f"스텁 장소 {code}",
+            "address_name": "서울 종로구 세종로 1-1",
+            "category_name": f"카테고리 > {code}",
+        }]}
+
+    def keyword(query):
+        return {"documents": [{
+            "place_name": query.get("query", ""),
+            "address_name": "서울 종로구 세종로 1-1",
+            "category_name": "검색 결과",
+        }]}
+
+    return {
+        "/v2/local/geo/coord2address.json": coord2address,
+        "/v2/local/search/category.json": category,
+        "/v2/local/search/keyword.json": keyword,
+    }
+
+
+def google_routes(hit_types=("tourist_attraction",)) -> Dict[str, Handler]:
+    """구글 Maps API 경로별 응답 (hit_types에 포함된 타입만 결과 반환)"""
+    def geocode(query):
+        return {"status": "OK", "results": [{
+            "formatted_address": "대한민국 서울특별시 종로구 사직로 161",
+            "address_components": [{"long_name": "종로구", "types": ["sublocality"]}],
+        }]}
+
+    def nearby(query):
+        place_type = query.get("type")
+        if place_type not in hit_types:
+            return {"status": "ZERO_RESULTS", "results": []}
+        return {"status": "OK", "results": [{
+            "place_id": f"stub-{place_type}",
+            "name": f"Stub {place_type}",
+            "vicinity": "종로구 사직로 161",
+            "types": [place_type, "point_of_interest"],
+        }]}
+
+    def details(query):
+        return {"status": "OK", "result": {
+            "name": f"Stub {query.get('place_id')}",
+            "formatted_address": "대한민국 서울특별시 종로구 사직로 161",
+            "types": ["tourist_attraction"],
+        }}
+
+    def textsearch(query):
+        return {"status": "OK", "results": [{
+            "place_id": f"stub-text-{query.get('query', '')}",
+            "name": query.get("query", ""),
+            "formatted_address": "대한민국 서울특별시 종로구 사직로 161",
+            "types": ["point_of_interest"],
+        }]}
+
+    return {
+        "/maps/api/geocode/json": geocode,
+        "/maps/api/place/nearbysearch/json": nearby,
+        "/maps/api/place/details/json": details,
+        "/maps/api/place/textsearch/json": textsearch,
+    }
+
+
+def vision_routes() -> Dict[str, Handler]:
+    """Google Vision TEXT_DETECTION 응답 (첫 항목은 전체 텍스트)"""
+    def annotate(query):
+        words = ["스타벅스", "카페", "종로점"]
+        return {"responses": [{"textAnnotations": [{"description": " ".join(words)}] + [
+            {"description": word} for word in words
+        ]}]}
+
+    return {"/v1/images:annotate": annotate}
+
+
+class _QuietHTTPServer(ThreadingHTTPServer):
+    def handle_error(self, request, client_address):
+        # 클라이언트가 취소한 요청(우선순위 fan-out 등)에 응답하다 끊긴 연결은 무시
+        if not isinstance(sys.exc_info()[1], ConnectionError):
+            super().handle_error(request, client_address)
+
+
+class StubServer:
+    """스레드 기반 HTTP/1.1 keep-alive 스텁 서버"""
+
+    def __init__(self, routes: Dict[str, Handler], delay: Delay = 0.0):
+        self.routes = routes
+        self.delay = delay
+        self.request_count = 0
+        self._lock = threading.Lock()
+        self._server = None
+        self._thread = None
+
+    def _make_handler(self):
+        stub = self
+
+        class _Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, format, *args):
+                pass
+
+            def _respond(self):
+                parts = urlsplit(self.path)
+                query = {k: v[0] for k, v in parse_qs(parts.query).items()}
+                length = int(self.headers.get("Content-Length") or 0)
+                if length:
+                    self.rfile.read(length)
+
+                with stub._lock:
+                    stub.request_count += 1
+
+                delay = stub.delay(parts.path, query) if callable(stub.delay) else stub.delay
+                if delay:
+                    time.sleep(delay)
+
+                handler = stub.routes.get(parts.path)
+                status, payload = (200, handler(query)) if handler else (404, {"error": "not found"})
+                body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            do_GET = _respond
+            do_POST = _respond
+
+        return _Handler
+
+    def start(self) -> str:
+        ThreadingHTTPServer.request_queue_size = 1024
+        self._server = _QuietHTTPServer(("127.0.0.1", 0), self._make_handler())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        host, port = self._server.server_address
+        return f"http://{host}:{port}"
+
+    def stop(self) -> None:
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+
+    def __enter__(self):
+        self.base_url = self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
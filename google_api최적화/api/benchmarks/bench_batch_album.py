@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+앨범 일괄 분석 벤치마크 - 사진별 capture-photo 요청 vs /batch/capture-photos
+
+여행 후 앨범 N장(K개 장소에 모여 있음)을 올리는 상황에서
+1) capture-photo 요청을 한 장씩 순서대로
+2) capture-photo 요청을 BATCH_CONCURRENCY개씩 동시에
+3) 일괄 multipart 요청 (NDJSON 스트리밍)
+4) 일괄 tar 요청
+의 전체 시간, 첫 결과까지의 시간, 장소 조회(업스트림) 호출 수를 비교합니다.
+장소 조회는 --delay 만큼 지연되는 스텁이며 지오 캐시는 시나리오마다 새로 시작합니다.
+지오 캐시를 켠 경우와 끈 경우(GEO_CACHE_ENABLED=False)를 각각 측정합니다.
+스트리밍 응답을 그대로 받기 위해 같은 프로세스의 스레드에서 uvicorn 서버를 띄웁니다.
+
+실행: python benchmarks/bench_batch_album.py [--photos 40] [--cells 5] [--delay 0.08] [--port 8766]
+"""
+import argparse
+import asyncio
+import io
+import json
+import os
+import random
+import shutil
+import sys
+import tarfile
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx  # noqa: E402
+import uvicorn  # noqa: E402
+
+from _image_corpus import _noise_image, _phone_exif  # noqa: E402
+from config import settings  # noqa: E402
+import main  # noqa: E402
+import services.local_storage_service as local_storage_module  # noqa: E402
+from models import PlaceInfo  # noqa: E402
+from services.place_cache import cached_by_coordinates  # noqa: E402
+
+
+def make_album(photos: int, cells: int, size=(1280, 960)):
+    """장소 cells곳에서 찍은 사진 photos장 (같은 장소 안에서는 수십 m 이내로 흩어짐)"""
+    random.seed(11)
+    album = []
+    for index in range(photos):
+        cell = index % cells
+        latitude = 37.55 + cell * 0.01 + random.uniform(0, 0.0003)
+        longitude = 126.97 + cell * 0.01 + random.uniform(0, 0.0003)
+        buffer = io.BytesIO()
+        _noise_image(*size).save(buffer, "JPEG", quality=85, exif=_phone_exif(latitude, longitude, maker_note_size=1024))
+        album.append((f"IMG_{index:04d}.jpg", buffer.getvalue()))
+    return album
+
+
+class StubGeocoder:
+    def __init__(self, scenario: str, delay: float):
+        self.delay = delay
+        self.calls = 0
+        self.get_place_by_coordinates = cached_by_coordinates(f"bench-{scenario}")(StubGeocoder._lookup).__get__(self)
+
+    async def _lookup(self, latitude: float, longitude: float):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        return PlaceInfo(place_name=f"장소 {latitude:.2f},{longitude:.2f}", address="서울", category="관광명소")
+
+
+async def individual(client: httpx.AsyncClient, album, concurrency: int):
+    semaphore = asyncio.Semaphore(concurrency)
+    first = None
+    start = time.perf_counter()
+
+    async def upload(name, data):
+        nonlocal first
+        async with semaphore:
+            response = await client.post("/api/v1/capture-photo", files={"file": (name, data, "image/jpeg")})
+            first = first or time.perf_counter()
+            return response.status_code == 202
+
+    ok = sum(await asyncio.gather(*(upload(name, data) for name, data in album)))
+    return ok, first - start, time.perf_counter() - start
+
+
+def make_tar(album) -> bytes:
+    # JPEG는 이미 압축되어 있으므로 gzip 없이 묶음
+    buffer = io.BytesIO()
+    with tarfile.open(fileobj=buffer, mode="w") as tar:
+        for name, data in album:
+            info = tarfile.TarInfo(f"album/{name}")
+            info.size = len(data)
+            tar.addfile(info, io.BytesIO(data))
+    return buffer.getvalue()
+
+
+async def batch(client: httpx.AsyncClient, album, archive: bytes = None):
+    start = time.perf_counter()
+    if archive is not None:
+        request = client.stream("POST", "/api/v1/batch/capture-photos/archive", content=archive,
+                                headers={"content-type": "application/x-tar"})
+    else:
+        request = client.stream("POST", "/api/v1/batch/capture-photos",
+                                files=[("files", (name, data, "image/jpeg")) for name, data in album])
+
+    ok, first = 0, None
+    async with request as response:
+        async for line in response.aiter_lines():
+            result = json.loads(line)
+            if result["type"] == "photo":
+                first = first or time.perf_counter()
+                ok += result["status"] == "PENDING"
+    return ok, first - start, time.perf_counter() - start
+
+
+def start_server(port: int) -> uvicorn.Server:
+    server = uvicorn.Server(uvicorn.Config(main.app, host="127.0.0.1", port=port, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    deadline = time.time() + 30
+    while not server.started:
+        if time.time() > deadline:
+            raise RuntimeError("server did not start")
+        time.sleep(0.05)
+    return server
+
+
+async def run(args) -> None:
+    album = make_album(args.photos, args.cells)
+    archive = make_tar(album)
+    total_mb = sum(len(data) for _, data in album) / 1024 / 1024
+    print(f"앨범 {args.photos}장 ({total_mb:.1f}MB), 장소 {args.cells}곳, 장소 조회 지연 {args.delay * 1000:.0f}ms, "
+          f"동시 처리 {settings.BATCH_CONCURRENCY}")
+
+    scenarios = [
+        ("capture-photo 순차", lambda c: individual(c, album, 1)),
+        (f"capture-photo 동시 {settings.BATCH_CONCURRENCY}", lambda c: individual(c, album, settings.BATCH_CONCURRENCY)),
+        ("batch multipart", lambda c: batch(c, album)),
+        ("batch tar", lambda c: batch(c, album, archive)),
+    ]
+    runs = 0
+    async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{args.port}", timeout=None) as client:
+        for geo_cache in (True, False):
+            settings.GEO_CACHE_ENABLED = geo_cache
+            print(f"\n지오 캐시 {'사용' if geo_cache else '미사용'}")
+            print(f"  {'방식':<24} {'성공':>4} {'첫 결과(ms)':>11} {'전체(ms)':>9} {'장소 조회':>8}")
+            for label, scenario in scenarios:
+                runs += 1
+                geocoder = StubGeocoder(str(runs), args.delay)
+                main.google_maps_service = geocoder
+                directory = tempfile.mkdtemp(prefix="bench-album-")
+                local_storage_module.local_storage_service = local_storage_module.LocalStorageService(upload_dir=directory)
+                try:
+                    ok, first, total = await scenario(client)
+                finally:
+                    shutil.rmtree(directory, ignore_errors=True)
+                print(f"  {label:<24} {ok:4d} {first * 1000:11.0f} {total * 1000:9.0f} {geocoder.calls:8d}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--photos", type=int, default=40)
+    parser.add_argument("--cells", type=int, default=5)
+    parser.add_argument("--delay", type=float, default=0.08)
+    parser.add_argument("--port", type=int, default=8766)
+    args = parser.parse_args()
+    server = start_server(args.port)
+    try:
+        asyncio.run(run(args))
+    finally:
+        server.should_exit = True
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+EXIF/GPS 추출 마이크로벤치마크 - 12MP~50MP 휴대폰 사진 크기
+
+- pil     : Image.open + _getexif (PNG는 EXIF를 읽으려고 픽셀까지 디코드)
+- exifread: exifread.process_file(details=False) (설치된 경우에만)
+- fast    : utils.exif_reader.read_exif_fields (헤더만 읽음)
+- 파이프라인: ImageContext 검증 + 메타데이터 추출, EXIF_FAST_PATH 끔/켬
+
+실행: python benchmarks/bench_exif_fast.py [--iterations 20] [--sizes 4000x3000,8160x6120]
+"""
+import argparse
+import gc
+import io
+import logging
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PIL import Image  # noqa: E402
+
+from _image_corpus import build_corpus  # noqa: E402
+from config import settings  # noqa: E402
+from utils.exif_processor import exif_processor  # noqa: E402
+from utils.exif_reader import read_exif_fields  # noqa: E402
+from utils.image_context import ImageContext  # noqa: E402
+
+try:
+    import exifread
+except ImportError:
+    exifread = None
+
+logging.getLogger("exifread").setLevel(logging.ERROR)
+Image.MAX_IMAGE_PIXELS = None  # 50MP 코퍼스 생성 시 DecompressionBombWarning 방지
+
+
+def pil_exif(data: bytes):
+    image = Image.open(io.BytesIO(data))
+    return image._getexif() if hasattr(image, '_getexif') else None
+
+
+def exifread_exif(data: bytes):
+    return exifread.process_file(io.BytesIO(data), details=False)
+
+
+def pipeline(data: bytes):
+    image = ImageContext(data)
+    image.verify()
+    return exif_processor.process_image_metadata(image)
+
+
+def pipeline_with(fast_path: bool):
+    def run(data: bytes):
+        settings.EXIF_FAST_PATH = fast_path
+        return pipeline(data)
+    return run
+
+
+def cpu_time_per_call(func, data: bytes, iterations: int, rounds: int = 3) -> float:
+    """라운드별 호출당 CPU ms 중 최솟값"""
+    func(data)  # 워밍업
+    samples = []
+    for _ in range(rounds):
+        gc.collect()
+        start = time.process_time()
+        for _ in range(iterations):
+            func(data)
+        samples.append((time.process_time() - start) / iterations * 1000)
+    return min(samples)
+
+
+def main(iterations: int, sizes) -> None:
+    candidates = [("pil", pil_exif), ("fast", read_exif_fields),
+                  ("pipe-pil", pipeline_with(False)), ("pipe-fast", pipeline_with(True))]
+    if exifread is not None:
+        candidates.insert(1, ("exifread", exifread_exif))
+
+    original = settings.EXIF_FAST_PATH
+    try:
+        for width, height in sizes:
+            corpus = build_corpus((width, height))
+            print(f"{width}x{height} ({width * height / 1e6:.0f}MP), 호출당 CPU ms")
+            print(f"  {'파일':<14} {'크기(KB)':>9} " + " ".join(f"{name:>10}" for name, _ in candidates))
+            for item in corpus:
+                # PNG 디코드는 수백 ms 단위라 반복 횟수를 줄임
+                runs = max(1, iterations // 10) if item["format"] == "PNG" else iterations
+                timings = [cpu_time_per_call(func, item["data"], runs) for _, func in candidates]
+                print(f"  {item['name']:<14} {len(item['data']) / 1024:9.0f} "
+                      + " ".join(f"{value:10.3f}" for value in timings))
+    finally:
+        settings.EXIF_FAST_PATH = original
+
+
+def parse_sizes(value: str):
+    return [tuple(int(part) for part in size.split("x")) for size in value.split(",")]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--sizes", type=parse_sizes, default=parse_sizes("4000x3000,8160x6120"))
+    args = parser.parse_args()
+    main(args.iterations, args.sizes)
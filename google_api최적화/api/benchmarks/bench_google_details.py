@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+구글 Place Details 호출 생략 벤치마크
+
+스텁 서버가 구글 API 요청마다 지연을 주입하고, 주변 장소 검색 + 키워드 검색 한 번씩의
+지연과 API 호출 수를 GOOGLE_PLACE_DETAILS_MODE별로 비교합니다.
+
+- always           : 기존 방식 (검색 후 항상 Details 호출, 캐시 비움)
+- auto             : 검색 결과에 이름/주소/타입이 있으면 Details 생략
+- auto (타입 누락)  : 검색 결과에 types가 없어 Details가 필요한 경우, place_id 캐시 적중 여부 비교
+
+실행: python benchmarks/bench_google_details.py [--delay 0.08] [--rounds 5]
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from _stub_server import StubServer, google_routes  # noqa: E402
+from config import settings  # noqa: E402
+from services.google_maps_service import GoogleMapsService  # noqa: E402
+from services.place_cache import place_details_cache, place_details_stats  # noqa: E402
+from utils.http_client import http_client  # noqa: E402
+
+LAT, LNG = 37.5796, 126.9770
+
+
+def routes_without_types():
+    routes = google_routes()
+    for path in ("/maps/api/place/nearbysearch/json", "/maps/api/place/textsearch/json"):
+        handler = routes[path]
+
+        def strip_types(query, handler=handler):
+            data = handler(query)
+            for result in data.get("results", []):
+                result.pop("types", None)
+            return data
+
+        routes[path] = strip_types
+    return routes
+
+
+async def lookup(google: GoogleMapsService):
+    await google._search_nearby_places(LAT, LNG)
+    await google.search_place_by_keyword("경복궁", LAT, LNG)
+
+
+async def measure(google: GoogleMapsService, stub: StubServer, rounds: int, clear_cache: bool):
+    samples = []
+    before = stub.request_count
+    for _ in range(rounds):
+        if clear_cache:
+            await place_details_cache.clear()
+        start = time.perf_counter()
+        await lookup(google)
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples) * 1000, (stub.request_count - before) / rounds
+
+
+async def main(delay: float, rounds: int) -> None:
+    settings.KEYWORD_CACHE_ENABLED = False
+    print(f"구글 API 지연 {delay * 1000:.0f}ms, 주변 장소 검색 + 키워드 검색 1회씩")
+    print(f"  {'방식':<28} {'지연(ms)':>10} {'API 호출':>9}")
+
+    scenarios = (
+        ("always (기존)", "always", google_routes(), True),
+        ("auto", "auto", google_routes(), True),
+        ("auto, 타입 누락, 캐시 없음", "auto", routes_without_types(), True),
+        ("auto, 타입 누락, place_id 캐시", "auto", routes_without_types(), False),
+    )
+    for label, mode, routes, clear_cache in scenarios:
+        settings.GOOGLE_PLACE_DETAILS_MODE = mode
+        with StubServer(routes, delay=delay) as stub:
+            google = GoogleMapsService()
+            google.base_url = f"{stub.base_url}/maps/api"
+            await place_details_cache.clear()
+            if not clear_cache:
+                await lookup(google)
+            elapsed, calls = await measure(google, stub, rounds, clear_cache)
+            print(f"  {label:<28} {elapsed:10.1f} {calls:9.1f}")
+        await http_client.aclose()
+
+    print(f"Details 통계: {place_details_stats.snapshot()}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--delay", type=float, default=0.08)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+    asyncio.run(main(args.delay, args.rounds))
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+공유 비동기 HTTP 클라이언트 벤치마크
+
+로컬 스텁 서버(요청당 지연 주입)를 대상으로 동시 역지오코딩 요청 처리량을 비교합니다.
+- before: async 함수 안에서 blocking requests.get 호출 (이벤트 루프 정지)
+- after : utils.http_client 공유 커넥션 풀 사용
+
+실행: python benchmarks/bench_http_client.py [--requests 100] [--delay 0.05]
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import requests  # noqa: E402
+
+from _stub_server import StubServer, google_routes, kakao_routes  # noqa: E402
+from config import settings  # noqa: E402
+from services.google_maps_service import GoogleMapsService  # noqa: E402
+from services.kakao_service import KakaoMapService  # noqa: E402
+from utils.http_client import http_client  # noqa: E402
+
+LAT, LNG = 37.5796, 126.9770
+
+
+async def legacy_kakao_lookup(base_url: str) -> None:
+    """기존 구현과 동일한 요청 흐름 (blocking requests)"""
+    response = requests.get(f"{base_url}/geo/coord2address.json", params={"x": LNG, "y": LAT})
+    response.raise_for_status()
+    response = requests.get(
+        f"{base_url}/search/category.json",
+        params={"category_group_code": "AT4", "x": LNG, "y": LAT, "radius": 500},
+    )
+    response.raise_for_status()
+
+
+async def run_concurrently(factory, count: int) -> float:
+    start = time.perf_counter()
+    await asyncio.gather(*(factory() for _ in range(count)))
+    return time.perf_counter() - start
+
+
+def report(label: str, count: int, elapsed: float) -> None:
+    print(f"  {label:<28} {elapsed:7.3f}s  {count / elapsed:8.1f} lookups/s")
+
+
+async def main(count: int, delay: float) -> None:
+    # 동일 좌표 반복 조회이므로 좌표 캐시를 끄고 순수 HTTP 처리량만 측정
+    settings.GEO_CACHE_ENABLED = False
+    print(f"동시 요청 {count}건, 업스트림 지연 {delay * 1000:.0f}ms")
+
+    with StubServer(kakao_routes(), delay=delay) as stub:
+        base_url = f"{stub.base_url}/v2/local"
+        kakao = KakaoMapService()
+        kakao.base_url = base_url
+
+        print("\n[Kakao]")
+        report("before (blocking requests)", count, await run_concurrently(lambda: legacy_kakao_lookup(base_url), count))
+        report("after  (shared async pool)", count, await run_concurrently(lambda: kakao.get_place_by_coordinates(LAT, LNG), count))
+
+    with StubServer(google_routes(), delay=delay) as stub:
+        google = GoogleMapsService()
+        google.base_url = f"{stub.base_url}/maps/api"
+
+        print("\n[Google Maps]")
+        report("after  (shared async pool)", count, await run_concurrently(lambda: google.get_place_by_coordinates(LAT, LNG), count))
+
+    await http_client.aclose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=100)
+    parser.add_argument("--delay", type=float, default=0.05)
+    args = parser.parse_args()
+    asyncio.run(main(args.requests, args.delay))
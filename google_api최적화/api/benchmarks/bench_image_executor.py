@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+이미지 작업 실행기 벤치마크 - 이미지 검증 중 이벤트 루프 지연
+
+동시 업로드 N건의 검증(validate 단계)을 inline / thread / process 실행기로 처리하면서
+10ms 주기 ticker로 이벤트 루프 지연(다른 요청이 기다리는 시간)을 측정합니다.
+
+실행: python benchmarks/bench_image_executor.py [--uploads 32] [--width 4000 --height 3000]
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from _image_corpus import build_corpus  # noqa: E402
+from utils.image_context import ImageContext, inspect_image  # noqa: E402
+from utils.image_executor import ImageWorkExecutor  # noqa: E402
+
+
+async def loop_lag(stop: asyncio.Event, interval: float = 0.01) -> float:
+    worst = 0.0
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(interval)
+        worst = max(worst, time.perf_counter() - start - interval)
+    return worst * 1000
+
+
+async def run(kind: str, workers: int, payloads) -> None:
+    executor = ImageWorkExecutor(kind, workers, max_queue=len(payloads), retry_after=1)
+    await executor.warm_up()
+
+    stop = asyncio.Event()
+    ticker = asyncio.ensure_future(loop_lag(stop))
+    await asyncio.sleep(0.05)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(
+        executor.run("validate", inspect_image, executor.payload(ImageContext(data))) for data in payloads
+    ))
+    elapsed = time.perf_counter() - start
+    stop.set()
+    worst_lag = await ticker
+
+    stage = executor.snapshot()["stages"]["validate"]
+    print(f"  {kind:<8} {elapsed * 1000:9.0f} {worst_lag:11.1f} {stage['queue_wait_ms_avg']:11.1f} {stage['exec_ms_avg']:9.1f}")
+    executor.shutdown()
+
+
+def main(uploads: int, workers: int, width: int, height: int) -> None:
+    corpus = build_corpus((width, height))
+    payloads = [corpus[i % len(corpus)]["data"] for i in range(uploads)]
+    print(f"{width}x{height} JPEG/PNG/WebP {uploads}건, 워커 {workers}개")
+    print(f"  {'실행기':<8} {'전체(ms)':>9} {'루프지연max':>11} {'대기avg(ms)':>11} {'실행avg':>9}")
+    for kind in ("inline", "thread", "process"):
+        asyncio.run(run(kind, workers, payloads))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--uploads", type=int, default=32)
+    parser.add_argument("--workers", type=int, default=min(4, os.cpu_count() or 1))
+    parser.add_argument("--width", type=int, default=4000)
+    parser.add_argument("--height", type=int, default=3000)
+    args = parser.parse_args()
+    main(args.uploads, args.workers, args.width, args.height)
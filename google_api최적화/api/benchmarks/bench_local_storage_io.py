@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+로컬 저장소 동시 기록 벤치마크 - 동기 기록 vs aiofiles 비동기 기록
+
+동시 업로드 N건을 LocalStorageService로 저장하면서 전체 시간, 처리량과
+10ms 주기 ticker로 이벤트 루프 지연(다른 요청이 기다리는 시간)을 측정합니다.
+
+- 동기 기록 (기존) : async 함수 안에서 open().write() / json.dump() 직접 호출
+- aiofiles         : 스레드 풀에서 임시 파일 기록 후 rename, LOCAL_STORAGE_FSYNC별 비교
+
+실행: python benchmarks/bench_local_storage_io.py [--uploads 64] [--size-mb 5]
+"""
+import argparse
+import asyncio
+import os
+import shutil
+import sys
+import tempfile
+import time
+import uuid
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import settings  # noqa: E402
+from services.local_storage_service import LocalStorageService  # noqa: E402
+from utils.image_context import ImageContext  # noqa: E402
+
+
+class BlockingLocalStorageService(LocalStorageService):
+    """기존 구현처럼 이벤트 루프에서 바로 파일을 기록"""
+
+    async def _file_size(self, path):
+        try:
+            return os.path.getsize(path)
+        except FileNotFoundError:
+            return None
+
+    async def _write_atomic(self, path, data):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+        with open(temp_path, 'wb') as f:
+            f.write(data)
+        os.replace(temp_path, path)
+
+
+async def loop_lag(stop: asyncio.Event, interval: float = 0.01) -> float:
+    worst = 0.0
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(interval)
+        worst = max(worst, time.perf_counter() - start - interval)
+    return worst * 1000
+
+
+async def run(label: str, storage: LocalStorageService, payloads, size_mb: float) -> None:
+    # 해시 계산은 제외하고 기록 비용만 비교
+    images = [ImageContext(data) for data in payloads]
+    for image in images:
+        image.sha256
+
+    stop = asyncio.Event()
+    ticker = asyncio.ensure_future(loop_lag(stop))
+    await asyncio.sleep(0.05)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(storage.upload_image(image, "image/jpeg", {"latitude": "37.57"}) for image in images))
+    elapsed = time.perf_counter() - start
+    stop.set()
+    worst_lag = await ticker
+
+    throughput = len(payloads) * size_mb / elapsed
+    print(f"  {label:<20} {elapsed * 1000:9.0f} {throughput:9.0f} {worst_lag:11.1f}")
+
+
+def main(uploads: int, size_mb: float) -> None:
+    settings.STORAGE_DEDUP_ENABLED = True
+    directory = tempfile.mkdtemp(prefix="storage-io-bench-")
+    scenarios = (
+        ("동기 기록 (기존)", BlockingLocalStorageService, "none"),
+        ("aiofiles, fsync none", LocalStorageService, "none"),
+        ("aiofiles, fsync file", LocalStorageService, "file"),
+        ("aiofiles, fsync full", LocalStorageService, "full"),
+    )
+    print(f"동시 업로드 {uploads}건 x {size_mb:.0f}MB, 샤드 깊이 {settings.LOCAL_STORAGE_SHARD_DEPTH}")
+    print(f"  {'방식':<20} {'전체(ms)':>9} {'MB/s':>9} {'루프지연max':>11}")
+    try:
+        for i, (label, storage_class, policy) in enumerate(scenarios):
+            settings.LOCAL_STORAGE_FSYNC = policy
+            payloads = [os.urandom(int(size_mb * 1024 * 1024)) for _ in range(uploads)]
+            storage = storage_class(upload_dir=os.path.join(directory, str(i)))
+            asyncio.run(run(label, storage, payloads, size_mb))
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--uploads", type=int, default=64)
+    parser.add_argument("--size-mb", type=float, default=5)
+    args = parser.parse_args()
+    main(args.uploads, args.size_mb)
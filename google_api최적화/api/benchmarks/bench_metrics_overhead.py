@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+메트릭/추적 미들웨어 오버헤드 벤치마크
+
+거의 일을 하지 않는 라우트(/ping, /items/{item_id} POST)에 요청 N건을 보내
+미들웨어 없음 / MetricsMiddleware / TracingMiddleware / 둘 다의 요청당 처리 시간을 비교하고,
+upstream_call() 한 번의 비용도 측정합니다.
+네트워크를 거치지 않도록 httpx ASGITransport로 앱을 직접 호출합니다.
+
+실행: python benchmarks/bench_metrics_overhead.py [--requests 3000] [--body-kb 64]
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx  # noqa: E402
+from fastapi import FastAPI, Request  # noqa: E402
+
+from utils.metrics import MetricsMiddleware, upstream_call  # noqa: E402
+from utils.tracing import TracingMiddleware  # noqa: E402
+
+
+def make_app(middlewares) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/ping")
+    async def ping():
+        return {"ok": True}
+
+    @app.post("/items/{item_id}")
+    async def upload(item_id: str, request: Request):
+        return {"id": item_id, "size": len(await request.body())}
+
+    for middleware in middlewares:
+        app.add_middleware(middleware)
+    return app
+
+
+async def measure(app: FastAPI, requests: int, body: bytes) -> float:
+    """요청당 평균 시간 (µs, GET/POST 번갈아)"""
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for _ in range(50):  # 워밍업
+            await client.get("/ping")
+        start = time.perf_counter()
+        for index in range(requests):
+            if index % 2:
+                await client.post(f"/items/{index}", content=body)
+            else:
+                await client.get("/ping")
+        return (time.perf_counter() - start) / requests * 1e6
+
+
+def measure_upstream_call(iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        with upstream_call("bench", "noop"):
+            pass
+    return (time.perf_counter() - start) / iterations * 1e9
+
+
+async def run(args) -> None:
+    body = os.urandom(args.body_kb * 1024)
+    variants = [
+        ("미들웨어 없음", []),
+        ("MetricsMiddleware", [MetricsMiddleware]),
+        ("TracingMiddleware", [TracingMiddleware]),
+        ("Metrics + Tracing", [TracingMiddleware, MetricsMiddleware]),
+    ]
+    print(f"요청 {args.requests}건 (GET /ping, POST {args.body_kb}KB 번갈아)")
+    print(f"  {'구성':<20} {'요청당(µs)':>10} {'추가(µs)':>9}")
+    baseline = None
+    for label, middlewares in variants:
+        per_request = await measure(make_app(middlewares), args.requests, body)
+        baseline = baseline if baseline is not None else per_request
+        print(f"  {label:<20} {per_request:10.1f} {per_request - baseline:9.1f}")
+
+    print(f"\nupstream_call() 1회: {measure_upstream_call(args.requests * 20):.0f}ns")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=3000)
+    parser.add_argument("--body-kb", type=int, default=64)
+    asyncio.run(run(parser.parse_args()))
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+주변 장소 카테고리 검색 지연 벤치마크
+
+스텁 서버가 카테고리 검색마다 지연을 주입하고, 어느 순위의 카테고리에서
+결과가 나오는지에 따라 순차 검색과 동시 fan-out 검색의 지연을 비교합니다.
+
+실행: python benchmarks/bench_nearby_fanout.py [--delay 0.08] [--rounds 5]
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from _stub_server import StubServer, kakao_routes  # noqa: E402
+from services.kakao_service import KakaoMapService  # noqa: E402
+from utils.http_client import http_client  # noqa: E402
+
+LAT, LNG = 37.5796, 126.9770
+
+SCENARIOS = {
+    "1순위 적중 (AT4)": ("AT4",),
+    "2순위 적중 (CT1)": ("CT1",),
+    "3순위 적중 (PK6)": ("PK6",),
+    "결과 없음": (),
+}
+
+
+async def sequential_lookup(kakao: KakaoMapService):
+    """기존 구현: 카테고리를 하나씩 순서대로 조회"""
+    for category in kakao.nearby_categories:
+        place = await kakao._search_category(category, LAT, LNG)
+        if place:
+            return place
+    return None
+
+
+async def measure(factory, rounds: int) -> float:
+    samples = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        await factory()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples) * 1000
+
+
+async def main(delay: float, rounds: int) -> None:
+    print(f"카테고리 검색 지연 {delay * 1000:.0f}ms, 카테고리 {','.join(KakaoMapService().nearby_categories)}")
+    print(f"  {'시나리오':<18} {'순차(ms)':>10} {'동시(ms)':>10}")
+
+    for label, hits in SCENARIOS.items():
+        with StubServer(kakao_routes(hit_categories=hits), delay=delay) as stub:
+            kakao = KakaoMapService()
+            kakao.base_url = f"{stub.base_url}/v2/local"
+
+            sequential = await measure(lambda: sequential_lookup(kakao), rounds)
+            concurrent = await measure(lambda: kakao._search_nearby_places(LAT, LNG), rounds)
+            print(f"  {label:<18} {sequential:10.1f} {concurrent:10.1f}")
+
+        await http_client.aclose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--delay", type=float, default=0.08)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+    asyncio.run(main(args.delay, args.rounds))
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+주거지역 분석 주변 편의시설 조회 벤치마크
+
+스텁 서버가 카카오 API 요청마다 지연을 주입하고, 주거지역 전략의 위치 조회 +
+편의시설 5종 조회를 기존 방식(키워드 검색 5회 순차)과 배치 방식(카테고리 검색 동시 +
+역지오코딩 동시)으로 비교합니다. 배치 방식은 같은 셀 재요청(캐시 적중)도 측정합니다.
+
+실행: python benchmarks/bench_residential_facilities.py [--delay 0.08] [--rounds 5]
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from _stub_server import StubServer, kakao_routes  # noqa: E402
+from config import settings  # noqa: E402
+from services.kakao_service import KakaoMapService  # noqa: E402
+from services.place_cache import facility_place_cache, geo_place_cache  # noqa: E402
+from utils.http_client import http_client  # noqa: E402
+
+LAT, LNG = 37.5796, 126.9770
+FACILITY_CODES = ("CS2", "MT1", "HP8", "SC4")
+
+
+async def sequential_lookup(kakao: KakaoMapService):
+    """기존 구현: 역지오코딩 후 편의시설 키워드를 하나씩 검색"""
+    location_info = await kakao.get_place_by_coordinates(LAT, LNG)
+    facilities = []
+    for keyword in settings.NEARBY_FACILITY_TYPES:
+        facility = await kakao.search_place_by_keyword(keyword, LAT, LNG)
+        if facility:
+            facilities.append((keyword, facility))
+    return location_info, facilities
+
+
+async def batch_lookup(kakao: KakaoMapService):
+    return await asyncio.gather(
+        kakao.get_place_by_coordinates(LAT, LNG),
+        kakao.search_nearby_facilities(LAT, LNG)
+    )
+
+
+async def measure(factory, rounds: int, clear_cache: bool) -> float:
+    samples = []
+    for _ in range(rounds):
+        if clear_cache:
+            await geo_place_cache.clear()
+            await facility_place_cache.clear()
+        start = time.perf_counter()
+        await factory()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples) * 1000
+
+
+async def main(delay: float, rounds: int) -> None:
+    settings.KEYWORD_CACHE_ENABLED = False
+    print(f"카카오 API 지연 {delay * 1000:.0f}ms, 편의시설 {','.join(settings.NEARBY_FACILITY_TYPES)}")
+    print(f"  {'방식':<22} {'지연(ms)':>10} {'API 호출':>9}")
+
+    with StubServer(kakao_routes(hit_categories=("AT4",) + FACILITY_CODES), delay=delay) as stub:
+        kakao = KakaoMapService()
+        kakao.base_url = f"{stub.base_url}/v2/local"
+
+        scenarios = (
+            ("순차 키워드 검색", lambda: sequential_lookup(kakao), True),
+            ("배치 (캐시 없음)", lambda: batch_lookup(kakao), True),
+            ("배치 (같은 셀 재요청)", lambda: batch_lookup(kakao), False),
+        )
+        for label, factory, clear_cache in scenarios:
+            before = stub.request_count
+            elapsed = await measure(factory, rounds, clear_cache)
+            calls = (stub.request_count - before) / rounds
+            print(f"  {label:<22} {elapsed:10.1f} {calls:9.1f}")
+
+    await http_client.aclose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--delay", type=float, default=0.08)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+    asyncio.run(main(args.delay, args.rounds))
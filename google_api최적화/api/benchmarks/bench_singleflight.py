@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+동일 요청 합치기(single-flight) 벤치마크
+
+같은 장소에서 단체 관광객이 동시에 사진을 올린 상황을 재현합니다.
+캐시가 빈 상태에서 같은 좌표의 역지오코딩 N건과 같은 이미지의 텍스트 추출 N건을
+동시에 실행하고, 스텁 서버가 받은 업스트림 요청 수와 지연을 비교합니다.
+
+실행: python benchmarks/bench_singleflight.py [--concurrency 50] [--delay 0.1]
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from _stub_server import StubServer, kakao_routes, vision_routes  # noqa: E402
+from config import settings  # noqa: E402
+from services.kakao_service import KakaoMapService  # noqa: E402
+from services.place_cache import geo_place_cache  # noqa: E402
+from services.vision_service import GoogleVisionService  # noqa: E402
+from utils.http_client import http_client  # noqa: E402
+from utils.singleflight import singleflight_stats  # noqa: E402
+
+LAT, LNG = 37.5796, 126.9770
+IMAGE = os.urandom(512 * 1024)
+
+
+async def burst(stub: StubServer, concurrency: int, factory):
+    before = stub.request_count
+    start = time.perf_counter()
+    await asyncio.gather(*(factory(i) for i in range(concurrency)))
+    return (time.perf_counter() - start) * 1000, stub.request_count - before
+
+
+async def main(concurrency: int, delay: float) -> None:
+    routes = {**kakao_routes(), **vision_routes()}
+    print(f"동시 요청 {concurrency}건, 업스트림 지연 {delay * 1000:.0f}ms")
+    print(f"  {'작업':<20} {'single-flight':<14} {'지연(ms)':>10} {'업스트림 요청':>12}")
+
+    for enabled in (False, True):
+        settings.SINGLEFLIGHT_ENABLED = enabled
+        label = "on" if enabled else "off"
+        with StubServer(routes, delay=delay) as stub:
+            kakao = KakaoMapService()
+            kakao.base_url = f"{stub.base_url}/v2/local"
+            vision = GoogleVisionService(api_key="stub")
+            vision.base_url = f"{stub.base_url}/v1/images:annotate"
+
+            await geo_place_cache.clear()
+            # 같은 지오해시 셀 안의 조금씩 다른 좌표
+            elapsed, calls = await burst(
+                stub, concurrency, lambda i: kakao.get_place_by_coordinates(LAT + i * 1e-6, LNG)
+            )
+            print(f"  {'역지오코딩 (같은 셀)':<20} {label:<14} {elapsed:10.1f} {calls:12d}")
+
+            elapsed, calls = await burst(stub, concurrency, lambda i: vision.extract_korean_text(IMAGE))
+            print(f"  {'텍스트 추출 (같은 이미지)':<20} {label:<14} {elapsed:10.1f} {calls:12d}")
+        await http_client.aclose()
+
+    for name in ("reverse_geocode", "vision_ocr"):
+        print(f"{name}: {singleflight_stats()[name]}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--delay", type=float, default=0.1)
+    args = parser.parse_args()
+    asyncio.run(main(args.concurrency, args.delay))
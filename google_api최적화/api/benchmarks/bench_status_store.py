@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+분석 상태 저장소 처리량 벤치마크 (백엔드별 create / get / transition ops/s)
+
+- memory: 프로세스 메모리 (TTL + 최대 개수)
+- sqlite: 임시 디렉토리의 WAL 모드 SQLite 파일
+- redis : REDIS_URL 서버에 연결되는 경우에만 측정
+
+실행: python benchmarks/bench_status_store.py [--requests 2000] [--concurrency 50]
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+import uuid
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import settings  # noqa: E402
+from models import AnalysisStatus  # noqa: E402
+from services.status_store import (  # noqa: E402
+    MemoryStatusStore,
+    RedisStatusStore,
+    SQLiteStatusStore,
+)
+
+
+async def measure(func, items, concurrency: int) -> float:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def bounded(item):
+        async with semaphore:
+            await func(item)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(bounded(item) for item in items))
+    return len(items) / (time.perf_counter() - start)
+
+
+async def bench(store, requests: int, concurrency: int) -> None:
+    ids = [str(uuid.uuid4()) for _ in range(requests)]
+    result = {"labels": ["경복궁", "근정전"], "confidence": 0.93}
+
+    create = await measure(
+        lambda request_id: store.create(AnalysisStatus(request_id=request_id, status="PENDING", progress=0)),
+        ids, concurrency,
+    )
+    get = await measure(store.get, ids, concurrency)
+    transition = await measure(
+        lambda request_id: store.transition(request_id, "COMPLETED", result=result, progress=100),
+        ids, concurrency,
+    )
+    print(f"  {store.name:<8} {create:10.0f} {get:10.0f} {transition:12.0f}")
+    await store.close()
+
+
+async def redis_store():
+    store = RedisStatusStore(settings.REDIS_URL, prefix=f"{settings.REDIS_KEY_PREFIX}bench-status:", ttl=600)
+    try:
+        await asyncio.wait_for(store.client.ping(), timeout=1)
+        return store
+    except Exception as e:
+        print(f"  redis    건너뜀 ({settings.REDIS_URL}: {e})")
+        await store.close()
+        return None
+
+
+async def main(requests: int, concurrency: int) -> None:
+    print(f"요청 {requests}건, 동시성 {concurrency} (ops/s)")
+    print(f"  {'백엔드':<8} {'create':>10} {'get':>10} {'transition':>12}")
+    await bench(MemoryStatusStore(ttl=600, max_size=requests * 2), requests, concurrency)
+    with tempfile.TemporaryDirectory() as directory:
+        await bench(SQLiteStatusStore(os.path.join(directory, "status.db"), ttl=600), requests, concurrency)
+    store = await redis_store()
+    if store is not None:
+        await bench(store, requests, concurrency)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    args = parser.parse_args()
+    asyncio.run(main(args.requests, args.concurrency))
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+업로드 중복 제거 벤치마크 - 해시 계산 비용 vs 생략된 기록
+
+1) 크기별 sha256 계산 시간과 파일 기록 시간 비교
+2) 업로드 N건 중 일부가 같은 사진(재시도/재업로드)인 작업 부하에서
+   UUID 저장(기존)과 내용 해시 저장의 전체 시간, 기록 바이트 비교
+
+실행: python benchmarks/bench_storage_dedup.py [--uploads 200] [--repeat-ratio 0.3] [--size-mb 5]
+"""
+import argparse
+import asyncio
+import hashlib
+import os
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import settings  # noqa: E402
+from services.local_storage_service import LocalStorageService  # noqa: E402
+from utils.image_context import ImageContext  # noqa: E402
+
+
+def median_ms(func, rounds: int = 5) -> float:
+    samples = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples) * 1000
+
+
+def hash_vs_write(sizes_mb, directory: str) -> None:
+    print(f"  {'크기':>6} {'sha256(ms)':>11} {'기록(ms)':>9} {'해시/기록':>9}")
+    for size_mb in sizes_mb:
+        data = os.urandom(int(size_mb * 1024 * 1024))
+        path = os.path.join(directory, "probe.bin")
+
+        def write():
+            with open(path, "wb") as f:
+                f.write(data)
+
+        hash_ms = median_ms(lambda: hashlib.sha256(data).hexdigest())
+        write_ms = median_ms(write)
+        print(f"  {size_mb:5.0f}M {hash_ms:11.2f} {write_ms:9.2f} {hash_ms / write_ms:9.2f}")
+        os.remove(path)
+
+
+async def workload(uploads: int, repeat_ratio: float, size_mb: float, dedup: bool, directory: str) -> None:
+    settings.STORAGE_DEDUP_ENABLED = dedup
+    storage = LocalStorageService(upload_dir=directory)
+    rng = random.Random(42)
+    unique = [os.urandom(int(size_mb * 1024 * 1024)) for _ in range(max(1, int(uploads * (1 - repeat_ratio))))]
+    sequence = unique + [rng.choice(unique) for _ in range(uploads - len(unique))]
+    rng.shuffle(sequence)
+
+    start = time.perf_counter()
+    for data in sequence:
+        await storage.upload_image(ImageContext(data), "image/jpeg", {"latitude": "37.57"})
+    elapsed = time.perf_counter() - start
+
+    stats = storage.stats.snapshot()
+    label = "내용 해시" if dedup else "UUID (기존)"
+    print(f"  {label:<12} {elapsed * 1000:9.0f} {stats['bytes_written'] / 1048576:12.0f} "
+          f"{stats['dedup_hits']:9d} {stats['bytes_saved'] / 1048576:11.0f}")
+
+
+def main(uploads: int, repeat_ratio: float, size_mb: float) -> None:
+    directory = tempfile.mkdtemp(prefix="dedup-bench-")
+    try:
+        print("해시 계산 vs 파일 기록 (페이지 캐시 기록, fsync 없음)")
+        hash_vs_write((1, 5, 10), directory)
+
+        print(f"\n업로드 {uploads}건 x {size_mb:.0f}MB, 중복 비율 {repeat_ratio:.0%}")
+        print(f"  {'저장 방식':<12} {'전체(ms)':>9} {'기록(MB)':>12} {'중복 생략':>9} {'절약(MB)':>11}")
+        for dedup in (False, True):
+            target = os.path.join(directory, "dedup" if dedup else "uuid")
+            asyncio.run(workload(uploads, repeat_ratio, size_mb, dedup, target))
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--uploads", type=int, default=200)
+    parser.add_argument("--repeat-ratio", type=float, default=0.3)
+    parser.add_argument("--size-mb", type=float, default=5)
+    args = parser.parse_args()
+    main(args.uploads, args.repeat_ratio, args.size_mb)
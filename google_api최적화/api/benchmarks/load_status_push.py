@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+분석 상태 전달 부하 테스트 - 클라이언트 폴링 vs long-poll vs SSE
+
+같은 프로세스에서 uvicorn으로 앱을 띄우고, 분석 요청 N건을 PENDING으로 만든 뒤
+Lambda 역할로 /analysis-result 에 진행률(PROCESSING)과 완료(COMPLETED)를 보냅니다.
+클라이언트는 각 방식으로 상태를 받아 완료될 때까지 대기합니다.
+
+- poll     : 기존 프론트엔드처럼 일정 주기로 GET /analysis-status/{id}
+- longpoll : GET /analysis-status/{id}?wait=25&version=N (변경 시에만 응답)
+- sse      : GET /analysis-status/{id}/events 스트림 1개
+
+방식별 HTTP 요청 수와 완료 알림 지연(완료 전송 → 클라이언트 수신)을 출력합니다.
+
+실행: python benchmarks/load_status_push.py [--clients 200] [--duration 12] [--poll-interval 3]
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import socket
+import sys
+import time
+import uuid
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx  # noqa: E402
+import uvicorn  # noqa: E402
+
+from main import app  # noqa: E402
+from models import AnalysisStatus  # noqa: E402
+from services.status_store import status_store  # noqa: E402
+
+PROGRESS_STEPS = (25, 50, 75)
+
+logging.getLogger("httpx").setLevel(logging.WARNING)
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def poll_client(client: httpx.AsyncClient, request_id: str, interval: float) -> int:
+    requests = 0
+    while True:
+        requests += 1
+        data = (await client.get(f"/api/v1/analysis-status/{request_id}")).json()
+        if data["status"] == "COMPLETED":
+            return requests
+        await asyncio.sleep(interval)
+
+
+async def longpoll_client(client: httpx.AsyncClient, request_id: str, interval: float) -> int:
+    requests = 0
+    version = 0
+    while True:
+        requests += 1
+        data = (await client.get(
+            f"/api/v1/analysis-status/{request_id}", params={"wait": 25, "version": version}
+        )).json()
+        version = data.get("version", version)
+        if data["status"] == "COMPLETED":
+            return requests
+
+
+async def sse_client(client: httpx.AsyncClient, request_id: str, interval: float) -> int:
+    async with client.stream("GET", f"/api/v1/analysis-status/{request_id}/events") as response:
+        event = None
+        async for line in response.aiter_lines():
+            if line.startswith("event: "):
+                event = line[7:]
+            elif line.startswith("data: ") and event == "status":
+                if json.loads(line[6:])["status"] == "COMPLETED":
+                    return 1
+    raise RuntimeError(f"stream closed before completion: {request_id}")
+
+
+CLIENTS = {"poll": poll_client, "longpoll": longpoll_client, "sse": sse_client}
+
+
+async def run_mode(base_url: str, mode: str, clients: int, duration: float, interval: float) -> None:
+    request_ids = [str(uuid.uuid4()) for _ in range(clients)]
+    for request_id in request_ids:
+        await status_store.create(AnalysisStatus(
+            request_id=request_id, status="PENDING", message="Analysis queued", progress=0
+        ))
+
+    completed_at = {}
+    received_at = {}
+    limits = httpx.Limits(max_connections=clients + 10, max_keepalive_connections=clients + 10)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as lambda_client:
+
+        async def watch(request_id: str) -> int:
+            # 브라우저처럼 클라이언트마다 자기 연결을 사용
+            async with httpx.AsyncClient(base_url=base_url, timeout=60) as client:
+                requests = await CLIENTS[mode](client, request_id, interval)
+            received_at[request_id] = time.perf_counter()
+            return requests
+
+        async def lambda_worker(request_id: str, offset: float) -> None:
+            # 요청마다 완료 시점을 조금씩 흩뜨려 폴링 주기와의 위상 차이를 반영
+            step = duration / (len(PROGRESS_STEPS) + 1)
+            await asyncio.sleep(offset)
+            for progress in PROGRESS_STEPS:
+                await asyncio.sleep(step)
+                await lambda_client.post("/api/v1/analysis-result", json={
+                    "request_id": request_id, "status": "PROCESSING", "progress": progress
+                })
+            await asyncio.sleep(step)
+            completed_at[request_id] = time.perf_counter()
+            await lambda_client.post("/api/v1/analysis-result", json={"request_id": request_id})
+
+        start = time.perf_counter()
+        watchers = asyncio.gather(*(watch(request_id) for request_id in request_ids))
+        await asyncio.gather(*(
+            lambda_worker(request_id, (i / clients) * interval) for i, request_id in enumerate(request_ids)
+        ))
+        request_counts = await watchers
+        elapsed = time.perf_counter() - start
+
+    latencies = sorted((received_at[rid] - completed_at[rid]) * 1000 for rid in request_ids)
+    total = sum(request_counts)
+    print(f"  {mode:<9} {total:8d} {total / clients:8.1f} {total / elapsed:9.1f} "
+          f"{sum(latencies) / len(latencies):10.0f} {latencies[int(len(latencies) * 0.95) - 1]:9.0f}")
+
+
+async def main(clients: int, duration: float, interval: float, modes) -> None:
+    port = free_port()
+    # 클라이언트가 재사용하려는 keep-alive 연결을 서버가 먼저 닫는 경합을 피하도록 넉넉히 설정
+    server = uvicorn.Server(uvicorn.Config(
+        app, host="127.0.0.1", port=port, log_level="warning", timeout_keep_alive=60
+    ))
+    serving = asyncio.ensure_future(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.05)
+
+    print(f"분석 {clients}건, 분석 시간 {duration:.0f}s (진행률 {len(PROGRESS_STEPS)}회 + 완료), 폴링 주기 {interval:.0f}s")
+    print(f"  {'방식':<9} {'요청 수':>8} {'건당':>8} {'요청/s':>9} {'지연avg(ms)':>10} {'p95(ms)':>9}")
+    try:
+        for mode in modes:
+            await run_mode(f"http://127.0.0.1:{port}", mode, clients, duration, interval)
+    finally:
+        server.should_exit = True
+        await serving
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--clients", type=int, default=200)
+    parser.add_argument("--duration", type=float, default=12.0)
+    parser.add_argument("--poll-interval", type=float, default=3.0)
+    parser.add_argument("--mode", choices=["poll", "longpoll", "sse", "all"], default="all")
+    args = parser.parse_args()
+    modes = list(CLIENTS) if args.mode == "all" else [args.mode]
+    asyncio.run(main(args.clients, args.duration, args.poll_interval, modes))
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+업로드 수신 부하 테스트 - 동시 대용량 업로드 시 서버 최대 RSS (Linux /proc 기준)
+
+uvicorn 서버를 하위 프로세스로 띄우고 /test-photo-simple 에 동시 업로드한 뒤
+서버 프로세스의 VmHWM(최대 RSS)을 출력합니다.
+
+- spool : 기본 설정 (1MB 초과 업로드는 스풀된 임시 파일을 mmap으로 사용)
+- memory: UPLOAD_SPOOL_MAX_MEMORY를 크게 설정해 기존처럼 요청마다 bytes로 읽음
+
+마지막으로 100MB Content-Length 요청이 본문 전송 없이 413으로 거부되는지 확인합니다.
+
+실행: python benchmarks/load_upload_rss.py [--concurrency 200] [--size-mb 10] [--mode spool|memory|both]
+"""
+import argparse
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import time
+
+API_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, API_DIR)
+
+import httpx  # noqa: E402
+
+from _image_corpus import make_image  # noqa: E402
+
+UPLOAD_PATH = "/api/v1/test-photo-simple"
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def read_rss_kb(pid: int, field: str) -> int:
+    with open(f"/proc/{pid}/status") as status:
+        for line in status:
+            if line.startswith(field + ":"):
+                return int(line.split()[1])
+    return 0
+
+
+def build_payload(size: int) -> bytes:
+    """GPS EXIF가 있는 JPEG 뒤에 패딩을 붙여 지정 크기로 맞춤 (EOI 이후 데이터는 디코더가 무시)"""
+    image = make_image("JPEG", (1920, 1440))
+    return image + b"\0" * max(0, size - len(image))
+
+
+def start_server(port: int, env_overrides: dict) -> subprocess.Popen:
+    env = dict(os.environ, **env_overrides)
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1", "--port", str(port),
+         "--log-level", "warning"],
+        cwd=API_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    deadline = time.time() + 30
+    while time.time() < deadline:
+        try:
+            httpx.get(f"http://127.0.0.1:{port}/health", timeout=1)
+            return process
+        except httpx.HTTPError:
+            time.sleep(0.2)
+    process.kill()
+    raise RuntimeError("server did not start")
+
+
+async def upload_all(base_url: str, payload: bytes, concurrency: int):
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=300) as client:
+        async def upload(index: int) -> int:
+            response = await client.post(UPLOAD_PATH, files={"file": (f"{index}.jpg", payload, "image/jpeg")})
+            return response.status_code
+
+        return await asyncio.gather(*(upload(i) for i in range(concurrency)))
+
+
+def oversized_rejection(port: int) -> str:
+    """100MB Content-Length 헤더만 보내고 응답을 기다림 (본문은 보내지 않음)"""
+    with socket.create_connection(("127.0.0.1", port), timeout=10) as sock:
+        start = time.perf_counter()
+        sock.sendall((
+            f"POST {UPLOAD_PATH} HTTP/1.1\r\nHost: 127.0.0.1\r\n"
+            "Content-Type: multipart/form-data; boundary=x\r\n"
+            f"Content-Length: {100 * 1024 * 1024}\r\n\r\n"
+        ).encode())
+        status_line = sock.recv(4096).split(b"\r\n", 1)[0].decode()
+        return f"{status_line} ({(time.perf_counter() - start) * 1000:.1f}ms, 본문 0 bytes 전송)"
+
+
+def run(mode: str, payload: bytes, concurrency: int) -> None:
+    port = free_port()
+    overrides = {"DEBUG": "False"}
+    if mode == "memory":
+        overrides["UPLOAD_SPOOL_MAX_MEMORY"] = str(len(payload) + 1)
+    server = start_server(port, overrides)
+    try:
+        baseline = read_rss_kb(server.pid, "VmRSS")
+        start = time.perf_counter()
+        statuses = asyncio.run(upload_all(f"http://127.0.0.1:{port}", payload, concurrency))
+        elapsed = time.perf_counter() - start
+        peak = read_rss_kb(server.pid, "VmHWM")
+
+        ok = sum(1 for status in statuses if status == 200)
+        print(f"[{mode}] {concurrency}개 x {len(payload) / 1024 / 1024:.1f}MB: 성공 {ok}/{concurrency}, {elapsed:.1f}s")
+        print(f"  서버 RSS 시작 {baseline / 1024:.0f}MB -> 최대 {peak / 1024:.0f}MB (증가 {(peak - baseline) / 1024:.0f}MB)")
+        if mode == "spool":
+            print(f"  100MB 업로드 거부: {oversized_rejection(port)}")
+    finally:
+        server.terminate()
+        server.wait(timeout=10)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--size-mb", type=float, default=10)
+    parser.add_argument("--mode", choices=["spool", "memory", "both"], default="both")
+    args = parser.parse_args()
+
+    from config import settings
+    # MAX_FILE_SIZE(10MB) 이내로 맞춤
+    payload = build_payload(min(int(args.size_mb * 1024 * 1024), settings.MAX_FILE_SIZE - 1024))
+
+    for mode in (["spool", "memory"] if args.mode == "both" else [args.mode]):
+        run(mode, payload, args.concurrency)
+
+
+if __name__ == "__main__":
+    main()
@@ -9,15 +9,156 @@ class Settings:
     AWS_ACCESS_KEY_ID = os.getenv("AWS_ACCESS_KEY_ID")
     AWS_SECRET_ACCESS_KEY = os.getenv("AWS_SECRET_ACCESS_KEY")
     S3_BUCKET_NAME = os.getenv("S3_BUCKET_NAME")
+    S3_ENDPOINT_URL = os.getenv("S3_ENDPOINT_URL")  # MinIO/moto 등 S3 호환 서버 (없으면 AWS)
+    S3_MAX_POOL_CONNECTIONS = int(os.getenv("S3_MAX_POOL_CONNECTIONS", "32"))  # 공유 클라이언트 HTTP 커넥션 풀 크기
+    S3_MAX_CONCURRENCY = int(os.getenv("S3_MAX_CONCURRENCY", "16"))  # 동시에 실행하는 S3 호출 수 (실행기 스레드 수)
+    S3_MULTIPART_THRESHOLD = int(os.getenv("S3_MULTIPART_THRESHOLD", str(8 * 1024 * 1024)))  # 이 크기 이상은 멀티파트 업로드
+    S3_MULTIPART_CHUNK_SIZE = int(os.getenv("S3_MULTIPART_CHUNK_SIZE", str(8 * 1024 * 1024)))  # 파트 크기 (S3 최소 5MB)
     SQS_QUEUE_URL = os.getenv("SQS_QUEUE_URL")
+    SQS_ENDPOINT_URL = os.getenv("SQS_ENDPOINT_URL")  # ElasticMQ/moto 등 SQS 호환 서버 (없으면 AWS)
+    SQS_BATCHING_ENABLED = os.getenv("SQS_BATCHING_ENABLED", "True").lower() == "true"  # SendMessageBatch로 모아 보내기
+    SQS_BATCH_MAX_MESSAGES = min(10, int(os.getenv("SQS_BATCH_MAX_MESSAGES", "10")))  # 배치당 메시지 수 (SQS 최대 10)
+    SQS_BATCH_MAX_BYTES = int(os.getenv("SQS_BATCH_MAX_BYTES", "262144"))  # 배치 전체 크기 (SQS 최대 256KB)
+    SQS_BATCH_MAX_WAIT = float(os.getenv("SQS_BATCH_MAX_WAIT", "0.05"))  # 첫 메시지 후 최대 대기 시간 (초)
+    SQS_PAYLOAD_OFFLOAD_BYTES = int(os.getenv("SQS_PAYLOAD_OFFLOAD_BYTES", "65536"))  # 이보다 큰 메시지 본문은 S3에 두고 키만 전송
+
+    # 분석 요청 처리 방식: inline (로컬 테스트용 즉시 완료) / sqs (SQS 전송 후 worker.py가 처리)
+    # / local (프로세스 내 작업 큐, SQS 없는 단일 노드용)
+    ANALYSIS_QUEUE_BACKEND = os.getenv("ANALYSIS_QUEUE_BACKEND", "inline").lower()
+    ANALYSIS_PIPELINE = os.getenv("ANALYSIS_PIPELINE", "integrated").lower()  # integrated | hybrid
+
+    # 분석 워커 (worker.py)
+    WORKER_MAX_IN_FLIGHT = int(os.getenv("WORKER_MAX_IN_FLIGHT", "8"))  # 동시에 처리하는 메시지 수
+    WORKER_WAIT_TIME = int(os.getenv("WORKER_WAIT_TIME", "20"))  # SQS long-poll 대기 (초, 최대 20)
+    WORKER_VISIBILITY_TIMEOUT = int(os.getenv("WORKER_VISIBILITY_TIMEOUT", "60"))  # 처리 중에는 절반마다 연장 (초)
+    WORKER_MAX_RECEIVES = int(os.getenv("WORKER_MAX_RECEIVES", "3"))  # 이만큼 실패하면 FAILED 보고 후 삭제
+    WORKER_JOB_TIMEOUT = float(os.getenv("WORKER_JOB_TIMEOUT", "300"))  # 메시지 하나의 최대 처리 시간 (초)
+    WORKER_RESULT_MODE = os.getenv("WORKER_RESULT_MODE", "http").lower()  # http (/analysis-result) | store (상태 저장소 직접)
+    WORKER_RESULT_URL = os.getenv("WORKER_RESULT_URL", "http://localhost:8000/api/v1/analysis-result")
+
+    # 프로세스 내 분석 큐 (ANALYSIS_QUEUE_BACKEND=local, 재시도 횟수/작업 시간 제한은 WORKER_* 설정 사용)
+    LOCAL_QUEUE_WORKERS = int(os.getenv("LOCAL_QUEUE_WORKERS", "2"))  # 동시에 처리하는 분석 작업 수
+    LOCAL_QUEUE_MAX_SIZE = int(os.getenv("LOCAL_QUEUE_MAX_SIZE", "100"))  # 대기 작업 한도 (초과 시 503)
+    LOCAL_QUEUE_RETRY_AFTER = int(os.getenv("LOCAL_QUEUE_RETRY_AFTER", "5"))  # 503 응답의 Retry-After (초)
+    LOCAL_QUEUE_SQLITE_PATH = os.getenv("LOCAL_QUEUE_SQLITE_PATH", "")  # 설정 시 대기 작업을 저장해 재시작 후 복구
+    LOCAL_QUEUE_DRAIN_TIMEOUT = float(os.getenv("LOCAL_QUEUE_DRAIN_TIMEOUT", "10"))  # 종료 시 실행 중인 작업 대기 (초)
     
     # Google Maps API
     GOOGLE_MAPS_API_KEY = os.getenv("GOOGLE_MAPS_API_KEY")
+
+    # Kakao Map API
+    KAKAO_REST_API_KEY = os.getenv("KAKAO_REST_API_KEY")
+
+    # 주변 장소 검색 카테고리 (우선순위 순, 동시에 조회 후 가장 높은 순위 결과 사용)
+    KAKAO_NEARBY_CATEGORIES = os.getenv("KAKAO_NEARBY_CATEGORIES", "AT4,CT1,PK6").split(",")  # 관광명소, 문화시설, 주차장
+    GOOGLE_NEARBY_PLACE_TYPES = os.getenv("GOOGLE_NEARBY_PLACE_TYPES", "tourist_attraction,museum,park").split(",")
+
+    # 구글 Place Details 호출 정책 (auto: 검색 결과에 필요한 필드가 없을 때만 호출, always: 항상 호출)
+    GOOGLE_PLACE_DETAILS_MODE = os.getenv("GOOGLE_PLACE_DETAILS_MODE", "auto").lower()
+    PLACE_DETAILS_CACHE_TTL = int(os.getenv("PLACE_DETAILS_CACHE_TTL", "2592000"))  # 초 (place_id는 안정적이므로 30일)
+    PLACE_DETAILS_CACHE_MAX_SIZE = int(os.getenv("PLACE_DETAILS_CACHE_MAX_SIZE", "10000"))
+
+    # 주변 편의시설 검색 (주거지역 분석, 종류별 가장 가까운 시설)
+    NEARBY_FACILITY_TYPES = os.getenv("NEARBY_FACILITY_TYPES", "편의점,마트,병원,학교,공원").split(",")
+    NEARBY_FACILITY_RADIUS = int(os.getenv("NEARBY_FACILITY_RADIUS", "1000"))  # 미터
+    FACILITY_CACHE_TTL = int(os.getenv("FACILITY_CACHE_TTL", "86400"))  # 초 (지오해시 셀 단위, GEO_CACHE_PRECISION)
+    FACILITY_CACHE_MAX_SIZE = int(os.getenv("FACILITY_CACHE_MAX_SIZE", "20000"))
+
+    # 카카오 API 동시 요청 수 (프로세스 전체 공유, 호출 한도 보호)
+    KAKAO_MAX_CONCURRENT_REQUESTS = int(os.getenv("KAKAO_MAX_CONCURRENT_REQUESTS", "8"))
+
+    # Outbound HTTP Client (카카오/구글 API 공용 커넥션 풀)
+    HTTP_TIMEOUT = float(os.getenv("HTTP_TIMEOUT", "10"))  # 초
+    HTTP_CONNECT_TIMEOUT = float(os.getenv("HTTP_CONNECT_TIMEOUT", "3"))  # 초
+    HTTP_MAX_CONNECTIONS = int(os.getenv("HTTP_MAX_CONNECTIONS", "100"))
+    HTTP_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("HTTP_MAX_KEEPALIVE_CONNECTIONS", "20"))
+    HTTP_MAX_CONNECTIONS_PER_HOST = int(os.getenv("HTTP_MAX_CONNECTIONS_PER_HOST", "20"))
+    HTTP2_ENABLED = os.getenv("HTTP2_ENABLED", "True").lower() == "true"
+
+    # Cache Settings (memory: 프로세스 내 LRU, redis: Redis 프로토콜 호환 서버 공유)
+    CACHE_BACKEND = os.getenv("CACHE_BACKEND", "memory").lower()
+    REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+    REDIS_KEY_PREFIX = os.getenv("REDIS_KEY_PREFIX", "hpr:")
+
+    # 좌표 -> 장소 캐시 (지오해시 셀 단위, precision 7 ≈ 150m 셀)
+    GEO_CACHE_ENABLED = os.getenv("GEO_CACHE_ENABLED", "True").lower() == "true"
+    GEO_CACHE_PRECISION = int(os.getenv("GEO_CACHE_PRECISION", "7"))
+    GEO_CACHE_TTL = int(os.getenv("GEO_CACHE_TTL", "86400"))  # 초
+    GEO_CACHE_MAX_SIZE = int(os.getenv("GEO_CACHE_MAX_SIZE", "10000"))
+
+    # 키워드 검색 캐시 (정규화된 키워드 + 지오해시 precision 5 ≈ 5km 위치 버킷)
+    KEYWORD_CACHE_ENABLED = os.getenv("KEYWORD_CACHE_ENABLED", "True").lower() == "true"
+    KEYWORD_CACHE_LOCATION_PRECISION = int(os.getenv("KEYWORD_CACHE_LOCATION_PRECISION", "5"))
+    KEYWORD_CACHE_TTL = int(os.getenv("KEYWORD_CACHE_TTL", "3600"))  # 초
+    KEYWORD_CACHE_NEGATIVE_TTL = int(os.getenv("KEYWORD_CACHE_NEGATIVE_TTL", "300"))  # 검색 결과 없음 캐시 (초)
+    KEYWORD_CACHE_MAX_SIZE = int(os.getenv("KEYWORD_CACHE_MAX_SIZE", "5000"))
+
+    # 동일한 업스트림 호출 합치기 (역지오코딩/키워드/시설/Details/OCR, 진행 중인 같은 요청의 결과 공유)
+    SINGLEFLIGHT_ENABLED = os.getenv("SINGLEFLIGHT_ENABLED", "True").lower() == "true"
+
+    # 분석 상태 저장소 (memory: 단일 프로세스, sqlite: 같은 호스트 워커 공유, redis: 여러 호스트 공유)
+    STATUS_STORE_BACKEND = os.getenv("STATUS_STORE_BACKEND", "memory").lower()
+    STATUS_STORE_TTL = int(os.getenv("STATUS_STORE_TTL", "86400"))  # 초
+    STATUS_STORE_MAX_SIZE = int(os.getenv("STATUS_STORE_MAX_SIZE", "10000"))  # memory 백엔드 전용
+    STATUS_STORE_SQLITE_PATH = os.getenv("STATUS_STORE_SQLITE_PATH", "data/analysis_status.db")
+    STATUS_STORE_POLL_INTERVAL = float(os.getenv("STATUS_STORE_POLL_INTERVAL", "0.5"))  # sqlite: 다른 워커 변경 확인 주기 (초)
+    STATUS_LONG_POLL_MAX_WAIT = float(os.getenv("STATUS_LONG_POLL_MAX_WAIT", "30"))  # ?wait= 최대 대기 (초)
+    STATUS_STREAM_TIMEOUT = float(os.getenv("STATUS_STREAM_TIMEOUT", "300"))  # SSE 스트림 최대 유지 시간 (초)
+    STATUS_STREAM_HEARTBEAT = float(os.getenv("STATUS_STREAM_HEARTBEAT", "15"))  # SSE keep-alive 주석 주기 (초)
+    
+    # 업로드 이미지 중복 제거 (내용 해시를 저장 키로 사용, 같은 사진은 한 번만 저장)
+    STORAGE_DEDUP_ENABLED = os.getenv("STORAGE_DEDUP_ENABLED", "True").lower() == "true"
+
+    # 로컬 저장소 기록 방식 (임시 파일 기록 후 rename으로 교체)
+    LOCAL_STORAGE_FSYNC = os.getenv("LOCAL_STORAGE_FSYNC", "none")  # none | file (파일 fsync) | full (파일 + 디렉토리 fsync)
+    LOCAL_STORAGE_SHARD_DEPTH = int(os.getenv("LOCAL_STORAGE_SHARD_DEPTH", "2"))  # 파일명 앞 2글자씩 하위 디렉토리 단계 수 (0이면 평면)
+
+    # 종합 이미지 분석 결과 캐시 (이미지 내용 해시 + GPS 지오해시 셀 단위)
+    ANALYSIS_CACHE_ENABLED = os.getenv("ANALYSIS_CACHE_ENABLED", "True").lower() == "true"
+    ANALYSIS_CACHE_TTL = int(os.getenv("ANALYSIS_CACHE_TTL", "86400"))  # 초
+    ANALYSIS_CACHE_MAX_SIZE = int(os.getenv("ANALYSIS_CACHE_MAX_SIZE", "1000"))
+
+    # 종합 이미지 분석 단계별 제한 시간 (초, ANALYSIS_STAGE_TIMEOUTS로 단계별 재정의 "geocode:3,text_search:5")
+    ANALYSIS_STAGE_TIMEOUT = float(os.getenv("ANALYSIS_STAGE_TIMEOUT", "8"))
+    ANALYSIS_STAGE_TIMEOUTS = {
+        name: float(seconds)
+        for name, seconds in (item.split(":") for item in os.getenv("ANALYSIS_STAGE_TIMEOUTS", "geocode:3,text_search:5").split(",") if item)
+    }
     
     # Application Settings
     DEBUG = os.getenv("DEBUG", "False").lower() == "true"
     MAX_FILE_SIZE = int(os.getenv("MAX_FILE_SIZE", "10485760"))  # 10MB
+    MAX_REQUEST_BODY_SIZE = int(os.getenv("MAX_REQUEST_BODY_SIZE", str(MAX_FILE_SIZE + 65536)))  # 파일 + 폼 필드/경계 여유분
+    UPLOAD_SPOOL_MAX_MEMORY = int(os.getenv("UPLOAD_SPOOL_MAX_MEMORY", "1048576"))  # 이보다 큰 업로드는 임시 파일을 mmap으로 사용
     ALLOWED_IMAGE_TYPES = os.getenv("ALLOWED_IMAGE_TYPES", "image/jpeg,image/png,image/webp").split(",")
+    EXIF_FAST_PATH = os.getenv("EXIF_FAST_PATH", "True").lower() == "true"  # 헤더만 읽는 EXIF 파서 사용 (실패 시 PIL)
+
+    # S3 직접 업로드 (presigned POST → finalize, 이미지 본문이 API 서버를 거치지 않음)
+    DIRECT_UPLOAD_EXPIRES = int(os.getenv("DIRECT_UPLOAD_EXPIRES", "300"))  # presigned POST 유효 시간 (초)
+    DIRECT_UPLOAD_HEADER_BYTES = int(os.getenv("DIRECT_UPLOAD_HEADER_BYTES", "262144"))  # finalize 시 형식/EXIF 확인용으로 읽는 앞부분 크기
+
+    # 앨범 일괄 분석 (/batch/capture-photos, 사진별 결과를 NDJSON으로 스트리밍)
+    BATCH_MAX_PHOTOS = int(os.getenv("BATCH_MAX_PHOTOS", "100"))  # 요청당 최대 사진 수
+    BATCH_CONCURRENCY = int(os.getenv("BATCH_CONCURRENCY", "4"))  # 동시에 처리하는 사진 수
+    BATCH_MAX_REQUEST_BODY_SIZE = int(os.getenv("BATCH_MAX_REQUEST_BODY_SIZE", str(200 * 1024 * 1024)))  # 200MB
+    BATCH_GEOCODE_PRECISION = int(os.getenv("BATCH_GEOCODE_PRECISION", str(GEO_CACHE_PRECISION)))  # 장소 조회를 공유하는 지오해시 셀 크기
+
+    # 이미지 작업 실행기 (thread / process / inline)
+    IMAGE_EXECUTOR = os.getenv("IMAGE_EXECUTOR", "thread").lower()
+    IMAGE_EXECUTOR_WORKERS = int(os.getenv("IMAGE_EXECUTOR_WORKERS", str(min(4, os.cpu_count() or 1))))
+    IMAGE_EXECUTOR_MAX_QUEUE = int(os.getenv("IMAGE_EXECUTOR_MAX_QUEUE", "32"))  # 초과 시 503
+    IMAGE_EXECUTOR_RETRY_AFTER = int(os.getenv("IMAGE_EXECUTOR_RETRY_AFTER", "1"))  # 503 응답의 Retry-After (초)
+
+    # 요청 단위 추적 (Server-Timing 헤더, 단계별 시간)
+    TRACING_ENABLED = os.getenv("TRACING_ENABLED", "True").lower() == "true"
+    TRACING_EXPORTER = os.getenv("TRACING_EXPORTER", "memory").lower()  # memory | otel (opentelemetry-api 필요) | none
+    TRACING_MEMORY_MAX_TRACES = int(os.getenv("TRACING_MEMORY_MAX_TRACES", "200"))  # memory: 보관할 최근 Trace 수
+    TRACING_DEBUG_RESPONSE = os.getenv("TRACING_DEBUG_RESPONSE", str(DEBUG)).lower() == "true"  # 응답 JSON에 단계별 시간 포함
+
+    # Prometheus 메트릭 (/metrics)
+    METRICS_ENABLED = os.getenv("METRICS_ENABLED", "True").lower() == "true"
+    METRICS_LOOP_LAG_INTERVAL = float(os.getenv("METRICS_LOOP_LAG_INTERVAL", "0.5"))  # 이벤트 루프 지연 측정 간격 (초, 0이면 끔)
+    WORKER_METRICS_PORT = int(os.getenv("WORKER_METRICS_PORT", "0"))  # 분석 워커의 /metrics 포트 (0이면 끔)
     
     # API Settings
     API_V1_PREFIX = "/api/v1"
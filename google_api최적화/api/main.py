@@ -1,27 +1,50 @@
-from fastapi import FastAPI, UploadFile, File, Form, HTTPException, Depends
+from fastapi import FastAPI, UploadFile, File, Form, HTTPException, Depends, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse, FileResponse
+from fastapi.responses import JSONResponse, FileResponse, StreamingResponse, Response
 from fastapi.staticfiles import StaticFiles
+from starlette.concurrency import run_in_threadpool
+import asyncio
+import json
 import uuid
 import time
 import logging
+from collections import deque
 from datetime import datetime
-from typing import Optional
+from functools import partial
+from typing import Any, AsyncIterator, Dict, List, Optional, Set, Tuple, Union
 
 # Local imports
 from config import settings
 from models import (
     GPSCoordinates, PhotoCaptureRequest, AnalysisStatus, 
-    ErrorResponse, PlaceInfo, EXIFData, CameraInfo, PhotoAnalysisResponse
+    ErrorResponse, PlaceInfo, EXIFData, CameraInfo, PhotoAnalysisResponse,
+    DirectUploadRequest, FinalizeUploadRequest
 )
 from services.s3_service import s3_service
 from services.sqs_service import sqs_service
+from services.local_queue_service import local_queue_service, analysis_queue_stats, PRIORITY_BATCH, PRIORITY_INTERACTIVE
 # Google Maps API 서비스 사용 (Mock 서비스 사용)
 # from services.google_maps_service import google_maps_service  # 실제 API 키가 있을 때 사용
 from services.google_maps_service_mock import google_maps_service_mock as google_maps_service  # 테스트용
-from utils.validators import validate_image_file, validate_image_content, validate_gps_coordinates
+from utils.validators import validate_image_content_async, validate_gps_coordinates, validate_image_header, validate_upload_id
 from utils.responses import create_error_response, create_success_response, APIException
 from utils.exif_processor import exif_processor
+from utils.exif_reader import read_trailing_exif_fields
+from utils.uploads import (
+    UploadSizeLimitMiddleware, read_image_upload, sniff_image_type, SNIFF_BYTES,
+    read_album_upload, spool_request_body, open_image_archive, iter_archive_photos, upload_error
+)
+from utils.image_context import ImageContext
+from utils.http_client import http_client
+from utils.tracing import TracingMiddleware, traced, tag_request, debug_timing, tracing_stats, tracer
+from utils.metrics import MetricsMiddleware, loop_lag_monitor, render_metrics
+from utils.cache import cache_stats
+from utils.singleflight import singleflight_stats
+from utils.image_executor import image_executor, image_executor_stats
+from services.status_store import status_store, TERMINAL_STATUSES
+from services.place_cache import place_details_stats, CellGeocoder
+from services.content_store import storage_stats
+from services.status_stream import status_events
 
 # 로깅 설정
 logging.basicConfig(level=logging.INFO)
@@ -34,6 +57,13 @@ app = FastAPI(
     debug=settings.DEBUG
 )
 
+# 업로드 본문 크기 제한 (multipart 파싱 전에 413으로 중단, 앨범 일괄 업로드는 별도 한도)
+app.add_middleware(
+    UploadSizeLimitMiddleware,
+    max_body_size=settings.MAX_REQUEST_BODY_SIZE,
+    path_limits={f"{settings.API_V1_PREFIX}/batch/": settings.BATCH_MAX_REQUEST_BODY_SIZE}
+)
+
 # CORS 설정
 app.add_middleware(
     CORSMiddleware,
@@ -43,11 +73,39 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Prometheus 메트릭 (라우트별 요청 수/지연 시간, 업로드 크기)
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+
+# 요청 단위 추적 (마지막에 추가해 가장 바깥 미들웨어로 요청 전체 시간을 재고 Server-Timing 헤더 추가)
+app.add_middleware(TracingMiddleware)
+
 # 정적 파일 서빙 설정
 app.mount("/static", StaticFiles(directory="static"), name="static")
 
-# 메모리 기반 임시 저장소 (프로덕션에서는 Redis나 DynamoDB 사용 권장)
-analysis_status_store = {}
+@app.on_event("startup")
+async def startup_event():
+    """
+    프로세스 풀 사용 시 이미지 작업 워커를 미리 생성, 로컬 분석 큐 사용 시 저장된 작업 복구 후 시작,
+    이벤트 루프 지연 측정 시작
+    """
+    await image_executor.warm_up()
+    if settings.METRICS_ENABLED:
+        loop_lag_monitor.start()
+    if settings.ANALYSIS_QUEUE_BACKEND == "local":
+        await local_queue_service.start()
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """
+    애플리케이션 종료 시 이벤트 루프 지연 측정 중지, SQS 배치 버퍼 전송, 로컬 분석 큐, 공유 HTTP 커넥션 풀, 이미지 작업 실행기, 상태 저장소 정리
+    """
+    await loop_lag_monitor.stop()
+    await sqs_service.close()
+    await local_queue_service.close()
+    await http_client.aclose()
+    image_executor.shutdown()
+    await status_store.close()
 
 @app.get("/demo")
 async def demo_page():
@@ -68,24 +126,44 @@ async def root():
         "timestamp": datetime.now().isoformat()
     }
 
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """
+    Prometheus 메트릭 (METRICS_ENABLED=False면 404)
+    """
+    if not settings.METRICS_ENABLED:
+        raise HTTPException(status_code=404, detail="Not Found")
+    body, content_type = render_metrics()
+    return Response(content=body, headers={"Content-Type": content_type})
+
 @app.get("/health")
 async def health_check():
     """
     헬스 체크 엔드포인트
     """
     try:
-        # SQS 큐 상태 확인
-        queue_attrs = await sqs_service.get_queue_attributes()
+        # SQS 큐 상태 확인 (SQS로 분석 요청을 보낼 때만, local/inline 백엔드는 SQS 없이 동작)
+        uses_sqs = settings.ANALYSIS_QUEUE_BACKEND == "sqs"
+        queue_attrs = await sqs_service.get_queue_attributes() if uses_sqs else {}
         
         return {
             "status": "healthy",
             "timestamp": datetime.now().isoformat(),
             "services": {
-                "sqs": "connected",
+                "sqs": "connected" if uses_sqs else "not_used",
                 "s3": "connected",
                 "google_maps": "connected" if settings.GOOGLE_MAPS_API_KEY else "not_configured"
             },
-            "queue_info": queue_attrs
+            "queue_info": queue_attrs,
+            "cache": cache_stats(),
+            "singleflight": singleflight_stats(),
+            "image_executor": image_executor_stats(),
+            "status_store": status_store.snapshot(),
+            "place_details": place_details_stats.snapshot(),
+            "storage": storage_stats(),
+            "sqs_producer": sqs_service.producer.stats.snapshot(),
+            "analysis_queue": analysis_queue_stats(),
+            "tracing": tracing_stats()
         }
     except Exception as e:
         logger.error(f"Health check failed: {e}")
@@ -98,6 +176,105 @@ async def health_check():
             }
         )
 
+def resolve_gps(metadata: dict, device_latitude: Optional[float], device_longitude: Optional[float]) -> Optional[GPSCoordinates]:
+    """
+    분석에 사용할 GPS 좌표 결정 (우선순위: EXIF GPS > 디바이스 GPS, 둘 다 없으면 None)
+    """
+    if metadata['has_gps'] and metadata['gps_coordinates']:
+        # EXIF에서 GPS 정보 추출 성공
+        final_gps = metadata['gps_coordinates']
+        logger.info(f"EXIF GPS 사용: {final_gps}")
+        return GPSCoordinates(latitude=final_gps["latitude"], longitude=final_gps["longitude"], source="exif")
+    
+    if device_latitude is not None and device_longitude is not None:
+        # 디바이스 GPS 사용
+        validate_gps_coordinates(device_latitude, device_longitude)
+        logger.info(f"디바이스 GPS 사용: {device_latitude}, {device_longitude}")
+        return GPSCoordinates(latitude=device_latitude, longitude=device_longitude, source="device")
+    
+    return None
+
+def build_upload_metadata(gps_coords: GPSCoordinates, metadata: dict) -> Dict[str, str]:
+    """
+    저장소에 함께 기록할 업로드 메타데이터 (GPS 출처, 카메라 정보)
+    """
+    return {
+        'latitude': str(gps_coords.latitude),
+        'longitude': str(gps_coords.longitude),
+        'gps_source': gps_coords.source,
+        'has_exif': str(metadata['has_exif']),
+        'camera_make': metadata['camera_info'].get('make', ''),
+        'camera_model': metadata['camera_info'].get('model', ''),
+        'capture_time': metadata['camera_info'].get('datetime', ''),
+    }
+
+@traced("queue")
+async def dispatch_analysis(request_id: str, s3_url: str, analysis_request: dict,
+                            priority: int = PRIORITY_INTERACTIVE) -> None:
+    """
+    분석 상태를 PENDING으로 저장하고 분석을 요청합니다.
+    
+    - sqs   : SQS로 전송, worker.py가 처리하며 /analysis-result 로 진행률/결과 보고
+    - local : 프로세스 내 작업 큐에 넣고 같은 프로세스의 워커가 처리 (대기열이 가득 차면 503,
+              priority가 작은 요청부터 처리)
+    - inline: 로컬 테스트용, 분석 요청 없이 즉시 COMPLETED 처리
+    
+    같은 request_id의 상태가 이미 있으면 (동시 요청이 먼저 등록) 409 APIException을 던집니다.
+    """
+    created = await status_store.create(AnalysisStatus(
+        request_id=request_id,
+        status="PENDING",
+        message="사진 분석 대기 중",
+        progress=0
+    ))
+    if created is None:
+        raise APIException(
+            status_code=409,
+            error="ANALYSIS_ALREADY_STARTED",
+            message="이미 분석이 시작된 요청입니다.",
+            request_id=request_id
+        )
+    
+    if settings.ANALYSIS_QUEUE_BACKEND in ("sqs", "local"):
+        try:
+            if settings.ANALYSIS_QUEUE_BACKEND == "local":
+                await local_queue_service.send_analysis_request(s3_url, analysis_request, request_id, priority=priority)
+            else:
+                await sqs_service.send_analysis_request(s3_url, analysis_request, request_id)
+        except APIException:
+            # 대기열 포화로 거절된 요청은 상태를 남기지 않음 (Retry-After 후 같은 요청으로 다시 시도 가능)
+            await status_store.delete(request_id)
+            raise
+        except Exception:
+            await status_store.transition(request_id, "FAILED", message="분석 요청 전송에 실패했습니다.")
+            raise
+        return
+    
+    logger.info(f"로컬 테스트: 분석 요청 생략, 즉시 완료 처리 - {request_id}")
+    await status_store.transition(
+        request_id,
+        "COMPLETED",
+        from_statuses=("PENDING",),
+        message="사진 분석이 완료되었습니다. (로컬 테스트)",
+        progress=100
+    )
+
+def already_finalized_response(request_id: str) -> JSONResponse:
+    return create_error_response(
+        status_code=409,
+        error="UPLOAD_ALREADY_FINALIZED",
+        message="이미 분석이 시작된 업로드입니다.",
+        request_id=request_id
+    )
+
+def no_gps_response(request_id: str) -> JSONResponse:
+    return create_error_response(
+        status_code=400,
+        error="NO_GPS_DATA",
+        message="GPS 정보가 없습니다. 사진에 GPS 정보가 포함되어 있거나 디바이스 GPS 좌표를 제공해주세요.",
+        request_id=request_id
+    )
+
 @app.post(f"{settings.API_V1_PREFIX}/capture-photo")
 async def capture_photo(
     file: UploadFile = File(..., description="카메라로 촬영한 사진"),
@@ -109,51 +286,23 @@ async def capture_photo(
     EXIF GPS 정보를 우선 사용하고, 없으면 디바이스 GPS를 사용합니다.
     """
     request_id = str(uuid.uuid4())
+    tag_request(request_id)
     start_time = time.time()
     
+    image = None
     try:
-        # 입력 검증
-        validate_image_file(file)
+        # 이미지 데이터 읽기 (파일 시그니처/크기 검증, 요청당 한 번만 파싱)
+        image = await read_image_upload(file)
+        await validate_image_content_async(image)
         
-        # 이미지 데이터 읽기
-        image_data = await file.read()
-        validate_image_content(image_data)
-        
-        # EXIF 메타데이터 추출
-        metadata = exif_processor.process_image_metadata(image_data)
+        # EXIF 메타데이터 추출 (검증 단계에서 읽은 헤더 재사용)
+        metadata = await exif_processor.process_image_metadata_async(image)
         
         # GPS 좌표 결정 (우선순위: EXIF GPS > 디바이스 GPS)
-        final_gps = None
-        gps_source = "none"
-        
-        if metadata['has_gps'] and metadata['gps_coordinates']:
-            # EXIF에서 GPS 정보 추출 성공
-            final_gps = metadata['gps_coordinates']
-            gps_source = "exif"
-            logger.info(f"EXIF GPS 사용: {final_gps}")
-        elif device_latitude is not None and device_longitude is not None:
-            # 디바이스 GPS 사용
-            validate_gps_coordinates(device_latitude, device_longitude)
-            final_gps = {
-                "latitude": device_latitude,
-                "longitude": device_longitude
-            }
-            gps_source = "device"
-            logger.info(f"디바이스 GPS 사용: {final_gps}")
-        else:
-            return create_error_response(
-                status_code=400,
-                error="NO_GPS_DATA",
-                message="GPS 정보가 없습니다. 사진에 GPS 정보가 포함되어 있거나 디바이스 GPS 좌표를 제공해주세요.",
-                request_id=request_id
-            )
-        
-        # GPS 좌표 객체 생성
-        gps_coords = GPSCoordinates(
-            latitude=final_gps["latitude"],
-            longitude=final_gps["longitude"],
-            source=gps_source
-        )
+        gps_coords = resolve_gps(metadata, device_latitude, device_longitude)
+        if gps_coords is None:
+            return no_gps_response(request_id)
+        gps_source = gps_coords.source
         
         # 1. Google Maps API로 장소 정보 조회
         place_info = await google_maps_service.get_place_by_coordinates(
@@ -171,48 +320,18 @@ async def capture_photo(
         # 2. 로컬 저장소에 이미지 업로드 (S3 대신 임시 사용)
         from services.local_storage_service import local_storage_service
         
-        upload_metadata = {
-            'latitude': str(gps_coords.latitude),
-            'longitude': str(gps_coords.longitude),
-            'gps_source': gps_source,
-            'has_exif': str(metadata['has_exif']),
-            'camera_make': metadata['camera_info'].get('make', ''),
-            'camera_model': metadata['camera_info'].get('model', ''),
-            'capture_time': metadata['camera_info'].get('datetime', ''),
-        }
-        
         s3_url = await local_storage_service.upload_image(
-            image_data, 
-            file.content_type, 
-            upload_metadata
+            image, 
+            image.content_type, 
+            build_upload_metadata(gps_coords, metadata)
         )
         
-        # 3. 분석 요청 처리 (SQS 대신 즉시 완료로 처리)
-        # analysis_request = {
-        #     'request_id': request_id,
-        #     's3_url': s3_url,
-        #     'gps_coordinates': gps_coords.dict(),
-        #     'place_info': place_info.dict(),
-        #     'exif_metadata': metadata,
-        #     'service_type': 'building_recognition'
-        # }
-        
-        # await sqs_service.send_analysis_request(
-        #     s3_url, 
-        #     analysis_request, 
-        #     request_id
-        # )
-        
-        # 로컬 테스트용: 즉시 완료 처리
-        logger.info(f"로컬 테스트: 분석 요청 생략, 즉시 완료 처리 - {request_id}")
-        
-        # 4. 분석 상태 저장 (로컬 테스트용: 즉시 완료)
-        analysis_status_store[request_id] = AnalysisStatus(
-            request_id=request_id,
-            status="COMPLETED",
-            message="사진 분석이 완료되었습니다. (로컬 테스트)",
-            progress=100
-        )
+        # 3. 분석 상태 저장 후 분석 요청 (ANALYSIS_QUEUE_BACKEND)
+        await dispatch_analysis(request_id, s3_url, {
+            'gps_coordinates': gps_coords.dict(),
+            'place_info': place_info.dict(),
+            'exif_metadata': metadata
+        })
         
         processing_time = time.time() - start_time
         
@@ -241,7 +360,8 @@ async def capture_photo(
             },
             "s3_url": s3_url,
             "processing_time": processing_time,
-            "estimated_completion": "2-5분 (건물 인식 및 역사 정보 생성)"
+            "estimated_completion": "2-5분 (건물 인식 및 역사 정보 생성)",
+            **debug_timing()
         }, 202)
         
     except HTTPException as e:
@@ -254,14 +374,419 @@ async def capture_photo(
             message=f"사진 분석 요청 처리 중 오류가 발생했습니다: {str(e)}",
             request_id=request_id
         )
+    finally:
+        if image is not None:
+            image.close()
+
+@app.post(f"{settings.API_V1_PREFIX}/uploads")
+async def create_direct_upload(upload_request: DirectUploadRequest):
+    """
+    S3 직접 업로드 1단계 - presigned POST 발급
+    
+    클라이언트는 응답의 url/fields로 이미지를 S3에 바로 올린 뒤 finalize_url을 호출합니다.
+    이미지 본문은 API 서버를 거치지 않으며, Content-Type과 크기는 S3 정책 조건으로 강제됩니다.
+    """
+    if not settings.S3_BUCKET_NAME:
+        return create_error_response(
+            status_code=503,
+            error="DIRECT_UPLOAD_UNAVAILABLE",
+            message="S3 버킷이 설정되지 않아 직접 업로드를 사용할 수 없습니다. /capture-photo를 사용해주세요."
+        )
+    if upload_request.content_type not in settings.ALLOWED_IMAGE_TYPES:
+        raise HTTPException(
+            status_code=415,
+            detail=f"Unsupported file type. Allowed types: {', '.join(settings.ALLOWED_IMAGE_TYPES)}"
+        )
+    if upload_request.size_bytes > settings.MAX_FILE_SIZE:
+        raise HTTPException(
+            status_code=413,
+            detail=f"File size too large. Maximum size is {settings.MAX_FILE_SIZE} bytes"
+        )
+    
+    upload_id = str(uuid.uuid4())
+    presigned = s3_service.create_presigned_upload(
+        upload_id,
+        upload_request.content_type,
+        upload_request.size_bytes,
+        settings.DIRECT_UPLOAD_EXPIRES
+    )
+    
+    return create_success_response({
+        "upload_id": upload_id,
+        "method": "POST",
+        "url": presigned["url"],
+        "fields": presigned["fields"],
+        "expires_in": settings.DIRECT_UPLOAD_EXPIRES,
+        "finalize_url": f"{settings.API_V1_PREFIX}/uploads/{upload_id}/finalize"
+    }, 201)
+
+@app.post(f"{settings.API_V1_PREFIX}/uploads/{{upload_id}}/finalize")
+async def finalize_direct_upload(upload_id: str, finalize_request: Optional[FinalizeUploadRequest] = None):
+    """
+    S3 직접 업로드 2단계 - 저장된 객체로 분석 시작
+    
+    객체 앞부분(DIRECT_UPLOAD_HEADER_BYTES)만 Range GET으로 읽어 형식/크기/EXIF를 확인하고
+    GPS → 장소 조회 후 분석 요청을 등록합니다. 형식이 맞지 않는 객체는 삭제합니다.
+    앞부분에 EXIF가 없는 WebP/PNG는 이미지 데이터 뒤의 EXIF 청크만 추가로 읽습니다.
+    """
+    validate_upload_id(upload_id)
+    request_id = upload_id
+    tag_request(request_id)
+    start_time = time.time()
+    finalize_request = finalize_request or FinalizeUploadRequest()
+    key = s3_service.incoming_key(upload_id)
+    
+    try:
+        if await status_store.get(request_id):
+            return already_finalized_response(request_id)
+        
+        head = await s3_service.head_object(key)
+        if head is None:
+            return create_error_response(
+                status_code=404,
+                error="UPLOAD_NOT_FOUND",
+                message="업로드된 이미지가 없습니다. presigned URL로 업로드를 완료한 뒤 호출해주세요.",
+                request_id=request_id
+            )
+        
+        # 1. 앞부분만 읽어 형식/크기/EXIF 확인 (본문 전체는 API 서버로 가져오지 않음)
+        file_size = head['ContentLength']
+        head_bytes = await s3_service.read_head(key, settings.DIRECT_UPLOAD_HEADER_BYTES)
+        content_type = sniff_image_type(head_bytes[:SNIFF_BYTES])
+        try:
+            if file_size > settings.MAX_FILE_SIZE:
+                raise HTTPException(
+                    status_code=413,
+                    detail=f"File size too large. Maximum size is {settings.MAX_FILE_SIZE} bytes"
+                )
+            if content_type is None or content_type not in settings.ALLOWED_IMAGE_TYPES:
+                raise HTTPException(
+                    status_code=415,
+                    detail=f"Unsupported file type. Allowed types: {', '.join(settings.ALLOWED_IMAGE_TYPES)}"
+                )
+            image = ImageContext(head_bytes, content_type, header_only=True)
+            validate_image_header(image)
+        except HTTPException:
+            await s3_service.delete_object(key)
+            raise
+        
+        if not image.exif and file_size > len(head_bytes):
+            trailing_exif = await read_trailing_exif_fields(
+                head_bytes, file_size, partial(s3_service.read_range, key)
+            )
+            if trailing_exif:
+                image.apply_inspection({'exif': trailing_exif})
+        
+        metadata = exif_processor.process_image_metadata(image)
+        
+        # 2. GPS 좌표 결정 (없으면 객체는 그대로 두고 디바이스 GPS와 함께 다시 호출 가능)
+        gps_coords = resolve_gps(metadata, finalize_request.device_latitude, finalize_request.device_longitude)
+        if gps_coords is None:
+            return no_gps_response(request_id)
+        
+        # 3. 장소 정보 조회
+        place_info = await google_maps_service.get_place_by_coordinates(
+            gps_coords.latitude,
+            gps_coords.longitude
+        )
+        if not place_info:
+            place_info = PlaceInfo(
+                place_name="알 수 없는 장소",
+                address="주소 정보 없음",
+                category="일반"
+            )
+        
+        # 4. 분석 상태 저장 후 분석 요청 (ANALYSIS_QUEUE_BACKEND)
+        #    위의 확인 뒤에 같은 업로드의 다른 finalize가 먼저 등록했으면 409
+        s3_url = s3_service.object_url(key)
+        try:
+            await dispatch_analysis(request_id, s3_url, {
+                'gps_coordinates': gps_coords.dict(),
+                'place_info': place_info.dict(),
+                'exif_metadata': metadata,
+                'content_type': content_type,
+                'file_size': file_size
+            })
+        except APIException as e:
+            if e.status_code == 409:
+                return already_finalized_response(request_id)
+            raise
+        
+        return create_success_response({
+            "request_id": request_id,
+            "status": "PENDING",
+            "message": "카메라 사진 분석이 시작되었습니다.",
+            "gps_info": {
+                "coordinates": gps_coords.dict(),
+                "source": gps_coords.source,
+                "message": f"GPS 정보를 {gps_coords.source}에서 가져왔습니다."
+            },
+            "place_info": place_info.dict(),
+            "camera_info": metadata['camera_info'],
+            "exif_info": {
+                "has_exif": metadata['has_exif'],
+                "has_gps": metadata['has_gps']
+            },
+            "s3_url": s3_url,
+            "processing_time": time.time() - start_time,
+            "estimated_completion": "2-5분 (건물 인식 및 역사 정보 생성)",
+            **debug_timing()
+        }, 202)
+        
+    except HTTPException as e:
+        raise e
+    except Exception as e:
+        logger.error(f"직접 업로드 완료 처리 실패 {request_id}: {e}")
+        return create_error_response(
+            status_code=500,
+            error="FINALIZE_UPLOAD_FAILED",
+            message=f"업로드 완료 처리 중 오류가 발생했습니다: {str(e)}",
+            request_id=request_id
+        )
+
+AlbumPhoto = Tuple[str, Union[ImageContext, Dict[str, Any]]]
+
+async def analyze_album_photo(index: int, filename: str, image: ImageContext,
+                              device_latitude: Optional[float], device_longitude: Optional[float],
+                              geocoder: CellGeocoder) -> Dict[str, Any]:
+    """
+    앨범 사진 한 장 처리 (capture-photo와 같은 단계, 장소 조회는 배치 안에서 셀 단위로 공유)
+    실패해도 예외를 던지지 않고 사진별 결과 줄로 반환합니다.
+    """
+    request_id = str(uuid.uuid4())
+    start_time = time.time()
+    result = {"type": "photo", "index": index, "filename": filename, "request_id": request_id}
+    
+    try:
+        await validate_image_content_async(image)
+        metadata = await exif_processor.process_image_metadata_async(image)
+        
+        gps_coords = resolve_gps(metadata, device_latitude, device_longitude)
+        if gps_coords is None:
+            return {**result, "status": "FAILED", "error": "NO_GPS_DATA",
+                    "message": "GPS 정보가 없습니다. 사진에 GPS 정보가 포함되어 있거나 디바이스 GPS 좌표를 제공해주세요."}
+        
+        place_info = await geocoder.get(gps_coords.latitude, gps_coords.longitude)
+        if not place_info:
+            place_info = PlaceInfo(
+                place_name="알 수 없는 장소",
+                address="주소 정보 없음",
+                category="일반"
+            )
+        
+        from services.local_storage_service import local_storage_service
+        s3_url = await local_storage_service.upload_image(
+            image,
+            image.content_type,
+            build_upload_metadata(gps_coords, metadata)
+        )
+        
+        # 일괄 분석은 촬영 요청보다 낮은 우선순위로 요청 (local 백엔드)
+        await dispatch_analysis(request_id, s3_url, {
+            'gps_coordinates': gps_coords.dict(),
+            'place_info': place_info.dict(),
+            'exif_metadata': metadata
+        }, priority=PRIORITY_BATCH)
+        
+        return {
+            **result,
+            "status": "PENDING",
+            "gps_info": {
+                "coordinates": gps_coords.dict(),
+                "source": gps_coords.source
+            },
+            "place_info": place_info.dict(),
+            "camera_info": metadata['camera_info'],
+            "s3_url": s3_url,
+            "processing_time": time.time() - start_time
+        }
+        
+    except HTTPException as e:
+        return {**result, "status": "FAILED", **upload_error(e)}
+    except Exception as e:
+        logger.error(f"앨범 사진 처리 실패 {request_id} ({filename}): {e}")
+        return {**result, "status": "FAILED", "error": "CAPTURE_ANALYSIS_FAILED", "message": str(e)}
+
+async def stream_album_results(photos: AsyncIterator[AlbumPhoto],
+                               device_latitude: Optional[float],
+                               device_longitude: Optional[float]) -> AsyncIterator[bytes]:
+    """
+    앨범 사진을 BATCH_CONCURRENCY장까지 동시에 처리하고, 끝나는 순서대로 NDJSON 한 줄씩 반환합니다.
+    
+    다음 사진은 처리 슬롯이 빈 뒤에 읽으므로 압축 본문도 동시에 BATCH_CONCURRENCY장만 메모리에 올립니다.
+    사진별 줄은 {"type": "photo", "index", "filename", "status": "PENDING" | "FAILED", ...},
+    마지막 줄은 {"type": "summary", ...} 입니다.
+    """
+    start_time = time.time()
+    geocoder = CellGeocoder(google_maps_service.get_place_by_coordinates, settings.BATCH_GEOCODE_PRECISION)
+    slots = asyncio.Semaphore(max(1, settings.BATCH_CONCURRENCY))
+    lines: asyncio.Queue = asyncio.Queue()
+    tasks: Set[asyncio.Task] = set()
+    
+    async def run(index: int, filename: str, image: ImageContext) -> None:
+        try:
+            lines.put_nowait(await analyze_album_photo(
+                index, filename, image, device_latitude, device_longitude, geocoder
+            ))
+        finally:
+            slots.release()
+    
+    async def produce() -> None:
+        index = 0
+        try:
+            while True:
+                await slots.acquire()
+                try:
+                    filename, item = await photos.__anext__()
+                except StopAsyncIteration:
+                    slots.release()
+                    break
+                
+                if index >= settings.BATCH_MAX_PHOTOS:
+                    slots.release()
+                    if isinstance(item, ImageContext):
+                        item.close()
+                    lines.put_nowait({"type": "error", "error": "BATCH_LIMIT_EXCEEDED",
+                                      "message": f"요청당 최대 {settings.BATCH_MAX_PHOTOS}장까지 처리합니다. 나머지 사진은 처리하지 않았습니다."})
+                    break
+                
+                if isinstance(item, ImageContext):
+                    task = asyncio.ensure_future(run(index, filename, item))
+                    tasks.add(task)
+                    task.add_done_callback(tasks.discard)
+                    # 사진 처리가 끝나거나 취소되면 바로 버퍼(mmap)를 닫음
+                    task.add_done_callback(lambda _, image=item: image.close())
+                else:
+                    slots.release()
+                    lines.put_nowait({"type": "photo", "index": index, "filename": filename, "status": "FAILED", **item})
+                index += 1
+        except Exception as e:
+            logger.error(f"앨범 읽기 실패: {e}")
+            lines.put_nowait({"type": "error", "error": "ARCHIVE_READ_FAILED", "message": str(e)})
+        finally:
+            await photos.aclose()
+            if tasks:
+                await asyncio.gather(*list(tasks), return_exceptions=True)
+            lines.put_nowait(None)
+    
+    producer = asyncio.ensure_future(produce())
+    counts = {"PENDING": 0, "FAILED": 0}
+    try:
+        while (line := await lines.get()) is not None:
+            if line["type"] == "photo":
+                counts[line["status"]] += 1
+            yield (json.dumps(line, ensure_ascii=False, default=str) + "\n").encode("utf-8")
+        
+        yield (json.dumps({
+            "type": "summary",
+            "total": counts["PENDING"] + counts["FAILED"],
+            "accepted": counts["PENDING"],
+            "failed": counts["FAILED"],
+            "geocoding": geocoder.snapshot(),
+            "processing_time": time.time() - start_time,
+            **debug_timing()
+        }, ensure_ascii=False) + "\n").encode("utf-8")
+    finally:
+        # 클라이언트가 연결을 끊으면 남은 사진 처리를 중단
+        producer.cancel()
+        for task in list(tasks):
+            task.cancel()
+        geocoder.close()
+
+async def _iter_photos(photos: List[AlbumPhoto]) -> AsyncIterator[AlbumPhoto]:
+    pending = deque(photos)
+    try:
+        while pending:
+            yield pending.popleft()
+    finally:
+        # 처리하지 못한 사진(개수 초과, 연결 끊김)의 버퍼를 닫음
+        for _, item in pending:
+            if isinstance(item, ImageContext):
+                item.close()
+
+def album_response(photos: AsyncIterator[AlbumPhoto], device_latitude: Optional[float],
+                   device_longitude: Optional[float]) -> StreamingResponse:
+    return StreamingResponse(
+        stream_album_results(photos, device_latitude, device_longitude),
+        media_type="application/x-ndjson",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@app.post(f"{settings.API_V1_PREFIX}/batch/capture-photos")
+async def batch_capture_photos(
+    files: List[UploadFile] = File(..., description="앨범 사진들"),
+    device_latitude: Optional[float] = Form(None, description="EXIF GPS가 없는 사진에 사용할 디바이스 GPS 위도"),
+    device_longitude: Optional[float] = Form(None, description="EXIF GPS가 없는 사진에 사용할 디바이스 GPS 경도"),
+):
+    """
+    앨범 사진 여러 장을 한 요청으로 분석합니다.
+    사진별 결과(capture-photo 응답과 같은 정보)를 처리가 끝나는 순서대로 NDJSON으로 스트리밍합니다.
+    """
+    if len(files) > settings.BATCH_MAX_PHOTOS:
+        return create_error_response(
+            status_code=400,
+            error="BATCH_LIMIT_EXCEEDED",
+            message=f"요청당 최대 {settings.BATCH_MAX_PHOTOS}장까지 업로드할 수 있습니다."
+        )
+    
+    # 업로드 파일은 응답 스트리밍 전에 닫히므로 먼저 읽어 둠 (큰 파일은 mmap이라 복사되지 않음)
+    photos = [(file.filename or f"photo-{index}", await read_album_upload(file)) for index, file in enumerate(files)]
+    return album_response(_iter_photos(photos), device_latitude, device_longitude)
+
+@app.post(f"{settings.API_V1_PREFIX}/batch/capture-photos/archive")
+async def batch_capture_archive(
+    request: Request,
+    device_latitude: Optional[float] = Query(None, description="EXIF GPS가 없는 사진에 사용할 디바이스 GPS 위도"),
+    device_longitude: Optional[float] = Query(None, description="EXIF GPS가 없는 사진에 사용할 디바이스 GPS 경도"),
+):
+    """
+    zip/tar(.tar.gz 등) 본문으로 올린 앨범을 분석합니다.
+    본문은 임시 파일로 받은 뒤 사진을 하나씩 꺼내 처리하며, 결과는 NDJSON으로 스트리밍합니다.
+    """
+    spool = await spool_request_body(request, settings.BATCH_MAX_REQUEST_BODY_SIZE)
+    try:
+        members = await run_in_threadpool(open_image_archive, spool)
+    except (ValueError, OSError) as e:
+        spool.close()
+        logger.warning(f"앨범 압축 파일 열기 실패: {e}")
+        return create_error_response(
+            status_code=400,
+            error="INVALID_ARCHIVE",
+            message="zip 또는 tar(.tar.gz 등) 형식의 압축 파일이 아닙니다."
+        )
+    return album_response(iter_archive_photos(members, spool), device_latitude, device_longitude)
+
+@app.get(f"{settings.API_V1_PREFIX}/debug/traces")
+async def debug_traces(
+    request_id: Optional[str] = Query(None, description="이 request_id의 추적만 조회"),
+    limit: int = Query(20, ge=1, le=200)
+):
+    """
+    최근 요청/분석 작업의 구간별 추적 (TRACING_EXPORTER=memory, TRACING_DEBUG_RESPONSE일 때만)
+    """
+    if not settings.TRACING_DEBUG_RESPONSE:
+        raise HTTPException(status_code=404, detail="Not Found")
+    return {"tracing": tracing_stats(), "traces": tracer.recent(request_id, limit)}
 
 @app.get(f"{settings.API_V1_PREFIX}/analysis-status/{{request_id}}")
-async def get_analysis_status(request_id: str):
+async def get_analysis_status(
+    request_id: str,
+    wait: float = Query(0, ge=0, description="변경될 때까지 대기할 최대 시간 (초, long-poll)"),
+    version: Optional[int] = Query(None, ge=0, description="클라이언트가 마지막으로 받은 상태 version")
+):
     """
     분석 상태를 조회합니다.
+
+    wait > 0이면 상태 version이 바뀌거나 완료/실패할 때까지 최대 wait초 대기 후 응답합니다 (long-poll).
     """
     try:
-        if request_id not in analysis_status_store:
+        status = await status_store.get(request_id)
+        if status is not None and wait > 0 and status["status"] not in TERMINAL_STATUSES:
+            after_version = version if version is not None else status.get("version", 0)
+            status = await status_store.wait_for_update(
+                request_id, after_version, min(wait, settings.STATUS_LONG_POLL_MAX_WAIT)
+            )
+        if status is None:
             return create_error_response(
                 status_code=404,
                 error="REQUEST_NOT_FOUND",
@@ -269,8 +794,7 @@ async def get_analysis_status(request_id: str):
                 request_id=request_id
             )
         
-        status = analysis_status_store[request_id]
-        return create_success_response(status.dict())
+        return create_success_response(status)
         
     except Exception as e:
         logger.error(f"Failed to get analysis status for {request_id}: {e}")
@@ -281,24 +805,76 @@ async def get_analysis_status(request_id: str):
             request_id=request_id
         )
 
+@app.get(f"{settings.API_V1_PREFIX}/analysis-status/{{request_id}}/events")
+async def stream_analysis_status(request_id: str, request: Request):
+    """
+    분석 상태 변경을 Server-Sent Events로 전달합니다.
+
+    재연결 시 브라우저가 보내는 Last-Event-ID(version) 이후의 변경부터 이어서 전송합니다.
+    """
+    if await status_store.get(request_id) is None:
+        return create_error_response(
+            status_code=404,
+            error="REQUEST_NOT_FOUND",
+            message="Analysis request not found",
+            request_id=request_id
+        )
+
+    last_event_id = request.headers.get("last-event-id", "")
+    after_version = int(last_event_id) if last_event_id.isdigit() else 0
+
+    return StreamingResponse(
+        status_events(request_id, after_version),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 @app.post(f"{settings.API_V1_PREFIX}/analysis-result")
 async def receive_analysis_result(result_data: dict):
     """
     Lambda에서 분석 결과를 받는 엔드포인트 (내부 사용)
+
+    status: PROCESSING(진행률 갱신) / FAILED / COMPLETED(기본값)
     """
     try:
         request_id = result_data.get("request_id")
         if not request_id:
             raise HTTPException(status_code=400, detail="Missing request_id")
         
-        # 분석 상태 업데이트
-        if request_id in analysis_status_store:
-            analysis_status_store[request_id].status = "COMPLETED"
-            analysis_status_store[request_id].result = result_data
-            analysis_status_store[request_id].message = "Analysis completed successfully"
+        # 분석 상태 업데이트 (진행 중인 요청만 갱신, 이미 완료/실패한 요청은 덮어쓰지 않음)
+        status = str(result_data.get("status", "COMPLETED")).upper()
+        updates = {}
+        if result_data.get("progress") is not None:
+            updates["progress"] = int(result_data["progress"])
+
+        if status == "PROCESSING":
+            updated = await status_store.transition(
+                request_id,
+                "PROCESSING",
+                message=result_data.get("message", "Analysis in progress"),
+                **updates
+            )
+        elif status == "FAILED":
+            updated = await status_store.transition(
+                request_id,
+                "FAILED",
+                message=result_data.get("message", "Analysis failed")
+            )
+        else:
+            updated = await status_store.transition(
+                request_id,
+                "COMPLETED",
+                result=result_data,
+                message="Analysis completed successfully",
+                progress=100
+            )
+        if updated is None:
+            logger.warning(f"분석 결과 무시 (없거나 이미 완료된 요청): {request_id}")
         
         return {"status": "success", "message": "Result received"}
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Failed to receive analysis result: {e}")
         raise HTTPException(status_code=500, detail="Failed to process result")
@@ -313,51 +889,23 @@ async def test_photo_upload(
     사진 업로드 및 GPS/EXIF 처리 테스트 (로컬 저장)
     """
     request_id = str(uuid.uuid4())
+    tag_request(request_id)
     start_time = time.time()
     
+    image = None
     try:
-        # 입력 검증
-        validate_image_file(file)
-        
-        # 이미지 데이터 읽기
-        image_data = await file.read()
-        validate_image_content(image_data)
+        # 이미지 데이터 읽기 (파일 시그니처/크기 검증, 요청당 한 번만 파싱)
+        image = await read_image_upload(file)
+        await validate_image_content_async(image)
         
-        # EXIF 메타데이터 추출
-        metadata = exif_processor.process_image_metadata(image_data)
+        # EXIF 메타데이터 추출 (검증 단계에서 읽은 헤더 재사용)
+        metadata = await exif_processor.process_image_metadata_async(image)
         
         # GPS 좌표 결정 (우선순위: EXIF GPS > 디바이스 GPS)
-        final_gps = None
-        gps_source = "none"
-        
-        if metadata['has_gps'] and metadata['gps_coordinates']:
-            # EXIF에서 GPS 정보 추출 성공
-            final_gps = metadata['gps_coordinates']
-            gps_source = "exif"
-            logger.info(f"EXIF GPS 사용: {final_gps}")
-        elif device_latitude is not None and device_longitude is not None:
-            # 디바이스 GPS 사용
-            validate_gps_coordinates(device_latitude, device_longitude)
-            final_gps = {
-                "latitude": device_latitude,
-                "longitude": device_longitude
-            }
-            gps_source = "device"
-            logger.info(f"디바이스 GPS 사용: {final_gps}")
-        else:
-            return create_error_response(
-                status_code=400,
-                error="NO_GPS_DATA",
-                message="GPS 정보가 없습니다. 사진에 GPS 정보가 포함되어 있거나 디바이스 GPS 좌표를 제공해주세요.",
-                request_id=request_id
-            )
-        
-        # GPS 좌표 객체 생성
-        gps_coords = GPSCoordinates(
-            latitude=final_gps["latitude"],
-            longitude=final_gps["longitude"],
-            source=gps_source
-        )
+        gps_coords = resolve_gps(metadata, device_latitude, device_longitude)
+        if gps_coords is None:
+            return no_gps_response(request_id)
+        gps_source = gps_coords.source
         
         # Google Maps API로 장소 정보 조회
         place_info = await google_maps_service.get_place_by_coordinates(
@@ -388,8 +936,8 @@ async def test_photo_upload(
         }
         
         local_url = await local_storage_service.upload_image(
-            image_data, 
-            file.content_type, 
+            image, 
+            image.content_type, 
             upload_metadata
         )
         
@@ -420,11 +968,12 @@ async def test_photo_upload(
             },
             "file_info": {
                 "original_name": file.filename,
-                "content_type": file.content_type,
-                "file_size": len(image_data),
+                "content_type": image.content_type,
+                "file_size": image.size_bytes,
                 "local_url": local_url
             },
-            "processing_time": processing_time
+            "processing_time": processing_time,
+            **debug_timing()
         }, 200)
         
     except HTTPException as e:
@@ -437,6 +986,9 @@ async def test_photo_upload(
             message=f"테스트 사진 업로드 중 오류가 발생했습니다: {str(e)}",
             request_id=request_id
         )
+    finally:
+        if image is not None:
+            image.close()
 
 @app.post(f"{settings.API_V1_PREFIX}/compare-vision-approaches")
 async def compare_vision_approaches(
@@ -448,14 +1000,13 @@ async def compare_vision_approaches(
     GenAI vs 기존 Vision API 비교 분석
     """
     request_id = str(uuid.uuid4())
+    tag_request(request_id)
     
+    image = None
     try:
-        # 입력 검증
-        validate_image_file(file)
-        
-        # 이미지 데이터 읽기
-        image_data = await file.read()
-        validate_image_content(image_data)
+        # 이미지 데이터 읽기 (파일 시그니처/크기 검증, 요청당 한 번만 파싱)
+        image = await read_image_upload(file)
+        await validate_image_content_async(image)
         
         # GPS 정보 준비
         gps_info = None
@@ -468,21 +1019,21 @@ async def compare_vision_approaches(
         # 1. 기존 Vision API 방식 (구조화된 분석)
         from services.integrated_analysis_service import integrated_analysis_service
         traditional_result = await integrated_analysis_service.analyze_image_comprehensive(
-            image_data, gps_info
+            image.data, gps_info, content_hash=image.sha256
         )
         
         # 2. GenAI 방식 (맥락적 분석)
         from services.genai_vision_service import genai_vision_service
         comparison_result = await genai_vision_service.compare_with_traditional_vision(
-            image_data, traditional_result, gps_info
+            image.data, traditional_result, gps_info
         )
         
         return create_success_response({
             "request_id": request_id,
             "file_info": {
                 "filename": file.filename,
-                "content_type": file.content_type,
-                "size": len(image_data)
+                "content_type": image.content_type,
+                "size": image.size_bytes
             },
             "gps_info": gps_info,
             "comparison_analysis": comparison_result,
@@ -493,6 +1044,8 @@ async def compare_vision_approaches(
             }
         })
         
+    except HTTPException as e:
+        raise e
     except Exception as e:
         logger.error(f"Vision 비교 분석 실패: {e}")
         return create_error_response(
@@ -501,6 +1054,9 @@ async def compare_vision_approaches(
             message=f"Vision 비교 분석 중 오류: {str(e)}",
             request_id=request_id
         )
+    finally:
+        if image is not None:
+            image.close()
 
 @app.post(f"{settings.API_V1_PREFIX}/analyze-image-comprehensive")
 async def analyze_image_comprehensive(
@@ -512,17 +1068,16 @@ async def analyze_image_comprehensive(
     종합적인 이미지 분석 (Rekognition + Textract + 카카오맵)
     """
     request_id = str(uuid.uuid4())
+    tag_request(request_id)
     
+    image = None
     try:
-        # 입력 검증
-        validate_image_file(file)
-        
-        # 이미지 데이터 읽기
-        image_data = await file.read()
-        validate_image_content(image_data)
+        # 이미지 데이터 읽기 (파일 시그니처/크기 검증, 요청당 한 번만 파싱)
+        image = await read_image_upload(file)
+        await validate_image_content_async(image)
         
-        # EXIF 메타데이터 추출
-        metadata = exif_processor.process_image_metadata(image_data)
+        # EXIF 메타데이터 추출 (검증 단계에서 읽은 헤더 재사용)
+        metadata = await exif_processor.process_image_metadata_async(image)
         
         # GPS 좌표 결정
         gps_coords = None
@@ -543,15 +1098,15 @@ async def analyze_image_comprehensive(
         from services.integrated_analysis_service import integrated_analysis_service
         
         analysis_result = await integrated_analysis_service.analyze_image_comprehensive(
-            image_data, gps_coords
+            image.data, gps_coords, content_hash=image.sha256
         )
         
         return create_success_response({
             "request_id": request_id,
             "file_info": {
                 "filename": file.filename,
-                "content_type": file.content_type,
-                "size": len(image_data)
+                "content_type": image.content_type,
+                "size": image.size_bytes
             },
             "gps_info": {
                 "coordinates": gps_coords,
@@ -565,6 +1120,8 @@ async def analyze_image_comprehensive(
             "analysis_result": analysis_result
         })
         
+    except HTTPException as e:
+        raise e
     except Exception as e:
         logger.error(f"종합 이미지 분석 실패: {e}")
         return create_error_response(
@@ -573,6 +1130,9 @@ async def analyze_image_comprehensive(
             message=f"종합 이미지 분석 중 오류: {str(e)}",
             request_id=request_id
         )
+    finally:
+        if image is not None:
+            image.close()
 
 @app.post(f"{settings.API_V1_PREFIX}/test-photo-simple")
 async def test_photo_simple(
@@ -584,17 +1144,16 @@ async def test_photo_simple(
     사진 업로드 및 GPS/EXIF 처리 테스트 (AWS 없이)
     """
     request_id = str(uuid.uuid4())
+    tag_request(request_id)
     
+    image = None
     try:
-        # 입력 검증
-        validate_image_file(file)
+        # 이미지 데이터 읽기 (파일 시그니처/크기 검증, 요청당 한 번만 파싱)
+        image = await read_image_upload(file)
+        await validate_image_content_async(image)
         
-        # 이미지 데이터 읽기
-        image_data = await file.read()
-        validate_image_content(image_data)
-        
-        # EXIF 메타데이터 추출
-        metadata = exif_processor.process_image_metadata(image_data)
+        # EXIF 메타데이터 추출 (검증 단계에서 읽은 헤더 재사용)
+        metadata = await exif_processor.process_image_metadata_async(image)
         
         # GPS 좌표 결정
         final_gps = None
@@ -637,8 +1196,8 @@ async def test_photo_simple(
             "message": "사진 분석 완료",
             "file_info": {
                 "filename": file.filename,
-                "content_type": file.content_type,
-                "size": len(image_data)
+                "content_type": image.content_type,
+                "size": image.size_bytes
             },
             "gps_info": {
                 "coordinates": final_gps,
@@ -652,6 +1211,8 @@ async def test_photo_simple(
             }
         })
         
+    except HTTPException as e:
+        raise e
     except Exception as e:
         logger.error(f"사진 테스트 실패: {e}")
         return create_error_response(
@@ -660,6 +1221,9 @@ async def test_photo_simple(
             message=f"사진 테스트 중 오류: {str(e)}",
             request_id=request_id
         )
+    finally:
+        if image is not None:
+            image.close()
 
 @app.post(f"{settings.API_V1_PREFIX}/test-gps-location")
 async def test_gps_location(
@@ -760,7 +1324,8 @@ async def api_exception_handler(request, exc: APIException):
         status_code=exc.status_code,
         error=exc.error,
         message=exc.message,
-        request_id=exc.request_id
+        request_id=exc.request_id,
+        headers=exc.headers
     )
 
 @app.exception_handler(HTTPException)
@@ -768,7 +1333,8 @@ async def http_exception_handler(request, exc: HTTPException):
     return create_error_response(
         status_code=exc.status_code,
         error="HTTP_ERROR",
-        message=exc.detail
+        message=exc.detail,
+        headers=exc.headers
     )
 
 if __name__ == "__main__":
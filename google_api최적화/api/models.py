@@ -82,6 +82,16 @@ class AnalysisStatus(BaseModel):
     result: Optional[PhotoAnalysisResponse] = None
     created_at: datetime = Field(default_factory=datetime.now)
 
+class DirectUploadRequest(BaseModel):
+    """S3 직접 업로드 URL 요청"""
+    content_type: str = Field(..., description="업로드할 이미지 Content-Type")
+    size_bytes: int = Field(..., gt=0, description="업로드할 파일 크기 (바이트)")
+
+class FinalizeUploadRequest(BaseModel):
+    """S3 직접 업로드 완료 알림"""
+    device_latitude: Optional[float] = Field(None, description="디바이스 GPS 위도")
+    device_longitude: Optional[float] = Field(None, description="디바이스 GPS 경도")
+
 class ErrorResponse(BaseModel):
     error: str
     message: str
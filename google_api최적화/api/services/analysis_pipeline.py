@@ -0,0 +1,159 @@
+"""
+분석 파이프라인 - 분석 요청 메시지 하나를 받아 이미지를 읽고 분석한 뒤 결과를 보고합니다.
+
+메시지 형식은 sqs_service.compact_analysis_message와 같습니다
+(request_id, s3_url, gps_coordinates, place_info, exif_metadata ...).
+S3에 옮겨 둔 큰 본문(payload_s3_key)은 resolve_payload로 원본을 읽어 옵니다.
+
+결과 보고 방식 (WORKER_RESULT_MODE)
+- http : Lambda와 같이 /api/v1/analysis-result 로 POST (API 서버와 다른 프로세스/호스트)
+- store: 상태 저장소에 직접 기록 (API 서버와 같은 sqlite/redis 상태 저장소를 공유할 때)
+"""
+import json
+import logging
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Optional
+
+import aiofiles
+from fastapi.encoders import jsonable_encoder
+
+from config import settings
+from services.status_store import status_store
+from utils.http_client import http_client
+from utils.tracing import span, start_trace
+
+logger = logging.getLogger(__name__)
+
+
+class ResultReporter(ABC):
+    """분석 진행률/결과 보고"""
+
+    @abstractmethod
+    async def progress(self, request_id: str, progress: int, message: str) -> None:
+        ...
+
+    @abstractmethod
+    async def complete(self, request_id: str, result: Dict[str, Any]) -> None:
+        ...
+
+    @abstractmethod
+    async def fail(self, request_id: str, message: str) -> None:
+        ...
+
+
+class HttpResultReporter(ResultReporter):
+    """/api/v1/analysis-result 로 보고 (receive_analysis_result가 상태 전이 처리)"""
+
+    def __init__(self, url: str):
+        self.url = url
+
+    async def _post(self, payload: Dict[str, Any]) -> None:
+        response = await http_client.post(self.url, json=payload)
+        response.raise_for_status()
+
+    async def progress(self, request_id: str, progress: int, message: str) -> None:
+        await self._post({"request_id": request_id, "status": "PROCESSING", "progress": progress, "message": message})
+
+    async def complete(self, request_id: str, result: Dict[str, Any]) -> None:
+        await self._post({**result, "request_id": request_id, "status": "COMPLETED"})
+
+    async def fail(self, request_id: str, message: str) -> None:
+        await self._post({"request_id": request_id, "status": "FAILED", "message": message})
+
+
+class StatusStoreReporter(ResultReporter):
+    """상태 저장소에 직접 기록 (receive_analysis_result와 같은 전이 규칙)"""
+
+    async def progress(self, request_id: str, progress: int, message: str) -> None:
+        await status_store.transition(request_id, "PROCESSING", message=message, progress=progress)
+
+    async def complete(self, request_id: str, result: Dict[str, Any]) -> None:
+        await status_store.transition(
+            request_id, "COMPLETED",
+            result={**result, "request_id": request_id},
+            message="Analysis completed successfully",
+            progress=100
+        )
+
+    async def fail(self, request_id: str, message: str) -> None:
+        await status_store.transition(request_id, "FAILED", message=message)
+
+
+def create_reporter(mode: Optional[str] = None) -> ResultReporter:
+    mode = mode or settings.WORKER_RESULT_MODE
+    if mode == "store":
+        return StatusStoreReporter()
+    if mode == "http":
+        return HttpResultReporter(settings.WORKER_RESULT_URL)
+    raise ValueError(f"Unknown WORKER_RESULT_MODE: {mode}")
+
+
+async def resolve_payload(body: Dict[str, Any]) -> Dict[str, Any]:
+    """S3에 옮겨 둔 메시지 본문이면 원본을 읽어 옴"""
+    if 'payload_s3_key' not in body:
+        return body
+    from services.s3_service import s3_service
+
+    return json.loads(await s3_service.read_object(body['payload_s3_key']))
+
+
+async def load_image(url: str) -> bytes:
+    """
+    분석할 이미지 읽기 - 로컬 저장소 URL은 파일에서, 버킷 URL은 S3에서, 그 외에는 HTTP로 읽습니다.
+    """
+    from services.local_storage_service import local_storage_service
+    from services.s3_service import s3_service
+
+    path = local_storage_service.path_from_url(url)
+    if path is not None:
+        async with aiofiles.open(path, 'rb') as f:
+            return await f.read()
+
+    if settings.S3_BUCKET_NAME:
+        key = s3_service.key_from_url(url)
+        if key is not None:
+            return await s3_service.read_object(key)
+
+    response = await http_client.get(url)
+    response.raise_for_status()
+    return response.content
+
+
+async def run_analysis(image_bytes: bytes, gps_coords: Optional[Dict[str, float]]) -> Dict[str, Any]:
+    """ANALYSIS_PIPELINE에 따라 종합 분석 또는 하이브리드 분석 실행"""
+    if settings.ANALYSIS_PIPELINE == "hybrid":
+        from services.hybrid_analysis_service import hybrid_analysis_service
+        return await hybrid_analysis_service.analyze_with_optimal_strategy(image_bytes, gps_coords)
+
+    from services.integrated_analysis_service import integrated_analysis_service
+    return await integrated_analysis_service.analyze_image_comprehensive(image_bytes, gps_coords)
+
+
+async def analyze_message(payload: Dict[str, Any], reporter: ResultReporter) -> Dict[str, Any]:
+    """
+    분석 요청 하나 처리 - 진행률을 보고하며 이미지를 읽고 분석한 뒤 완료를 보고합니다.
+    분석이 실패하면 예외를 던지며, 재시도/실패 보고는 호출한 실행기가 결정합니다.
+    작업마다 별도 Trace("analysis")로 구간 시간을 기록합니다.
+    """
+    request_id = payload['request_id']
+    with start_trace("analysis", request_id=request_id, pipeline=settings.ANALYSIS_PIPELINE):
+        await reporter.progress(request_id, 10, "이미지를 불러오는 중")
+        with span("load_image"):
+            image_bytes = await load_image(payload['s3_url'])
+
+        await reporter.progress(request_id, 30, "이미지 분석 중")
+        gps = payload.get('gps_coordinates')
+        gps_coords = {'latitude': gps['latitude'], 'longitude': gps['longitude']} if gps else None
+        with span("analysis", pipeline=settings.ANALYSIS_PIPELINE):
+            analysis = await run_analysis(image_bytes, gps_coords)
+        if 'error' in analysis:
+            raise RuntimeError(f"Analysis failed: {analysis['error']}")
+
+        result = jsonable_encoder({
+            'place_info': payload.get('place_info'),
+            'gps_coordinates': gps,
+            'pipeline': settings.ANALYSIS_PIPELINE,
+            'analysis': analysis
+        })
+        await reporter.complete(request_id, result)
+        return result
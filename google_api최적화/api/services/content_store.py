@@ -0,0 +1,79 @@
+"""
+콘텐츠 주소 기반 저장 헬퍼 - 로컬/S3 저장소 공용
+
+이미지 객체는 내용 해시(sha256)를 이름으로 한 번만 저장하고,
+업로드마다 달라지는 정보(GPS, 업로드 시각 등)는 객체를 가리키는 메타데이터 사이드카에 기록합니다.
+"""
+import uuid
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+EXTENSIONS = {
+    'image/jpeg': '.jpg',
+    'image/png': '.png',
+    'image/webp': '.webp'
+}
+
+
+def object_name(digest: str, content_type: str) -> str:
+    """내용 해시 기반 객체 이름 (예: 3a7bd3...e1.jpg)"""
+    return f"{digest}{EXTENSIONS.get(content_type, '.jpg')}"
+
+
+def build_sidecar(object_key: str, digest: str, content_type: str, size: int,
+                  deduplicated: bool, metadata: Optional[Dict[str, Any]] = None,
+                  upload_id: Optional[str] = None) -> Dict[str, Any]:
+    """업로드 한 건의 메타데이터 (객체 키와 해시로 이미지 객체를 참조)"""
+    return {
+        **(metadata or {}),
+        'upload_id': upload_id or uuid.uuid4().hex,
+        'object_key': object_key,
+        'sha256': digest,
+        'upload_time': datetime.now().isoformat(),
+        'content_type': content_type,
+        'file_size': size,
+        'deduplicated': deduplicated,
+    }
+
+
+class DedupStats:
+    """
+    저장소별 중복 제거 통계
+
+    - writes / bytes_written: 새로 기록한 객체
+    - dedup_hits / bytes_saved: 이미 같은 내용이 있어 기록을 생략한 업로드
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.writes = 0
+        self.bytes_written = 0
+        self.dedup_hits = 0
+        self.bytes_saved = 0
+        dedup_registry.append(self)
+
+    def record(self, size: int, deduplicated: bool) -> None:
+        if deduplicated:
+            self.dedup_hits += 1
+            self.bytes_saved += size
+        else:
+            self.writes += 1
+            self.bytes_written += size
+
+    def snapshot(self) -> Dict[str, Any]:
+        total = self.writes + self.dedup_hits
+        return {
+            "writes": self.writes,
+            "bytes_written": self.bytes_written,
+            "dedup_hits": self.dedup_hits,
+            "bytes_saved": self.bytes_saved,
+            "dedup_ratio": round(self.dedup_hits / total, 4) if total else 0.0,
+        }
+
+
+# /health 등에서 전체 저장소 통계를 조회하기 위한 등록부
+dedup_registry: List[DedupStats] = []
+
+
+def storage_stats() -> Dict[str, Dict[str, Any]]:
+    return {stats.name: stats.snapshot() for stats in dedup_registry}
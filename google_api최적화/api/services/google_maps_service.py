@@ -1,16 +1,29 @@
-import requests
+import httpx
 import logging
-from typing import Optional
+from typing import List, Optional
 from config import settings
 from models import PlaceInfo
+from services.place_cache import (
+    cached_by_coordinates, cached_keyword_search, cached_place_details, place_details_stats
+)
+from utils.concurrency import first_hit_in_order
+from utils.http_client import http_client
 
 logger = logging.getLogger(__name__)
 
+
+def _category_from_types(types: List[str]) -> str:
+    # 첫 번째 타입을 카테고리로 사용
+    return types[0].replace('_', ' ').title() if types else ''
+
+
 class GoogleMapsService:
     def __init__(self):
         self.api_key = settings.GOOGLE_MAPS_API_KEY
         self.base_url = "https://maps.googleapis.com/maps/api"
+        self.nearby_place_types = settings.GOOGLE_NEARBY_PLACE_TYPES
 
+    @cached_by_coordinates("google")
     async def get_place_by_coordinates(self, latitude: float, longitude: float) -> Optional[PlaceInfo]:
         """
         GPS 좌표를 기반으로 장소 정보를 조회합니다.
@@ -23,7 +36,7 @@ class GoogleMapsService:
                 "key": self.api_key
             }
             
-            response = requests.get(geocode_url, params=params)
+            response = await http_client.get(geocode_url, params=params)
             response.raise_for_status()
             
             geocode_data = response.json()
@@ -57,7 +70,7 @@ class GoogleMapsService:
                 category="일반"
             )
             
-        except requests.RequestException as e:
+        except httpx.HTTPError as e:
             logger.error(f"Google Maps API request failed: {e}")
             return None
         except Exception as e:
@@ -67,136 +80,164 @@ class GoogleMapsService:
     async def _search_nearby_places(self, latitude: float, longitude: float, radius: int = 500) -> Optional[PlaceInfo]:
         """
         주변 관심 장소를 검색합니다.
+        장소 유형별 검색을 동시에 실행하고, 우선순위가 가장 높은 결과를 사용합니다.
         """
         try:
-            nearby_url = f"{self.base_url}/place/nearbysearch/json"
+            # 관광명소, 문화시설 등을 우선 검색 (settings.GOOGLE_NEARBY_PLACE_TYPES 순서)
+            place = await first_hit_in_order([
+                self._search_nearby_type(place_type, latitude, longitude, radius)
+                for place_type in self.nearby_place_types
+            ])
             
-            # 관광명소, 문화시설 등을 우선 검색
-            place_types = ["tourist_attraction", "museum", "park"]
-            
-            for place_type in place_types:
-                params = {
-                    "location": f"{latitude},{longitude}",
-                    "radius": radius,
-                    "type": place_type,
-                    "key": self.api_key
-                }
-                
-                response = requests.get(nearby_url, params=params)
-                response.raise_for_status()
-                
-                data = response.json()
-                results = data.get('results', [])
-                
-                if results:
-                    place = results[0]  # 가장 가까운 장소
-                    
-                    # 장소 상세 정보 조회
-                    place_id = place.get('place_id')
-                    if place_id:
-                        details = await self._get_place_details(place_id)
-                        if details:
-                            return details
-                    
-                    # 상세 정보가 없으면 기본 정보 반환
-                    return PlaceInfo(
-                        place_name=place.get('name', ''),
-                        address=place.get('vicinity', ''),
-                        category=place.get('types', [''])[0].replace('_', ' ').title() if place.get('types') else ''
-                    )
+            if not place:
+                return None
             
-            return None
+            # Nearby Search 결과는 주소가 vicinity 필드에 있음
+            return await self._resolve_place(place, 'vicinity')
             
         except Exception as e:
             logger.error(f"Error searching nearby places: {e}")
             return None
 
+    async def _search_nearby_type(self, place_type: str, latitude: float, longitude: float, radius: int = 500) -> Optional[dict]:
+        """
+        장소 유형 하나로 Nearby Search를 실행하고 가장 가까운 결과를 반환합니다.
+        """
+        nearby_url = f"{self.base_url}/place/nearbysearch/json"
+        params = {
+            "location": f"{latitude},{longitude}",
+            "radius": radius,
+            "type": place_type,
+            "key": self.api_key
+        }
+        
+        response = await http_client.get(nearby_url, params=params)
+        response.raise_for_status()
+        
+        data = response.json()
+        results = data.get('results', [])
+        
+        return results[0] if results else None
+
+    async def _resolve_place(self, place: dict, address_field: str) -> PlaceInfo:
+        """
+        검색 결과 항목을 PlaceInfo로 변환합니다.
+
+        GOOGLE_PLACE_DETAILS_MODE가 auto이면 검색 결과에 이름/주소/타입이 모두 있을 때
+        Details 호출 없이 바로 만들고, 빠진 필드가 있을 때만 Details(place_id 캐시)를 조회합니다.
+        """
+        name = place.get('name')
+        address = place.get(address_field)
+        types = place.get('types')
+        
+        if settings.GOOGLE_PLACE_DETAILS_MODE != "always" and name and address and types:
+            place_details_stats.from_search += 1
+            return PlaceInfo(
+                place_name=name,
+                address=address,
+                category=_category_from_types(types)
+            )
+        
+        # 장소 상세 정보 조회
+        place_id = place.get('place_id')
+        if place_id:
+            place_details_stats.required += 1
+            details = await self._get_place_details(place_id)
+            if details:
+                return details
+        
+        # 상세 정보가 없으면 기본 정보 반환
+        return PlaceInfo(
+            place_name=name or '',
+            address=address or '',
+            category=_category_from_types(types)
+        )
+
     async def _get_place_details(self, place_id: str) -> Optional[PlaceInfo]:
         """
         장소 ID로 상세 정보를 조회합니다.
         """
         try:
-            details_url = f"{self.base_url}/place/details/json"
-            params = {
-                "place_id": place_id,
-                "fields": "name,formatted_address,types",
-                "key": self.api_key
-            }
-            
-            response = requests.get(details_url, params=params)
-            response.raise_for_status()
-            
-            data = response.json()
-            
-            if data.get('status') != 'OK' or not data.get('result'):
-                return None
-            
-            result = data.get('result', {})
-            
-            # 카테고리 변환
-            category = ''
-            if result.get('types'):
-                # 첫 번째 타입을 카테고리로 사용
-                category = result.get('types', [''])[0].replace('_', ' ').title()
-            
-            return PlaceInfo(
-                place_name=result.get('name', ''),
-                address=result.get('formatted_address', ''),
-                category=category
-            )
-            
+            return await self._fetch_place_details(place_id)
         except Exception as e:
             logger.error(f"Error getting place details: {e}")
             return None
 
+    @cached_place_details("google")
+    async def _fetch_place_details(self, place_id: str) -> Optional[PlaceInfo]:
+        """
+        Place Details API를 호출합니다.
+        오류는 호출자에게 전달해 캐시되지 않도록 합니다.
+        """
+        details_url = f"{self.base_url}/place/details/json"
+        params = {
+            "place_id": place_id,
+            "fields": "name,formatted_address,types",
+            "key": self.api_key
+        }
+        
+        place_details_stats.upstream_calls += 1
+        response = await http_client.get(details_url, params=params)
+        response.raise_for_status()
+        
+        data = response.json()
+        
+        if data.get('status') != 'OK' or not data.get('result'):
+            return None
+        
+        result = data.get('result', {})
+        
+        return PlaceInfo(
+            place_name=result.get('name', ''),
+            address=result.get('formatted_address', ''),
+            category=_category_from_types(result.get('types'))
+        )
+
     async def search_place_by_keyword(self, keyword: str, latitude: float = None, longitude: float = None) -> Optional[PlaceInfo]:
         """
         키워드로 장소를 검색합니다.
         위치가 지정되지 않으면 서울 중심부를 기본으로 사용합니다.
         """
         try:
-            # 위치가 지정되지 않으면 서울 중심부(시청) 좌표를 기본으로 사용
-            if latitude is None or longitude is None:
-                latitude = 37.5665  # 서울시청 위도
-                longitude = 126.9780  # 서울시청 경도
-                logger.info(f"위치 미지정으로 서울 중심부 기본 좌표 사용: {latitude}, {longitude}")
-            
-            # Text Search API 사용
-            search_url = f"{self.base_url}/place/textsearch/json"
-            params = {
-                "query": keyword,
-                "location": f"{latitude},{longitude}",
-                "radius": 20000,  # 20km 반경
-                "key": self.api_key
-            }
-            
-            response = requests.get(search_url, params=params)
-            response.raise_for_status()
-            
-            data = response.json()
-            results = data.get('results', [])
-            
-            if results:
-                place = results[0]
-                
-                # 장소 상세 정보 조회
-                place_id = place.get('place_id')
-                if place_id:
-                    details = await self._get_place_details(place_id)
-                    if details:
-                        return details
-                
-                # 상세 정보가 없으면 기본 정보 반환
-                return PlaceInfo(
-                    place_name=place.get('name', ''),
-                    address=place.get('formatted_address', ''),
-                    category=place.get('types', [''])[0].replace('_', ' ').title() if place.get('types') else ''
-                )
-            
-            return None
-            
+            return await self._search_place_by_keyword(keyword, latitude, longitude)
         except Exception as e:
             logger.error(f"Error searching place by keyword: {e}")
             return None
 
+    @cached_keyword_search("google")
+    async def _search_place_by_keyword(self, keyword: str, latitude: float = None, longitude: float = None) -> Optional[PlaceInfo]:
+        """
+        키워드 검색 API를 호출합니다.
+        오류는 호출자에게 전달해 캐시되지 않도록 합니다.
+        """
+        # 위치가 지정되지 않으면 서울 중심부(시청) 좌표를 기본으로 사용
+        if latitude is None or longitude is None:
+            latitude = 37.5665  # 서울시청 위도
+            longitude = 126.9780  # 서울시청 경도
+            logger.info(f"위치 미지정으로 서울 중심부 기본 좌표 사용: {latitude}, {longitude}")
+        
+        # Text Search API 사용
+        search_url = f"{self.base_url}/place/textsearch/json"
+        params = {
+            "query": keyword,
+            "location": f"{latitude},{longitude}",
+            "radius": 20000,  # 20km 반경
+            "key": self.api_key
+        }
+        
+        response = await http_client.get(search_url, params=params)
+        response.raise_for_status()
+        
+        data = response.json()
+        if data.get('status') not in ('OK', 'ZERO_RESULTS'):
+            # REQUEST_DENIED, OVER_QUERY_LIMIT 등은 "결과 없음"으로 캐시하지 않음
+            raise RuntimeError(f"Text Search failed: {data.get('status')}")
+        
+        results = data.get('results', [])
+        
+        if results:
+            return await self._resolve_place(results[0], 'formatted_address')
+        
+        return None
+
 google_maps_service = GoogleMapsService()
\ No newline at end of file
@@ -5,6 +5,7 @@ Google Maps Platform API Mock 서비스 (테스트용)
 import logging
 from typing import Optional
 from models import PlaceInfo
+from services.place_cache import cached_by_coordinates, cached_keyword_search
 
 logger = logging.getLogger(__name__)
 
@@ -67,6 +68,7 @@ class GoogleMapsServiceMock:
             }
         ]
 
+    @cached_by_coordinates("google_mock")
     async def get_place_by_coordinates(self, latitude: float, longitude: float) -> Optional[PlaceInfo]:
         """
         GPS 좌표를 기반으로 장소 정보를 조회합니다. (Mock)
@@ -90,6 +92,7 @@ class GoogleMapsServiceMock:
             category="General"
         )
 
+    @cached_keyword_search("google_mock")
     async def search_place_by_keyword(self, keyword: str, latitude: float = None, longitude: float = None) -> Optional[PlaceInfo]:
         """
         키워드로 장소를 검색합니다. (Mock)
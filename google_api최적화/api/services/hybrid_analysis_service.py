@@ -2,6 +2,7 @@
 하이브리드 이미지 분석 서비스
 GenAI + 기존 Vision API + 카카오맵 최적 조합
 """
+import asyncio
 import logging
 from typing import Dict, List, Any, Optional
 
@@ -19,10 +20,12 @@ class HybridAnalysisService:
     async def analyze_with_optimal_strategy(
         self, 
         image_bytes: bytes, 
-        gps_info: Dict = None
+        gps_info: Dict = None,
+        content_hash: Optional[str] = None
     ) -> Dict[str, Any]:
         """
         최적 전략으로 이미지 분석
+        content_hash(ImageContext.sha256)는 분석 캐시/텍스트 추출 키로 전달되어 해시를 다시 계산하지 않습니다.
         """
         try:
             # 1단계: GenAI로 장소 유형 및 맥락 파악
@@ -30,7 +33,7 @@ class HybridAnalysisService:
             context_analysis = await genai_vision_service.analyze_place_context(image_bytes, gps_info)
             
             if not context_analysis.get('success'):
-                return await self._fallback_analysis(image_bytes, gps_info)
+                return await self._fallback_analysis(image_bytes, gps_info, content_hash)
             
             place_analysis = context_analysis['place_analysis']
             place_category = place_analysis.get('place_category', 'commercial')
@@ -41,7 +44,7 @@ class HybridAnalysisService:
                 self._analyze_commercial_strategy
             )
             
-            detailed_analysis = await strategy_func(image_bytes, gps_info, place_analysis)
+            detailed_analysis = await strategy_func(image_bytes, gps_info, place_analysis, content_hash)
             
             return {
                 'success': True,
@@ -55,19 +58,20 @@ class HybridAnalysisService:
             
         except Exception as e:
             logger.error(f"하이브리드 분석 실패: {e}")
-            return await self._fallback_analysis(image_bytes, gps_info)
+            return await self._fallback_analysis(image_bytes, gps_info, content_hash)
     
     async def _analyze_landmark_strategy(
         self, 
         image_bytes: bytes, 
         gps_info: Dict, 
-        context: Dict
+        context: Dict,
+        content_hash: Optional[str] = None
     ) -> Dict[str, Any]:
         """랜드마크 분석 전략"""
         # AWS Rekognition 중심 + GPS 보조
         from services.integrated_analysis_service import integrated_analysis_service
         
-        result = await integrated_analysis_service.analyze_image_comprehensive(image_bytes, gps_info)
+        result = await integrated_analysis_service.analyze_image_comprehensive(image_bytes, gps_info, content_hash)
         
         return {
             'strategy': 'landmark_focused',
@@ -81,7 +85,8 @@ class HybridAnalysisService:
         self, 
         image_bytes: bytes, 
         gps_info: Dict, 
-        context: Dict
+        context: Dict,
+        content_hash: Optional[str] = None
     ) -> Dict[str, Any]:
         """상업지역 분석 전략 (상가거리, 쇼핑몰 등)"""
         # 텍스트 추출 + 카카오맵 검색 중심
@@ -89,7 +94,7 @@ class HybridAnalysisService:
         from services.kakao_service import kakao_service
         
         # 1. 텍스트 추출
-        texts = await google_vision_service.extract_korean_text(image_bytes)
+        texts = await google_vision_service.extract_korean_text(image_bytes, content_hash)
         business_names = google_vision_service.extract_business_names(texts)
         
         # 2. GPS 기반 위치 정보
@@ -102,15 +107,13 @@ class HybridAnalysisService:
         # 3. 텍스트 기반 장소 검색
         text_based_places = []
         if business_names and gps_info:
-            for name in business_names[:3]:
-                place = await kakao_service.search_place_by_keyword(
-                    name, gps_info['latitude'], gps_info['longitude']
-                )
-                if place:
-                    text_based_places.append({
-                        'search_text': name,
-                        'place_info': place.dict()
-                    })
+            places = await kakao_service.search_places_by_keywords(
+                business_names, gps_info['latitude'], gps_info['longitude'], limit=3
+            )
+            text_based_places = [
+                {'search_text': name, 'place_info': place.dict()}
+                for name, place in places
+            ]
         
         return {
             'strategy': 'commercial_focused',
@@ -127,7 +130,8 @@ class HybridAnalysisService:
         self, 
         image_bytes: bytes, 
         gps_info: Dict, 
-        context: Dict
+        context: Dict,
+        content_hash: Optional[str] = None
     ) -> Dict[str, Any]:
         """주거지역 분석 전략"""
         # GPS 중심 + 주변 시설 검색
@@ -137,22 +141,15 @@ class HybridAnalysisService:
         nearby_facilities = []
         
         if gps_info:
-            # 기본 위치 정보
-            location_info = await kakao_service.get_place_by_coordinates(
-                gps_info['latitude'], gps_info['longitude']
+            # 기본 위치 정보 + 주변 편의시설 (동시 조회)
+            location_info, facilities = await asyncio.gather(
+                kakao_service.get_place_by_coordinates(gps_info['latitude'], gps_info['longitude']),
+                kakao_service.search_nearby_facilities(gps_info['latitude'], gps_info['longitude'])
             )
-            
-            # 주변 편의시설 검색
-            facility_keywords = ['편의점', '마트', '병원', '학교', '공원']
-            for keyword in facility_keywords:
-                facility = await kakao_service.search_place_by_keyword(
-                    keyword, gps_info['latitude'], gps_info['longitude']
-                )
-                if facility:
-                    nearby_facilities.append({
-                        'type': keyword,
-                        'info': facility.dict()
-                    })
+            nearby_facilities = [
+                {'type': facility_type, 'info': facility.dict()}
+                for facility_type, facility in facilities
+            ]
         
         return {
             'strategy': 'residential_focused',
@@ -167,13 +164,14 @@ class HybridAnalysisService:
         self, 
         image_bytes: bytes, 
         gps_info: Dict, 
-        context: Dict
+        context: Dict,
+        content_hash: Optional[str] = None
     ) -> Dict[str, Any]:
         """전통시장/문화재 분석 전략"""
         # 통합 분석 (모든 방법 조합)
         from services.integrated_analysis_service import integrated_analysis_service
         
-        result = await integrated_analysis_service.analyze_image_comprehensive(image_bytes, gps_info)
+        result = await integrated_analysis_service.analyze_image_comprehensive(image_bytes, gps_info, content_hash)
         
         return {
             'strategy': 'traditional_comprehensive',
@@ -182,11 +180,12 @@ class HybridAnalysisService:
             'result': result
         }
     
-    async def _fallback_analysis(self, image_bytes: bytes, gps_info: Dict) -> Dict[str, Any]:
+    async def _fallback_analysis(self, image_bytes: bytes, gps_info: Dict,
+                                 content_hash: Optional[str] = None) -> Dict[str, Any]:
         """GenAI 실패 시 대체 분석"""
         from services.integrated_analysis_service import integrated_analysis_service
         
-        result = await integrated_analysis_service.analyze_image_comprehensive(image_bytes, gps_info)
+        result = await integrated_analysis_service.analyze_image_comprehensive(image_bytes, gps_info, content_hash)
         
         return {
             'success': True,
@@ -2,13 +2,29 @@
 통합 이미지 분석 서비스
 Rekognition + Textract + 카카오맵 + Google Vision 결합
 """
+import asyncio
+import hashlib
 import logging
-from typing import Dict, List, Optional, Any
+import time
+from typing import Awaitable, Dict, List, Optional, Any, Tuple
+from config import settings
 from services.vision_service import google_vision_service
 from services.kakao_service import kakao_service
+from utils.cache import CACHE_MISS, Cache, geohash_encode
+from utils.concurrency import run_stage
 
 logger = logging.getLogger(__name__)
 
+# 종합 분석 결과 캐시 (같은 사진을 같은 위치에서 다시 분석하면 재사용)
+analysis_result_cache = Cache(
+    "analysis_result",
+    ttl=settings.ANALYSIS_CACHE_TTL,
+    max_size=settings.ANALYSIS_CACHE_MAX_SIZE,
+)
+
+# 분석 단계 (stage_timings 표시 순서)
+ANALYSIS_STAGES = ('landmarks', 'objects', 'ocr', 'geocode', 'text_search')
+
 class IntegratedAnalysisService:
     def __init__(self):
         self.confidence_threshold = 80
@@ -16,10 +32,48 @@ class IntegratedAnalysisService:
     async def analyze_image_comprehensive(
         self, 
         image_bytes: bytes, 
-        gps_coords: Dict[str, float] = None
+        gps_coords: Dict[str, float] = None,
+        content_hash: Optional[str] = None
     ) -> Dict[str, Any]:
         """
         종합적인 이미지 분석
+
+        같은 이미지(내용 해시)를 같은 위치 셀에서 분석한 결과가 있으면 재사용합니다 (cache_hit).
+        content_hash를 넘기면 (ImageContext.sha256) 해시를 다시 계산하지 않습니다.
+        """
+        if not settings.ANALYSIS_CACHE_ENABLED:
+            return await self._analyze(image_bytes, gps_coords, content_hash)
+        
+        content_hash = content_hash or hashlib.sha256(image_bytes).hexdigest()
+        key = self._analysis_cache_key(content_hash, gps_coords)
+        cached = await analysis_result_cache.get(key)
+        if cached is not CACHE_MISS:
+            return {**cached, 'cache_hit': True}
+        
+        result = await self._analyze(image_bytes, gps_coords, content_hash)
+        # 실패하거나 일부 단계만 성공한 결과는 다음 요청에서 다시 분석하도록 캐시하지 않음
+        if 'error' not in result and not result.get('partial'):
+            await analysis_result_cache.set(key, result)
+        return {**result, 'cache_hit': False}
+    
+    def _analysis_cache_key(self, content_hash: str, gps_coords: Optional[Dict[str, float]]) -> str:
+        if gps_coords:
+            cell = geohash_encode(gps_coords['latitude'], gps_coords['longitude'], settings.GEO_CACHE_PRECISION)
+        else:
+            cell = "none"
+        return f"comprehensive:{content_hash}:{cell}"
+    
+    async def _analyze(
+        self, 
+        image_bytes: bytes, 
+        gps_coords: Dict[str, float] = None,
+        content_hash: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        서로 의존하지 않는 단계는 동시에 실행합니다.
+            landmarks ∥ objects ∥ ocr ∥ geocode → text_search (ocr 결과 필요)
+        단계마다 제한 시간을 두고, 실패하거나 시간 초과된 단계는 비워 둔 채 나머지 결과로 응답합니다.
+        단계별 상태와 소요 시간은 stage_timings에 담깁니다.
         """
         analysis_result = {
             'landmarks': [],
@@ -29,58 +83,101 @@ class IntegratedAnalysisService:
             'location_info': None,
             'analysis_methods': []
         }
+        timings: Dict[str, Dict[str, Any]] = {}
+        start = time.perf_counter()
         
         try:
-            # 1. AWS Rekognition으로 랜드마크 및 객체 인식
-            landmarks = await self._detect_landmarks_mock(image_bytes)
+            # 1. AWS Rekognition 랜드마크/객체 인식, 2. 텍스트 추출 (Google Vision), 3. GPS 기반 위치 정보
+            landmarks_task = asyncio.ensure_future(
+                self._run_stage('landmarks', self._detect_landmarks_mock(image_bytes), timings)
+            )
+            objects_task = asyncio.ensure_future(
+                self._run_stage('objects', self._detect_objects_mock(image_bytes), timings)
+            )
+            ocr_task = asyncio.ensure_future(
+                self._run_stage('ocr', google_vision_service.extract_korean_text(image_bytes, content_hash), timings)
+            )
+            if gps_coords:
+                geocode_task = asyncio.ensure_future(self._run_stage(
+                    'geocode',
+                    kakao_service.get_place_by_coordinates(gps_coords['latitude'], gps_coords['longitude']),
+                    timings
+                ))
+            else:
+                geocode_task = asyncio.ensure_future(self._skip_stage('geocode', timings))
+            
+            # 4. 텍스트 기반 장소 검색 (텍스트 추출이 끝나고 상호명이 있는 경우)
+            text_search_task = asyncio.ensure_future(
+                self._text_search_stage(ocr_task, gps_coords, timings)
+            )
+            
+            landmarks, objects, texts, location_info, text_search = await asyncio.gather(
+                landmarks_task, objects_task, ocr_task, geocode_task, text_search_task
+            )
+            
             if landmarks:
                 analysis_result['landmarks'] = landmarks
                 analysis_result['analysis_methods'].append('rekognition_landmarks')
             
-            objects = await self._detect_objects_mock(image_bytes)
             if objects:
                 analysis_result['objects'] = objects
                 analysis_result['analysis_methods'].append('rekognition_objects')
             
-            # 2. 텍스트 추출 (Google Vision 우선, Textract 보조)
-            texts = await google_vision_service.extract_korean_text(image_bytes)
             if texts:
                 analysis_result['texts'] = texts
                 analysis_result['analysis_methods'].append('google_vision_text')
-                
-                # 상호명 추출
-                business_names = google_vision_service.extract_business_names(texts)
-                analysis_result['business_names'] = business_names
             
-            # 3. GPS 기반 위치 정보
-            if gps_coords:
-                location_info = await kakao_service.get_place_by_coordinates(
-                    gps_coords['latitude'], 
-                    gps_coords['longitude']
-                )
-                if location_info:
-                    analysis_result['location_info'] = location_info.dict()
-                    analysis_result['analysis_methods'].append('kakao_gps')
+            if location_info:
+                analysis_result['location_info'] = location_info.dict()
+                analysis_result['analysis_methods'].append('kakao_gps')
             
-            # 4. 텍스트 기반 장소 검색 (상호명이 있는 경우)
-            if analysis_result['business_names'] and gps_coords:
-                text_based_places = await self._search_places_by_text(
-                    analysis_result['business_names'], 
-                    gps_coords
-                )
-                if text_based_places:
-                    analysis_result['text_based_places'] = text_based_places
-                    analysis_result['analysis_methods'].append('kakao_text_search')
+            business_names, text_based_places = text_search
+            analysis_result['business_names'] = business_names
+            if text_based_places:
+                analysis_result['text_based_places'] = text_based_places
+                analysis_result['analysis_methods'].append('kakao_text_search')
             
             # 5. 종합 결과 생성
             final_result = self._generate_comprehensive_result(analysis_result)
+            final_result['stage_timings'] = {stage: timings[stage] for stage in ANALYSIS_STAGES if stage in timings}
+            final_result['total_time_ms'] = round((time.perf_counter() - start) * 1000, 1)
+            final_result['partial'] = any(
+                timing['status'] in ('timeout', 'error') for timing in timings.values()
+            )
             
             logger.info(f"통합 분석 완료: {analysis_result['analysis_methods']}")
             return final_result
             
         except Exception as e:
             logger.error(f"통합 이미지 분석 실패: {e}")
-            return {'error': str(e), 'analysis_methods': []}
+            return {'error': str(e), 'analysis_methods': [], 'stage_timings': timings}
+    
+    async def _run_stage(self, name: str, aw: Awaitable[Any], timings: Dict[str, Dict[str, Any]]) -> Any:
+        timeout = settings.ANALYSIS_STAGE_TIMEOUTS.get(name, settings.ANALYSIS_STAGE_TIMEOUT)
+        return await run_stage(name, aw, timeout, timings)
+    
+    async def _skip_stage(self, name: str, timings: Dict[str, Dict[str, Any]]) -> None:
+        timings[name] = {'status': 'skipped', 'elapsed_ms': 0.0}
+        return None
+    
+    async def _text_search_stage(
+        self,
+        ocr_task: Awaitable[Optional[List[Dict[str, str]]]],
+        gps_coords: Optional[Dict[str, float]],
+        timings: Dict[str, Dict[str, Any]]
+    ) -> Tuple[List[str], List[Dict[str, Any]]]:
+        """텍스트 추출 결과에서 상호명을 뽑아 장소 검색 (상호명 목록, 검색 결과) 반환"""
+        texts = await ocr_task
+        business_names = google_vision_service.extract_business_names(texts) if texts else []
+        
+        if not (business_names and gps_coords):
+            await self._skip_stage('text_search', timings)
+            return business_names, []
+        
+        places = await self._run_stage(
+            'text_search', self._search_places_by_text(business_names, gps_coords), timings
+        )
+        return business_names, places or []
     
     async def _detect_landmarks_mock(self, image_bytes: bytes) -> List[Dict[str, Any]]:
         """Mock 랜드마크 인식 (실제로는 AWS Rekognition 사용)"""
@@ -103,25 +200,17 @@ class IntegratedAnalysisService:
         business_names: List[str], 
         gps_coords: Dict[str, float]
     ) -> List[Dict[str, Any]]:
-        """텍스트 기반 장소 검색"""
-        places = []
-        
-        for name in business_names[:3]:  # 최대 3개까지만
-            try:
-                place_info = await kakao_service.search_place_by_keyword(
-                    name, 
-                    gps_coords['latitude'], 
-                    gps_coords['longitude']
-                )
-                if place_info:
-                    places.append({
-                        'search_text': name,
-                        'place_info': place_info.dict()
-                    })
-            except Exception as e:
-                logger.warning(f"텍스트 '{name}' 장소 검색 실패: {e}")
-        
-        return places
+        """텍스트 기반 장소 검색 (최대 3개 상호명 동시 검색)"""
+        places = await kakao_service.search_places_by_keywords(
+            business_names,
+            gps_coords['latitude'],
+            gps_coords['longitude'],
+            limit=3
+        )
+        return [
+            {'search_text': name, 'place_info': place_info.dict()}
+            for name, place_info in places
+        ]
     
     def _generate_comprehensive_result(self, analysis: Dict[str, Any]) -> Dict[str, Any]:
         """종합 결과 생성"""
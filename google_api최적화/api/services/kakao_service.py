@@ -1,11 +1,25 @@
-import requests
+import asyncio
+import httpx
 import logging
-from typing import Optional
+from typing import List, Optional, Tuple
 from config import settings
 from models import PlaceInfo
+from services.place_cache import (
+    cached_by_coordinates, cached_facility_search, cached_keyword_search, normalize_keyword
+)
+from utils.concurrency import first_hit_in_order
+from utils.http_client import http_client
 
 logger = logging.getLogger(__name__)
 
+# 주변 편의시설 종류 -> 카카오 카테고리 그룹 코드 (코드가 없는 종류는 키워드 검색)
+FACILITY_CATEGORY_CODES = {
+    "편의점": "CS2",
+    "마트": "MT1",
+    "병원": "HP8",
+    "학교": "SC4",
+}
+
 class KakaoMapService:
     def __init__(self):
         self.api_key = settings.KAKAO_REST_API_KEY
@@ -13,11 +27,26 @@ class KakaoMapService:
         self.headers = {
             "Authorization": f"KakaoAK {self.api_key}"
         }
+        self.nearby_categories = settings.KAKAO_NEARBY_CATEGORIES
+        self.max_concurrent_requests = settings.KAKAO_MAX_CONCURRENT_REQUESTS
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    async def _get(self, url: str, params: dict) -> httpx.Response:
+        """
+        카카오 API GET 요청 (프로세스 전체에서 동시 요청 수를 KAKAO_MAX_CONCURRENT_REQUESTS로 제한)
+        """
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrent_requests)
+        async with self._semaphore:
+            return await http_client.get(url, headers=self.headers, params=params)
 
+    @cached_by_coordinates("kakao")
     async def get_place_by_coordinates(self, latitude: float, longitude: float) -> Optional[PlaceInfo]:
         """
         GPS 좌표를 기반으로 장소 정보를 조회합니다.
         """
+        # 주변 장소 검색은 주소 변환과 독립적이므로 동시에 시작
+        nearby_task = asyncio.ensure_future(self._search_nearby_places(latitude, longitude))
         try:
             # 좌표 -> 주소 변환
             coord_to_address_url = f"{self.base_url}/geo/coord2address.json"
@@ -27,7 +56,7 @@ class KakaoMapService:
                 "input_coord": "WGS84"
             }
             
-            response = requests.get(coord_to_address_url, headers=self.headers, params=params)
+            response = await self._get(coord_to_address_url, params)
             response.raise_for_status()
             
             address_data = response.json()
@@ -44,8 +73,8 @@ class KakaoMapService:
             # 도로명 주소 우선, 없으면 지번 주소 사용
             full_address = road_address.get('address_name') if road_address else address.get('address_name', '')
             
-            # 주변 장소 검색
-            place_info = await self._search_nearby_places(latitude, longitude)
+            # 주변 장소 검색 결과
+            place_info = await nearby_task
             
             if place_info:
                 place_info.address = full_address
@@ -58,95 +87,197 @@ class KakaoMapService:
                 category="일반"
             )
             
-        except requests.RequestException as e:
+        except httpx.HTTPError as e:
             logger.error(f"Kakao API request failed: {e}")
             return None
         except Exception as e:
             logger.error(f"Error getting place info: {e}")
             return None
+        finally:
+            if not nearby_task.done():
+                nearby_task.cancel()
 
     async def _search_nearby_places(self, latitude: float, longitude: float, radius: int = 500) -> Optional[PlaceInfo]:
         """
         주변 관심 장소를 검색합니다.
+        카테고리별 검색을 동시에 실행하고, 우선순위가 가장 높은 결과를 반환합니다.
         """
         try:
-            search_url = f"{self.base_url}/search/category.json"
-            
-            # 관광명소, 문화시설 등을 우선 검색
-            categories = ["AT4", "CT1", "PK6"]  # 관광명소, 문화시설, 주차장
-            
-            for category in categories:
-                params = {
-                    "category_group_code": category,
-                    "x": longitude,
-                    "y": latitude,
-                    "radius": radius,
-                    "sort": "distance"
-                }
-                
-                response = requests.get(search_url, headers=self.headers, params=params)
-                response.raise_for_status()
-                
-                data = response.json()
-                documents = data.get('documents', [])
-                
-                if documents:
-                    place = documents[0]  # 가장 가까운 장소
-                    return PlaceInfo(
-                        place_name=place.get('place_name', ''),
-                        address=place.get('address_name', ''),
-                        category=place.get('category_name', '')
-                    )
-            
-            return None
+            # 관광명소, 문화시설 등을 우선 검색 (settings.KAKAO_NEARBY_CATEGORIES 순서)
+            return await first_hit_in_order([
+                self._search_category(category, latitude, longitude, radius)
+                for category in self.nearby_categories
+            ])
             
         except Exception as e:
             logger.error(f"Error searching nearby places: {e}")
             return None
 
+    async def _search_category(self, category: str, latitude: float, longitude: float, radius: int = 500) -> Optional[PlaceInfo]:
+        """
+        카테고리 그룹 코드 하나로 가장 가까운 장소를 검색합니다.
+        """
+        search_url = f"{self.base_url}/search/category.json"
+        params = {
+            "category_group_code": category,
+            "x": longitude,
+            "y": latitude,
+            "radius": radius,
+            "sort": "distance"
+        }
+        
+        response = await self._get(search_url, params)
+        response.raise_for_status()
+        
+        data = response.json()
+        documents = data.get('documents', [])
+        
+        if documents:
+            place = documents[0]  # 가장 가까운 장소
+            return PlaceInfo(
+                place_name=place.get('place_name', ''),
+                address=place.get('address_name', ''),
+                category=place.get('category_name', '')
+            )
+        
+        return None
+
     async def search_place_by_keyword(self, keyword: str, latitude: float = None, longitude: float = None) -> Optional[PlaceInfo]:
         """
         키워드로 장소를 검색합니다.
         위치가 지정되지 않으면 서울 중심부를 기본으로 사용합니다.
         """
         try:
-            search_url = f"{self.base_url}/search/keyword.json"
-            params = {
-                "query": keyword,
-                "size": 1
-            }
-            
-            # 위치가 지정되지 않으면 서울 중심부(시청) 좌표를 기본으로 사용
-            if latitude is None or longitude is None:
-                latitude = 37.5665  # 서울시청 위도
-                longitude = 126.9780  # 서울시청 경도
-                logger.info(f"위치 미지정으로 서울 중심부 기본 좌표 사용: {latitude}, {longitude}")
-            
-            params.update({
-                "x": longitude,
-                "y": latitude,
-                "radius": 20000,  # 20km 반경으로 확장
-                "sort": "distance"
-            })
-            
-            response = requests.get(search_url, headers=self.headers, params=params)
-            response.raise_for_status()
-            
-            data = response.json()
-            documents = data.get('documents', [])
-            
-            if documents:
-                place = documents[0]
-                return PlaceInfo(
-                    place_name=place.get('place_name', ''),
-                    address=place.get('address_name', ''),
-                    category=place.get('category_name', '')
-                )
-            
-            return None
-            
+            return await self._search_place_by_keyword(keyword, latitude, longitude)
         except Exception as e:
             logger.error(f"Error searching place by keyword: {e}")
             return None
 
+    async def search_nearby_facilities(
+        self,
+        latitude: float,
+        longitude: float,
+        facility_types: Optional[List[str]] = None,
+        radius: Optional[int] = None
+    ) -> List[Tuple[str, PlaceInfo]]:
+        """
+        주변 편의시설을 종류별로 동시에 검색합니다.
+        카테고리 그룹 코드가 있는 종류는 카테고리 검색, 없는 종류(공원 등)는 반경 내 키워드 검색을 사용합니다.
+        시설이 있는 종류만 facility_types 순서대로 (종류, 가장 가까운 시설) 목록으로 반환합니다.
+        """
+        facility_types = facility_types or settings.NEARBY_FACILITY_TYPES
+        radius = radius or settings.NEARBY_FACILITY_RADIUS
+
+        results = await asyncio.gather(*(
+            self._search_facility(facility_type, latitude, longitude, radius)
+            for facility_type in facility_types
+        ), return_exceptions=True)
+
+        facilities = []
+        for facility_type, result in zip(facility_types, results):
+            if isinstance(result, Exception):
+                logger.warning(f"주변 시설 검색 실패 ({facility_type}): {result}")
+            elif result:
+                facilities.append((facility_type, result))
+        return facilities
+
+    @cached_facility_search("kakao")
+    async def _search_facility(self, facility_type: str, latitude: float, longitude: float, radius: int) -> Optional[PlaceInfo]:
+        """
+        시설 종류 하나의 가장 가까운 장소를 검색합니다.
+        오류는 호출자에게 전달해 캐시되지 않도록 합니다.
+        """
+        category = FACILITY_CATEGORY_CODES.get(facility_type)
+        if category:
+            return await self._search_category(category, latitude, longitude, radius)
+
+        params = {
+            "query": facility_type,
+            "x": longitude,
+            "y": latitude,
+            "radius": radius,
+            "sort": "distance",
+            "size": 1
+        }
+        response = await self._get(f"{self.base_url}/search/keyword.json", params)
+        response.raise_for_status()
+
+        documents = response.json().get('documents', [])
+        if documents:
+            place = documents[0]
+            return PlaceInfo(
+                place_name=place.get('place_name', ''),
+                address=place.get('address_name', ''),
+                category=place.get('category_name', '')
+            )
+        return None
+
+    async def search_places_by_keywords(
+        self,
+        keywords: List[str],
+        latitude: float = None,
+        longitude: float = None,
+        limit: Optional[int] = None
+    ) -> List[Tuple[str, PlaceInfo]]:
+        """
+        여러 키워드를 동시에 검색합니다.
+        정규화 기준으로 중복된 키워드는 한 번만 검색하며 (처음 나온 표기 사용),
+        결과가 있는 키워드만 입력 순서대로 (키워드, 장소) 목록으로 반환합니다.
+        """
+        unique_keywords = []
+        seen = set()
+        for keyword in keywords:
+            normalized = normalize_keyword(keyword)
+            if normalized and normalized not in seen:
+                seen.add(normalized)
+                unique_keywords.append(keyword)
+        if limit is not None:
+            unique_keywords = unique_keywords[:limit]
+
+        places = await asyncio.gather(*(
+            self.search_place_by_keyword(keyword, latitude, longitude) for keyword in unique_keywords
+        ))
+        return [(keyword, place) for keyword, place in zip(unique_keywords, places) if place]
+
+    @cached_keyword_search("kakao")
+    async def _search_place_by_keyword(self, keyword: str, latitude: float = None, longitude: float = None) -> Optional[PlaceInfo]:
+        """
+        키워드 검색 API를 호출합니다.
+        오류는 호출자에게 전달해 캐시되지 않도록 합니다.
+        """
+        search_url = f"{self.base_url}/search/keyword.json"
+        params = {
+            "query": keyword,
+            "size": 1
+        }
+        
+        # 위치가 지정되지 않으면 서울 중심부(시청) 좌표를 기본으로 사용
+        if latitude is None or longitude is None:
+            latitude = 37.5665  # 서울시청 위도
+            longitude = 126.9780  # 서울시청 경도
+            logger.info(f"위치 미지정으로 서울 중심부 기본 좌표 사용: {latitude}, {longitude}")
+        
+        params.update({
+            "x": longitude,
+            "y": latitude,
+            "radius": 20000,  # 20km 반경으로 확장
+            "sort": "distance"
+        })
+        
+        response = await self._get(search_url, params)
+        response.raise_for_status()
+        
+        data = response.json()
+        documents = data.get('documents', [])
+        
+        if documents:
+            place = documents[0]
+            return PlaceInfo(
+                place_name=place.get('place_name', ''),
+                address=place.get('address_name', ''),
+                category=place.get('category_name', '')
+            )
+        
+        return None
+
 kakao_service = KakaoMapService()
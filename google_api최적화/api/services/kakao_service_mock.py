@@ -3,8 +3,10 @@
 실제 API 권한이 활성화될 때까지 사용
 """
 import logging
-from typing import Optional
+from typing import List, Optional, Tuple
+from config import settings
 from models import PlaceInfo
+from services.place_cache import cached_by_coordinates, cached_keyword_search
 
 logger = logging.getLogger(__name__)
 
@@ -67,6 +69,7 @@ class KakaoMapServiceMock:
             }
         ]
 
+    @cached_by_coordinates("kakao_mock")
     async def get_place_by_coordinates(self, latitude: float, longitude: float) -> Optional[PlaceInfo]:
         """
         GPS 좌표를 기반으로 장소 정보를 조회합니다. (Mock)
@@ -90,6 +93,7 @@ class KakaoMapServiceMock:
             category="일반"
         )
 
+    @cached_keyword_search("kakao_mock")
     async def search_place_by_keyword(self, keyword: str, latitude: float = None, longitude: float = None) -> Optional[PlaceInfo]:
         """
         키워드로 장소를 검색합니다. (Mock)
@@ -119,6 +123,23 @@ class KakaoMapServiceMock:
         logger.info(f"Mock: 키워드 '{keyword}'에 대한 검색 결과 없음")
         return None
 
+    async def search_nearby_facilities(
+        self,
+        latitude: float,
+        longitude: float,
+        facility_types: Optional[List[str]] = None,
+        radius: Optional[int] = None
+    ) -> List[Tuple[str, PlaceInfo]]:
+        """
+        주변 편의시설을 종류별로 검색합니다. (Mock, 키워드 검색 결과 사용)
+        """
+        facilities = []
+        for facility_type in facility_types or settings.NEARBY_FACILITY_TYPES:
+            place_info = await self.search_place_by_keyword(facility_type, latitude, longitude)
+            if place_info:
+                facilities.append((facility_type, place_info))
+        return facilities
+
     async def _search_nearby_places(self, latitude: float, longitude: float, radius: int = 500) -> Optional[PlaceInfo]:
         """
         주변 관심 장소를 검색합니다. (Mock)
@@ -0,0 +1,333 @@
+"""
+프로세스 내 분석 작업 큐 - SQS 없이 단일 노드에서 분석 요청을 처리합니다 (ANALYSIS_QUEUE_BACKEND=local).
+
+- SQSService와 같은 send_analysis_request 인터페이스, 메시지 본문도 compact_analysis_message와 같음
+- 우선순위 큐 (숫자가 작을수록 먼저): 촬영 요청은 PRIORITY_INTERACTIVE, 일괄 작업은 PRIORITY_BATCH
+- LOCAL_QUEUE_WORKERS개까지 동시에 analysis_pipeline.analyze_message 실행, 결과는 상태 저장소에 직접 기록
+- 대기 작업이 LOCAL_QUEUE_MAX_SIZE개면 503 + Retry-After 로 즉시 거절
+- 실패한 작업은 백오프 후 다시 넣고, WORKER_MAX_RECEIVES번째 실패면 FAILED 처리
+- LOCAL_QUEUE_SQLITE_PATH를 설정하면 끝나지 않은 작업을 SQLite에 저장했다가
+  프로세스가 다시 시작될 때 복구 (설정하지 않으면 종료 시 대기 작업은 사라짐)
+"""
+import asyncio
+import itertools
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from collections import Counter
+from typing import Any, Dict, List, Optional, Set
+
+from config import settings
+from services.analysis_pipeline import ResultReporter, StatusStoreReporter, analyze_message
+from services.sqs_service import compact_analysis_message
+from utils.responses import APIException
+
+logger = logging.getLogger(__name__)
+
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BATCH = 10
+
+# 재시도 백오프 상한 (초)
+MAX_BACKOFF = 60
+
+
+class JobStore:
+    """
+    끝나지 않은 작업을 저장하는 SQLite 파일 (WAL)
+
+    작업은 큐에 넣기 전에 저장하고 완료/최종 실패 시 삭제하므로,
+    프로세스가 비정상 종료되어도 남아 있는 행이 다시 처리할 작업입니다.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(path, timeout=5.0, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS analysis_jobs ("
+            " job_id TEXT PRIMARY KEY,"
+            " priority INTEGER NOT NULL,"
+            " payload TEXT NOT NULL,"
+            " attempts INTEGER NOT NULL DEFAULT 0,"
+            " enqueued_at REAL NOT NULL)"
+        )
+
+    async def _run(self, func, *args):
+        # sqlite3 호출은 블로킹이므로 스레드에서 실행하고, 연결 하나를 잠금으로 보호
+        def locked():
+            with self._lock:
+                return func(*args)
+        return await asyncio.to_thread(locked)
+
+    def _save(self, job: Dict[str, Any]) -> None:
+        self._conn.execute(
+            "INSERT OR REPLACE INTO analysis_jobs (job_id, priority, payload, attempts, enqueued_at)"
+            " VALUES (?, ?, ?, ?, ?)",
+            (job["id"], job["priority"], json.dumps(job["payload"], ensure_ascii=False),
+             job["attempts"], job["enqueued_at"]),
+        )
+
+    def _load(self) -> List[Dict[str, Any]]:
+        rows = self._conn.execute(
+            "SELECT job_id, priority, payload, attempts, enqueued_at FROM analysis_jobs"
+            " ORDER BY priority, enqueued_at"
+        ).fetchall()
+        return [
+            {"id": job_id, "priority": priority, "payload": json.loads(payload),
+             "attempts": attempts, "enqueued_at": enqueued_at}
+            for job_id, priority, payload, attempts, enqueued_at in rows
+        ]
+
+    def _delete(self, job_id: str) -> None:
+        self._conn.execute("DELETE FROM analysis_jobs WHERE job_id = ?", (job_id,))
+
+    async def save(self, job: Dict[str, Any]) -> None:
+        await self._run(self._save, job)
+
+    async def load(self) -> List[Dict[str, Any]]:
+        return await self._run(self._load)
+
+    async def delete(self, job_id: str) -> None:
+        await self._run(self._delete, job_id)
+
+    async def close(self) -> None:
+        await self._run(self._conn.close)
+
+
+class LocalQueueService:
+    def __init__(self, workers: int, max_size: int, retry_after: int, sqlite_path: str = "",
+                 max_attempts: int = settings.WORKER_MAX_RECEIVES,
+                 job_timeout: float = settings.WORKER_JOB_TIMEOUT,
+                 drain_timeout: float = settings.LOCAL_QUEUE_DRAIN_TIMEOUT,
+                 reporter: Optional[ResultReporter] = None):
+        self.workers = max(1, workers)
+        self.max_size = max(1, max_size)
+        self.retry_after = retry_after
+        self.sqlite_path = sqlite_path
+        self.max_attempts = max(1, max_attempts)
+        self.job_timeout = job_timeout
+        self.drain_timeout = drain_timeout
+        self.reporter = reporter or StatusStoreReporter()
+        self._store: Optional[JobStore] = None
+        self._queue: Optional[asyncio.PriorityQueue] = None
+        self._seq = itertools.count()
+        self._queued_by_priority: Counter = Counter()  # 큐에 있는 작업 수 (우선순위별, 재시도 대기 제외)
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._dispatcher: Optional[asyncio.Task] = None
+        self._active: Set[asyncio.Task] = set()
+        self._delayed: Set[asyncio.Task] = set()
+        self._closed = False
+        self.stats = {"enqueued": 0, "rejected": 0, "completed": 0, "retried": 0, "failed": 0, "recovered": 0}
+        self._started = 0
+        self._wait_ms_total = 0.0
+        self._wait_ms_max = 0.0
+        self._job_ms_total = 0.0
+
+    @property
+    def depth(self) -> int:
+        """처리를 기다리는 작업 수 (재시도 대기 포함)"""
+        return (self._queue.qsize() if self._queue is not None else 0) + len(self._delayed)
+
+    async def start(self) -> None:
+        """작업 디스패처 시작, 저장된 작업이 있으면 복구"""
+        if self._dispatcher is not None:
+            return
+        self._queue = asyncio.PriorityQueue()
+        self._queued_by_priority.clear()
+        self._slots = asyncio.Semaphore(self.workers)
+        self._closed = False
+
+        if self.sqlite_path:
+            self._store = JobStore(self.sqlite_path)
+            jobs = await self._store.load()
+            for job in jobs:
+                self._put(job)
+            self.stats["recovered"] += len(jobs)
+            if jobs:
+                logger.info(f"저장된 분석 작업 {len(jobs)}건 복구")
+
+        self._dispatcher = asyncio.ensure_future(self._dispatch())
+        logger.info(f"로컬 분석 큐 시작: 동시 {self.workers}, 대기 한도 {self.max_size}, "
+                    f"저장 {'sqlite ' + self.sqlite_path if self._store else '없음'}")
+
+    async def send_analysis_request(self, s3_url: str, analysis_data: dict, request_id: str = None,
+                                    priority: int = PRIORITY_INTERACTIVE) -> str:
+        """
+        분석 요청을 큐에 넣습니다 (SQSService.send_analysis_request와 같은 인터페이스).
+        대기 작업이 한도에 도달했거나 종료 중이면 503 APIException이 발생합니다.
+        """
+        if self._dispatcher is None and not self._closed:
+            await self.start()
+        if self._closed or self.depth >= self.max_size:
+            self.stats["rejected"] += 1
+            raise APIException(
+                status_code=503,
+                error="ANALYSIS_QUEUE_FULL",
+                message="분석 대기열이 가득 찼습니다. 잠시 후 다시 시도해 주세요.",
+                headers={"Retry-After": str(self.retry_after)},
+            )
+
+        if not request_id:
+            request_id = str(uuid.uuid4())
+
+        job = {
+            "id": request_id,
+            "priority": priority,
+            "payload": compact_analysis_message(request_id, s3_url, analysis_data),
+            "attempts": 0,
+            "enqueued_at": time.time(),
+        }
+        if self._store is not None:
+            await self._store.save(job)
+        self._put(job)
+        self.stats["enqueued"] += 1
+        logger.info(f"Building recognition request queued locally: {request_id} (priority {priority})")
+        return request_id
+
+    def _put(self, job: Dict[str, Any]) -> None:
+        job["queued_at"] = time.perf_counter()
+        self._queue.put_nowait((job["priority"], next(self._seq), job))
+        self._queued_by_priority[job["priority"]] += 1
+
+    async def _dispatch(self) -> None:
+        # 빈 슬롯이 생긴 뒤에 꺼내므로 실행 순서는 항상 그 시점의 우선순위 순
+        while True:
+            await self._slots.acquire()
+            try:
+                priority, _, job = await self._queue.get()
+            except asyncio.CancelledError:
+                self._slots.release()
+                raise
+            self._queued_by_priority[priority] -= 1
+            if not self._queued_by_priority[priority]:
+                del self._queued_by_priority[priority]
+            task = asyncio.ensure_future(self._process(job))
+            self._active.add(task)
+            task.add_done_callback(self._job_done)
+
+    def _job_done(self, task: asyncio.Task) -> None:
+        self._active.discard(task)
+        self._slots.release()
+
+    async def _process(self, job: Dict[str, Any]) -> None:
+        wait_ms = (time.perf_counter() - job["queued_at"]) * 1000
+        self._started += 1
+        self._wait_ms_total += wait_ms
+        self._wait_ms_max = max(self._wait_ms_max, wait_ms)
+
+        request_id = job["id"]
+        start = time.perf_counter()
+        try:
+            await asyncio.wait_for(analyze_message(job["payload"], self.reporter), timeout=self.job_timeout)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            await self._handle_failure(job, e)
+            return
+
+        self._job_ms_total += (time.perf_counter() - start) * 1000
+        self.stats["completed"] += 1
+        await self._forget(job)
+        logger.info(f"분석 완료: {request_id} ({(time.perf_counter() - start) * 1000:.0f}ms)")
+
+    async def _handle_failure(self, job: Dict[str, Any], error: Exception) -> None:
+        request_id = job["id"]
+        job["attempts"] += 1
+        if job["attempts"] >= self.max_attempts:
+            logger.error(f"분석 실패 ({job['attempts']}회), FAILED 처리: {request_id} - {error}")
+            self.stats["failed"] += 1
+            try:
+                await self.reporter.fail(request_id, f"Analysis failed: {error}")
+            except Exception as e:
+                logger.error(f"실패 보고 실패: {request_id} - {e}")
+            await self._forget(job)
+            return
+
+        backoff = min(MAX_BACKOFF, 5 * 2 ** (job["attempts"] - 1))
+        logger.warning(f"분석 실패 ({job['attempts']}회), {backoff}s 후 재시도: {request_id} - {error}")
+        self.stats["retried"] += 1
+        if self._store is not None:
+            await self._store.save(job)
+        task = asyncio.ensure_future(self._requeue_later(job, backoff))
+        self._delayed.add(task)
+        task.add_done_callback(self._delayed.discard)
+
+    async def _requeue_later(self, job: Dict[str, Any], delay: float) -> None:
+        await asyncio.sleep(delay)
+        self._put(job)
+
+    async def _forget(self, job: Dict[str, Any]) -> None:
+        if self._store is not None:
+            try:
+                await self._store.delete(job["id"])
+            except Exception as e:
+                logger.warning(f"작업 기록 삭제 실패 (재시작 시 다시 처리됨): {job['id']} - {e}")
+
+    def snapshot(self) -> Dict[str, Any]:
+        completed = self.stats["completed"] or 1
+        started = self._started or 1
+        return {
+            **self.stats,
+            "workers": self.workers,
+            "max_size": self.max_size,
+            "depth": self.depth,
+            "depth_by_priority": dict(self._queued_by_priority),
+            "retry_waiting": len(self._delayed),
+            "running": len(self._active),
+            "persistent": self._store is not None,
+            "wait_ms_avg": round(self._wait_ms_total / started, 3),
+            "wait_ms_max": round(self._wait_ms_max, 3),
+            "job_ms_avg": round(self._job_ms_total / completed, 1),
+        }
+
+    async def close(self) -> None:
+        """
+        새 요청을 거절하고, 실행 중인 작업을 drain_timeout까지 기다린 뒤 종료합니다.
+        끝나지 않은 작업은 SQLite에 남아 다음 시작 때 복구됩니다 (저장 미설정 시 사라짐).
+        """
+        if self._dispatcher is None:
+            return
+        self._closed = True
+        self._dispatcher.cancel()
+        for task in list(self._delayed):
+            task.cancel()
+        if self._active:
+            _, pending = await asyncio.wait(self._active, timeout=self.drain_timeout)
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+
+        left = self._queue.qsize() + len(self._delayed)
+        if left and self._store is None:
+            logger.warning(f"로컬 분석 큐 종료: 처리하지 못한 작업 {left}건이 사라집니다 (LOCAL_QUEUE_SQLITE_PATH 미설정)")
+        if self._store is not None:
+            await self._store.close()
+            self._store = None
+        self._dispatcher = None
+        self._queue = None
+        self._queued_by_priority.clear()
+        self._delayed.clear()
+
+
+local_queue_service = LocalQueueService(
+    workers=settings.LOCAL_QUEUE_WORKERS,
+    max_size=settings.LOCAL_QUEUE_MAX_SIZE,
+    retry_after=settings.LOCAL_QUEUE_RETRY_AFTER,
+    sqlite_path=settings.LOCAL_QUEUE_SQLITE_PATH,
+)
+
+
+def analysis_queue_stats() -> Dict[str, Any]:
+    if settings.ANALYSIS_QUEUE_BACKEND != "local":
+        return {"backend": settings.ANALYSIS_QUEUE_BACKEND}
+    return {"backend": "local", **local_queue_service.snapshot()}
@@ -1,67 +1,158 @@
 """
 로컬 파일 저장 서비스 (AWS S3 대신 임시 사용)
 """
+import json
 import os
 import uuid
 import logging
-from datetime import datetime
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Union
+
+import aiofiles
+import aiofiles.os
+
+from config import settings
+from services.content_store import DedupStats, build_sidecar, object_name
+from utils.image_context import ImageContext
+from utils.tracing import traced
 
 logger = logging.getLogger(__name__)
 
+PUBLIC_URL_PREFIX = "http://localhost:8000/static/uploads/"
+
 class LocalStorageService:
-    def __init__(self):
-        self.upload_dir = "static/uploads"
+    def __init__(self, upload_dir: str = "static/uploads"):
+        self.upload_dir = upload_dir
+        self.metadata_dir = os.path.join(upload_dir, "meta")
+        self.stats = DedupStats("local")
+        self._known_dirs = set()  # 이미 만든 샤드 디렉토리 (makedirs 반복 호출 방지)
         self.ensure_upload_directory()
-    
+
     def ensure_upload_directory(self):
         """업로드 디렉토리 생성"""
-        if not os.path.exists(self.upload_dir):
-            os.makedirs(self.upload_dir)
-            logger.info(f"업로드 디렉토리 생성: {self.upload_dir}")
-    
-    async def upload_image(self, image_data: bytes, content_type: str, metadata: Dict[str, Any] = None) -> str:
+        for directory in (self.upload_dir, self.metadata_dir):
+            if not os.path.exists(directory):
+                os.makedirs(directory)
+                logger.info(f"업로드 디렉토리 생성: {directory}")
+
+    @traced("storage", backend="local")
+    async def upload_image(self, image_data: Union[bytes, ImageContext], content_type: str, metadata: Dict[str, Any] = None,
+                           upload_id: Optional[str] = None) -> str:
         """
         이미지를 로컬에 저장하고 URL 반환
+
+        이미지는 내용 해시(sha256)를 파일명으로 한 번만 저장하고 (같은 사진 재업로드 시 기록 생략),
+        업로드별 메타데이터는 meta/ 아래 {upload_id}.json 사이드카에 객체 이름과 함께 기록합니다.
+        파일은 이름 앞 2글자씩 나눈 하위 디렉토리(ab/cd/abcd...jpg)에 비동기로 기록합니다.
+        ImageContext를 넘기면 이미 파싱된 이미지 크기를 메타데이터에 함께 기록합니다.
         """
         try:
-            # 파일 확장자 결정
-            ext_map = {
-                'image/jpeg': '.jpg',
-                'image/png': '.png',
-                'image/webp': '.webp'
-            }
-            extension = ext_map.get(content_type, '.jpg')
-            
-            # 고유 파일명 생성
-            filename = f"{uuid.uuid4()}{extension}"
-            filepath = os.path.join(self.upload_dir, filename)
-            
-            # 파일 저장
-            with open(filepath, 'wb') as f:
-                f.write(image_data)
-            
-            # 메타데이터 저장 (JSON 파일로)
-            if metadata:
-                metadata_file = filepath + '.meta.json'
-                import json
-                with open(metadata_file, 'w', encoding='utf-8') as f:
-                    json.dump({
-                        **metadata,
-                        'upload_time': datetime.now().isoformat(),
-                        'content_type': content_type,
-                        'file_size': len(image_data)
-                    }, f, indent=2, ensure_ascii=False)
-            
+            image = ImageContext.ensure(image_data)
+            image_data = image.buffer  # 큰 업로드는 mmap을 복사 없이 그대로 기록
+
+            # 내용 해시 기반 파일명
+            if settings.STORAGE_DEDUP_ENABLED:
+                filename = object_name(image.sha256, content_type)
+            else:
+                filename = object_name(uuid.uuid4().hex, content_type)
+            relative_path = self._shard_path(filename)
+            filepath = os.path.join(self.upload_dir, relative_path)
+
+            # 같은 내용이 이미 있으면 기록 생략
+            deduplicated = await self._file_size(filepath) == len(image_data)
+            if not deduplicated:
+                await self._write_atomic(filepath, image_data)
+            self.stats.record(len(image_data), deduplicated)
+
+            # 업로드별 메타데이터 사이드카 (JSON 파일로)
+            sidecar = build_sidecar(
+                relative_path, image.sha256, content_type, len(image_data), deduplicated,
+                {**(metadata or {}), **self._dimension_metadata(image)}, upload_id
+            )
+            metadata_file = os.path.join(self.metadata_dir, self._shard_path(f"{sidecar['upload_id']}.json"))
+            await self._write_atomic(
+                metadata_file, json.dumps(sidecar, indent=2, ensure_ascii=False).encode('utf-8')
+            )
+
             # 로컬 URL 반환
-            local_url = f"http://localhost:8000/static/uploads/{filename}"
-            
-            logger.info(f"이미지 로컬 저장 완료: {filepath} ({len(image_data)} bytes)")
+            local_url = f"{PUBLIC_URL_PREFIX}{relative_path}"
+
+            if deduplicated:
+                logger.info(f"같은 이미지가 이미 저장되어 있어 기록 생략: {filepath}")
+            else:
+                logger.info(f"이미지 로컬 저장 완료: {filepath} ({len(image_data)} bytes)")
             return local_url
-            
+
         except Exception as e:
             logger.error(f"로컬 이미지 저장 실패: {e}")
             raise Exception(f"Local storage failed: {str(e)}")
 
+    def path_from_url(self, url: str) -> Optional[str]:
+        """upload_image가 반환한 URL의 로컬 파일 경로 (이 저장소의 URL이 아니면 None)"""
+        if not url.startswith(PUBLIC_URL_PREFIX):
+            return None
+        relative_path = url[len(PUBLIC_URL_PREFIX):]
+        if ".." in relative_path.split("/"):
+            return None
+        return os.path.join(self.upload_dir, relative_path)
+
+    def _shard_path(self, filename: str) -> str:
+        """파일명 앞 2글자씩 LOCAL_STORAGE_SHARD_DEPTH 단계 하위 디렉토리 경로 (예: 3a/7b/3a7b...jpg)"""
+        depth = settings.LOCAL_STORAGE_SHARD_DEPTH
+        shards = [filename[i * 2:i * 2 + 2] for i in range(depth)]
+        return "/".join(shards + [filename])
+
+    async def _file_size(self, path: str) -> Optional[int]:
+        try:
+            return (await aiofiles.os.stat(path)).st_size
+        except FileNotFoundError:
+            return None
+
+    async def _write_atomic(self, path: str, data) -> None:
+        """
+        임시 파일에 기록한 뒤 rename으로 교체 (읽는 쪽은 완성된 파일만 보게 됨)
+
+        LOCAL_STORAGE_FSYNC: none - OS 페이지 캐시에 맡김, file - 교체 전 파일 fsync,
+        full - 교체 후 디렉토리까지 fsync (정전 시에도 rename이 남도록)
+        """
+        directory = os.path.dirname(path)
+        if directory not in self._known_dirs:
+            await aiofiles.os.makedirs(directory, exist_ok=True)
+            self._known_dirs.add(directory)
+
+        policy = settings.LOCAL_STORAGE_FSYNC
+        temp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+        try:
+            async with aiofiles.open(temp_path, 'wb') as f:
+                await f.write(data)
+                if policy in ("file", "full"):
+                    await f.flush()
+                    await aiofiles.os.wrap(os.fsync)(f.fileno())
+            await aiofiles.os.replace(temp_path, path)
+        except BaseException:
+            try:
+                await aiofiles.os.remove(temp_path)
+            except OSError:
+                pass
+            raise
+
+        if policy == "full":
+            await aiofiles.os.wrap(self._fsync_directory)(directory)
+
+    @staticmethod
+    def _fsync_directory(directory: str) -> None:
+        fd = os.open(directory, os.O_RDONLY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+    def _dimension_metadata(self, image: ImageContext) -> Dict[str, Any]:
+        """파싱된 이미지 크기 (파싱 실패 시 생략)"""
+        try:
+            width, height = image.dimensions
+            return {'width': width, 'height': height}
+        except Exception:
+            return {}
+
 # 로컬 저장 서비스 인스턴스
 local_storage_service = LocalStorageService()
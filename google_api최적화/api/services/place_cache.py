@@ -0,0 +1,273 @@
+"""
+장소 조회 결과 캐시 - 카카오/구글/Mock 지도 서비스 공용
+"""
+import asyncio
+import functools
+import logging
+import unicodedata
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from config import settings
+from models import PlaceInfo
+from utils.cache import CACHE_MISS, Cache, geohash_encode
+from utils.singleflight import SingleFlight
+from utils.tracing import traced
+
+logger = logging.getLogger(__name__)
+
+# 좌표 -> 장소 캐시 (지오해시 셀 단위)
+geo_place_cache = Cache(
+    "geo_place",
+    ttl=settings.GEO_CACHE_TTL,
+    max_size=settings.GEO_CACHE_MAX_SIZE,
+)
+reverse_geocode_flight = SingleFlight("reverse_geocode")
+
+# 키워드 검색 캐시 (결과 없음도 짧은 TTL로 캐시)
+keyword_place_cache = Cache(
+    "keyword_place",
+    ttl=settings.KEYWORD_CACHE_TTL,
+    max_size=settings.KEYWORD_CACHE_MAX_SIZE,
+)
+keyword_search_flight = SingleFlight("keyword_search")
+
+# 장소 상세 정보 캐시 (place_id 단위)
+place_details_cache = Cache(
+    "place_details",
+    ttl=settings.PLACE_DETAILS_CACHE_TTL,
+    max_size=settings.PLACE_DETAILS_CACHE_MAX_SIZE,
+)
+place_details_flight = SingleFlight("place_details")
+
+
+class PlaceDetailsStats:
+    """
+    검색 결과 -> PlaceInfo 변환 시 Details 호출 통계
+
+    - from_search: 검색 결과만으로 만들어 Details 호출을 생략한 횟수
+    - required: 필드가 부족하거나 always 모드라 Details가 필요했던 횟수 (캐시 적중 포함)
+    - upstream_calls: 실제 Details API 호출 수
+    """
+
+    def __init__(self):
+        self.from_search = 0
+        self.required = 0
+        self.upstream_calls = 0
+
+    def snapshot(self) -> Dict[str, Any]:
+        total = self.from_search + self.required
+        return {
+            "from_search": self.from_search,
+            "required": self.required,
+            "upstream_calls": self.upstream_calls,
+            "avoided_ratio": round((total - self.upstream_calls) / total, 4) if total else 0.0,
+        }
+
+
+place_details_stats = PlaceDetailsStats()
+
+# 주변 편의시설 캐시 (지오해시 셀 + 시설 종류 단위, 결과 없음도 캐시)
+facility_place_cache = Cache(
+    "nearby_facility",
+    ttl=settings.FACILITY_CACHE_TTL,
+    max_size=settings.FACILITY_CACHE_MAX_SIZE,
+)
+facility_search_flight = SingleFlight("facility_search")
+
+
+def coordinate_cache_key(provider: str, latitude: float, longitude: float) -> str:
+    return f"{provider}:{geohash_encode(latitude, longitude, settings.GEO_CACHE_PRECISION)}"
+
+
+def cached_by_coordinates(provider: str):
+    """
+    get_place_by_coordinates(latitude, longitude)에 지오해시 캐시를 적용하는 데코레이터
+    같은 셀 안의 좌표는 업스트림을 다시 호출하지 않습니다. 실패(None)는 캐시하지 않습니다.
+    캐시 미스인 같은 셀의 동시 요청은 업스트림 호출 하나를 공유합니다 (single-flight).
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        @traced("geocode", provider=provider)
+        async def wrapper(self, latitude: float, longitude: float, *args, **kwargs) -> Optional[PlaceInfo]:
+            if not settings.GEO_CACHE_ENABLED:
+                # 캐시를 쓰지 않으면 정확히 같은 좌표의 동시 요청만 합침
+                async def lookup_exact() -> Optional[dict]:
+                    place_info = await func(self, latitude, longitude, *args, **kwargs)
+                    return place_info.dict() if place_info is not None else None
+
+                data = await reverse_geocode_flight.do(f"{provider}:{latitude},{longitude}", lookup_exact)
+                return PlaceInfo(**data) if data is not None else None
+
+            key = coordinate_cache_key(provider, latitude, longitude)
+            cached = await geo_place_cache.get(key)
+            if cached is not CACHE_MISS:
+                return PlaceInfo(**cached)
+
+            async def lookup() -> Optional[dict]:
+                place_info = await func(self, latitude, longitude, *args, **kwargs)
+                if place_info is None:
+                    return None
+                data = place_info.dict()
+                await geo_place_cache.set(key, data)
+                return data
+
+            data = await reverse_geocode_flight.do(key, lookup)
+            return PlaceInfo(**data) if data is not None else None
+
+        return wrapper
+    return decorator
+
+
+class CellGeocoder:
+    """
+    요청 하나(앨범 일괄 분석 등) 안에서 같은 지오해시 셀의 장소 조회를 한 번만 실행
+
+    같은 셀의 사진은 먼저 시작된 조회 결과를 함께 사용하므로, 지오 캐시를 끈 경우나
+    캐시 저장소(redis) 왕복도 셀당 한 번으로 줄어듭니다.
+    """
+
+    def __init__(self, lookup: Callable[[float, float], Awaitable[Optional[PlaceInfo]]], precision: int):
+        self._lookup = lookup
+        self.precision = precision
+        self._cells: Dict[str, asyncio.Future] = {}
+        self.requests = 0
+
+    async def get(self, latitude: float, longitude: float) -> Optional[PlaceInfo]:
+        self.requests += 1
+        key = geohash_encode(latitude, longitude, self.precision)
+        if key not in self._cells:
+            self._cells[key] = asyncio.ensure_future(self._lookup(latitude, longitude))
+        # 먼저 요청한 사진이 취소되어도 같은 셀의 다른 사진은 결과를 받도록 shield
+        return await asyncio.shield(self._cells[key])
+
+    def close(self) -> None:
+        for future in self._cells.values():
+            if not future.done():
+                future.cancel()
+            elif not future.cancelled():
+                future.exception()  # 조회 실패를 기다린 사진이 없을 때 경고가 남지 않도록 확인 처리
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {"requests": self.requests, "cells": len(self._cells),
+                "lookups_saved": self.requests - len(self._cells)}
+
+
+def normalize_keyword(keyword: str) -> str:
+    """
+    검색 키워드 정규화 (유니코드 NFC, 공백 정리, 대소문자 통일)
+    '카페 베네', ' 카페  베네 ', 'CAFE' / 'cafe' 등이 같은 키가 됩니다.
+    """
+    keyword = unicodedata.normalize("NFC", keyword or "")
+    return " ".join(keyword.split()).casefold()
+
+
+def keyword_cache_key(provider: str, keyword: str, latitude: Optional[float], longitude: Optional[float]) -> str:
+    if latitude is None or longitude is None:
+        location = "default"
+    else:
+        location = geohash_encode(latitude, longitude, settings.KEYWORD_CACHE_LOCATION_PRECISION)
+    return f"{provider}:{location}:{normalize_keyword(keyword)}"
+
+
+def cached_keyword_search(provider: str):
+    """
+    search_place_by_keyword(keyword, latitude, longitude)에 캐시를 적용하는 데코레이터
+
+    - 정규화된 키워드 + 위치 버킷을 키로 사용
+    - 검색 결과 없음(None)은 KEYWORD_CACHE_NEGATIVE_TTL 동안 캐시
+    - 같은 키의 동시 요청은 업스트림 호출 하나를 공유 (single-flight)
+    - 예외는 캐시하지 않고 대기 중인 모든 호출에 전달
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        @traced("place_search", provider=provider)
+        async def wrapper(self, keyword: str, latitude: float = None, longitude: float = None) -> Optional[PlaceInfo]:
+            if not settings.KEYWORD_CACHE_ENABLED:
+                return await func(self, keyword, latitude, longitude)
+
+            key = keyword_cache_key(provider, keyword, latitude, longitude)
+            cached = await keyword_place_cache.get(key)
+            if cached is not CACHE_MISS:
+                return PlaceInfo(**cached) if cached is not None else None
+
+            async def search() -> Optional[dict]:
+                place_info = await func(self, keyword, latitude, longitude)
+                if place_info is None:
+                    await keyword_place_cache.set(key, None, ttl=settings.KEYWORD_CACHE_NEGATIVE_TTL)
+                    return None
+                data = place_info.dict()
+                await keyword_place_cache.set(key, data)
+                return data
+
+            data = await keyword_search_flight.do(key, search)
+            return PlaceInfo(**data) if data is not None else None
+
+        return wrapper
+    return decorator
+
+
+def facility_cache_key(provider: str, facility_type: str, latitude: float, longitude: float, radius: int) -> str:
+    cell = geohash_encode(latitude, longitude, settings.GEO_CACHE_PRECISION)
+    return f"{provider}:{cell}:{radius}:{normalize_keyword(facility_type)}"
+
+
+def cached_facility_search(provider: str):
+    """
+    _search_facility(facility_type, latitude, longitude, radius)에 셀 단위 캐시를 적용하는 데코레이터
+
+    같은 셀 안의 좌표는 시설 종류별 결과를 공유합니다.
+    시설 없음(None)은 캐시하고, 예외는 캐시하지 않고 대기 중인 모든 호출자에게 전달합니다.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(self, facility_type: str, latitude: float, longitude: float, radius: int) -> Optional[PlaceInfo]:
+            if not settings.GEO_CACHE_ENABLED:
+                return await func(self, facility_type, latitude, longitude, radius)
+
+            key = facility_cache_key(provider, facility_type, latitude, longitude, radius)
+            cached = await facility_place_cache.get(key)
+            if cached is not CACHE_MISS:
+                return PlaceInfo(**cached) if cached is not None else None
+
+            async def search() -> Optional[dict]:
+                place_info = await func(self, facility_type, latitude, longitude, radius)
+                data = place_info.dict() if place_info is not None else None
+                await facility_place_cache.set(key, data)
+                return data
+
+            data = await facility_search_flight.do(key, search)
+            return PlaceInfo(**data) if data is not None else None
+
+        return wrapper
+    return decorator
+
+
+def cached_place_details(provider: str):
+    """
+    _fetch_place_details(place_id)에 캐시를 적용하는 데코레이터
+
+    - place_id는 바뀌지 않으므로 PLACE_DETAILS_CACHE_TTL 동안 오래 캐시
+    - 같은 place_id의 동시 요청은 업스트림 호출 하나를 공유 (single-flight)
+    - 결과 없음(None)과 예외는 캐시하지 않음
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(self, place_id: str) -> Optional[PlaceInfo]:
+            key = f"{provider}:{place_id}"
+            cached = await place_details_cache.get(key)
+            if cached is not CACHE_MISS and cached is not None:
+                return PlaceInfo(**cached)
+
+            async def fetch() -> Optional[dict]:
+                place_info = await func(self, place_id)
+                if place_info is None:
+                    return None
+                data = place_info.dict()
+                await place_details_cache.set(key, data)
+                return data
+
+            data = await place_details_flight.do(key, fetch)
+            return PlaceInfo(**data) if data is not None else None
+
+        return wrapper
+    return decorator
@@ -1,68 +1,276 @@
+import asyncio
 import boto3
+import json
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from functools import partial
+from botocore.config import Config
 from botocore.exceptions import ClientError
 from config import settings
+from typing import Any, Dict, Optional, Union
+from services.content_store import EXTENSIONS, DedupStats, build_sidecar, object_name
+from utils.image_context import ImageContext
+from utils.metrics import upstream_call
+from utils.tracing import traced
 import logging
 
 logger = logging.getLogger(__name__)
 
-class S3Service:
-    def __init__(self):
-        self.s3_client = boto3.client(
+# 프로세스 전체에서 공유하는 S3 클라이언트/실행기 (boto3 클라이언트는 스레드 안전)
+_s3_client = None
+_s3_executor: Optional[ThreadPoolExecutor] = None
+
+
+def get_s3_client():
+    """
+    공유 S3 클라이언트 (처음 호출할 때 생성)
+
+    인스턴스마다 클라이언트를 만들면 커넥션 풀도 따로 생기므로, 하나의 클라이언트가
+    S3_MAX_POOL_CONNECTIONS 크기의 풀을 모든 호출에 재사용합니다.
+    """
+    global _s3_client
+    if _s3_client is None:
+        _s3_client = boto3.client(
             's3',
             region_name=settings.AWS_REGION,
+            endpoint_url=settings.S3_ENDPOINT_URL,
             aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
-            aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY
+            aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
+            config=Config(
+                max_pool_connections=settings.S3_MAX_POOL_CONNECTIONS,
+                retries={'mode': 'standard'}
+            )
         )
+    return _s3_client
+
+
+def get_s3_executor() -> ThreadPoolExecutor:
+    """blocking boto3 호출을 실행하는 전용 스레드 풀 (S3_MAX_CONCURRENCY개)"""
+    global _s3_executor
+    if _s3_executor is None:
+        _s3_executor = ThreadPoolExecutor(max_workers=settings.S3_MAX_CONCURRENCY, thread_name_prefix="s3")
+    return _s3_executor
+
+
+class S3Service:
+    def __init__(self):
         self.bucket_name = settings.S3_BUCKET_NAME
+        self.stats = DedupStats("s3")
+
+    @property
+    def s3_client(self):
+        return get_s3_client()
+
+    async def _call(self, method: str, **kwargs) -> Any:
+        """boto3 클라이언트 메서드를 S3 실행기에서 실행 (이벤트 루프를 막지 않음)"""
+        loop = asyncio.get_running_loop()
+        with upstream_call("s3", method):
+            return await loop.run_in_executor(get_s3_executor(), partial(getattr(self.s3_client, method), **kwargs))
 
-    async def upload_image(self, image_data: bytes, content_type: str, gps_coords: dict) -> str:
+    @traced("storage", backend="s3")
+    async def upload_image(self, image_data: Union[bytes, ImageContext], content_type: str, gps_coords: dict,
+                           upload_id: Optional[str] = None) -> str:
         """
         이미지를 S3에 업로드하고 URL을 반환합니다.
+
+        객체 키는 내용 해시(photos/{sha256}.jpg)이므로 같은 사진이 이미 있으면 업로드를 생략하고,
+        업로드별 GPS/시각은 metadata/{upload_id}.json 사이드카에 객체 키와 함께 기록합니다.
+        S3_MULTIPART_THRESHOLD 이상인 이미지는 업로드 스풀(mmap)에서 파트 단위로 잘라
+        멀티파트로 동시 업로드합니다.
         """
         try:
-            # 고유한 파일명 생성
-            file_extension = self._get_file_extension(content_type)
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"photos/{timestamp}_{uuid.uuid4().hex[:8]}{file_extension}"
-            
+            image = ImageContext.ensure(image_data)
+
+            # 내용 해시 기반 객체 키
+            if settings.STORAGE_DEDUP_ENABLED:
+                filename = f"photos/{object_name(image.sha256, content_type)}"
+            else:
+                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+                filename = f"photos/{timestamp}_{uuid.uuid4().hex[:8]}{self._get_file_extension(content_type)}"
+
             # 메타데이터 설정
             metadata = {
                 'latitude': str(gps_coords.get('latitude', '')),
                 'longitude': str(gps_coords.get('longitude', '')),
+                'sha256': image.sha256,
                 'upload_time': datetime.now().isoformat()
             }
-            
-            # S3에 업로드
-            self.s3_client.put_object(
+
+            # 같은 내용의 객체가 이미 있으면 업로드 생략
+            deduplicated = settings.STORAGE_DEDUP_ENABLED and await self._object_exists(filename)
+            if not deduplicated:
+                if image.size_bytes >= settings.S3_MULTIPART_THRESHOLD:
+                    await self._put_multipart(filename, image, content_type, metadata)
+                else:
+                    await self._call(
+                        'put_object',
+                        Bucket=self.bucket_name,
+                        Key=filename,
+                        Body=image.data,
+                        ContentType=content_type,
+                        Metadata=metadata
+                    )
+            self.stats.record(image.size_bytes, deduplicated)
+
+            # 업로드별 메타데이터 사이드카
+            sidecar = build_sidecar(
+                filename, image.sha256, content_type, image.size_bytes, deduplicated, metadata, upload_id
+            )
+            await self._call(
+                'put_object',
                 Bucket=self.bucket_name,
-                Key=filename,
-                Body=image_data,
-                ContentType=content_type,
-                Metadata=metadata
+                Key=f"metadata/{sidecar['upload_id']}.json",
+                Body=json.dumps(sidecar, ensure_ascii=False).encode('utf-8'),
+                ContentType='application/json'
             )
-            
-            # S3 URL 생성
-            s3_url = f"https://{self.bucket_name}.s3.{settings.AWS_REGION}.amazonaws.com/{filename}"
-            
-            logger.info(f"Image uploaded successfully: {s3_url}")
+
+            s3_url = self.object_url(filename)
+
+            if deduplicated:
+                logger.info(f"Image already stored, upload skipped: {s3_url}")
+            else:
+                logger.info(f"Image uploaded successfully: {s3_url}")
             return s3_url
-            
+
         except ClientError as e:
             logger.error(f"Failed to upload image to S3: {e}")
             raise Exception(f"S3 upload failed: {str(e)}")
 
+    async def _put_multipart(self, key: str, image: ImageContext, content_type: str, metadata: Dict[str, str]) -> None:
+        """
+        멀티파트 업로드 - 파트를 동시에 올리고, 실패하면 업로드를 중단해 조각이 남지 않게 합니다.
+
+        각 파트는 실행기 스레드에서 원본 버퍼(bytes/mmap)를 잘라 만들므로 전체 이미지를
+        다시 bytes로 복사하지 않습니다.
+        """
+        upload = await self._call(
+            'create_multipart_upload',
+            Bucket=self.bucket_name, Key=key, ContentType=content_type, Metadata=metadata
+        )
+        upload_id = upload['UploadId']
+        buffer = image.buffer
+        chunk_size = max(settings.S3_MULTIPART_CHUNK_SIZE, 5 * 1024 * 1024)
+        offsets = range(0, image.size_bytes, chunk_size)
+
+        async def upload_part(part_number: int, offset: int) -> Dict[str, Any]:
+            loop = asyncio.get_running_loop()
+            with upstream_call("s3", "upload_part"):
+                response = await loop.run_in_executor(
+                    get_s3_executor(),
+                    lambda: self.s3_client.upload_part(
+                        Bucket=self.bucket_name, Key=key, UploadId=upload_id,
+                        PartNumber=part_number, Body=buffer[offset:offset + chunk_size]
+                    )
+                )
+            return {'PartNumber': part_number, 'ETag': response['ETag']}
+
+        try:
+            parts = await asyncio.gather(*(
+                upload_part(number, offset) for number, offset in enumerate(offsets, start=1)
+            ))
+            await self._call(
+                'complete_multipart_upload',
+                Bucket=self.bucket_name, Key=key, UploadId=upload_id,
+                MultipartUpload={'Parts': parts}
+            )
+        except BaseException:
+            try:
+                await self._call('abort_multipart_upload', Bucket=self.bucket_name, Key=key, UploadId=upload_id)
+            except Exception as e:
+                logger.warning(f"Failed to abort multipart upload {upload_id}: {e}")
+            raise
+
+    async def _object_exists(self, key: str) -> bool:
+        """
+        객체 존재 여부 (HEAD 요청)
+        """
+        return await self.head_object(key) is not None
+
+    def object_url(self, key: str) -> str:
+        """객체 URL (S3 호환 서버를 쓰면 path-style 엔드포인트 URL)"""
+        if settings.S3_ENDPOINT_URL:
+            return f"{settings.S3_ENDPOINT_URL.rstrip('/')}/{self.bucket_name}/{key}"
+        return f"https://{self.bucket_name}.s3.{settings.AWS_REGION}.amazonaws.com/{key}"
+
+    def key_from_url(self, url: str) -> Optional[str]:
+        """object_url/s3:// URL의 객체 키 (이 버킷의 URL이 아니면 None)"""
+        for prefix in (self.object_url(""), f"s3://{self.bucket_name}/"):
+            if url.startswith(prefix):
+                return url[len(prefix):]
+        return None
+
+    @staticmethod
+    def incoming_key(upload_id: str) -> str:
+        """클라이언트가 presigned POST로 직접 올리는 원본 객체 키"""
+        return f"incoming/{upload_id}"
+
+    def create_presigned_upload(self, upload_id: str, content_type: str, max_size: int,
+                                expires_in: int) -> Dict[str, Any]:
+        """
+        클라이언트가 API를 거치지 않고 S3에 바로 올릴 presigned POST를 생성합니다.
+
+        정책 조건으로 Content-Type과 크기(1 ~ max_size 바이트)를 고정하므로
+        조건을 벗어난 업로드는 S3가 거절합니다.
+        """
+        try:
+            return self.s3_client.generate_presigned_post(
+                Bucket=self.bucket_name,
+                Key=self.incoming_key(upload_id),
+                Fields={'Content-Type': content_type},
+                Conditions=[
+                    {'Content-Type': content_type},
+                    ['content-length-range', 1, max_size]
+                ],
+                ExpiresIn=expires_in
+            )
+        except ClientError as e:
+            logger.error(f"Failed to generate presigned upload: {e}")
+            raise Exception(f"Failed to generate upload URL: {str(e)}")
+
+    async def head_object(self, key: str) -> Optional[Dict[str, Any]]:
+        """객체 메타데이터 (없으면 None)"""
+        try:
+            return await self._call('head_object', Bucket=self.bucket_name, Key=key)
+        except ClientError as e:
+            if e.response.get('Error', {}).get('Code') in ('404', 'NoSuchKey', 'NotFound'):
+                return None
+            raise
+
+    @traced("storage_read", backend="s3")
+    async def read_head(self, key: str, length: int) -> bytes:
+        """객체 앞부분 length 바이트만 읽기 (Range GET, 형식 판별/EXIF용)"""
+        return await self.read_range(key, 0, length)
+
+    async def read_range(self, key: str, start: int, end: int) -> bytes:
+        """객체의 [start, end) 구간 읽기 (Range GET)"""
+        response = await self._call('get_object', Bucket=self.bucket_name, Key=key, Range=f"bytes={start}-{end - 1}")
+        return await asyncio.get_running_loop().run_in_executor(get_s3_executor(), response['Body'].read)
+
+    @traced("storage_read", backend="s3")
+    async def read_object(self, key: str) -> bytes:
+        """객체 전체 읽기 (분석 워커가 이미지를 가져올 때 사용)"""
+        response = await self._call('get_object', Bucket=self.bucket_name, Key=key)
+        return await asyncio.get_running_loop().run_in_executor(get_s3_executor(), response['Body'].read)
+
+    async def put_json(self, key: str, body: str) -> None:
+        """JSON 문자열을 객체로 저장 (SQS 큰 본문 오프로드용)"""
+        await self._call(
+            'put_object',
+            Bucket=self.bucket_name,
+            Key=key,
+            Body=body.encode('utf-8'),
+            ContentType='application/json'
+        )
+
+    async def delete_object(self, key: str) -> None:
+        await self._call('delete_object', Bucket=self.bucket_name, Key=key)
+
     def _get_file_extension(self, content_type: str) -> str:
         """
         Content-Type에서 파일 확장자를 추출합니다.
         """
-        extension_map = {
-            'image/jpeg': '.jpg',
-            'image/png': '.png',
-            'image/webp': '.webp'
-        }
-        return extension_map.get(content_type, '.jpg')
+        return EXTENSIONS.get(content_type, '.jpg')
 
     async def get_image_url(self, s3_key: str, expires_in: int = 3600) -> str:
         """
@@ -1,75 +1,346 @@
+import asyncio
 import boto3
 import json
+import time
 import uuid
 from datetime import datetime
+from functools import partial
+from botocore.config import Config
 from botocore.exceptions import ClientError
 from config import settings
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set
+from utils.metrics import upstream_call
 import logging
 
 logger = logging.getLogger(__name__)
 
+# 워커(Lambda)가 사용하는 카메라 정보 항목 (원본 EXIF 전체는 보내지 않음)
+WORKER_CAMERA_FIELDS = ('make', 'model', 'datetime', 'width', 'height', 'orientation')
+
+
+def compact_analysis_message(request_id: str, s3_url: str, analysis_data: dict) -> Dict[str, Any]:
+    """
+    분석 워커가 필요한 항목만 남긴 메시지 본문
+
+    exif_metadata의 원본 EXIF(exif_data)와 값이 없는 카메라 정보는 제외합니다.
+    """
+    data = dict(analysis_data)
+    exif_metadata = data.pop('exif_metadata', None) or {}
+    camera_info = exif_metadata.get('camera_info') or {}
+    message = {
+        'request_id': request_id,
+        's3_url': s3_url,
+        'timestamp': datetime.now().isoformat(),
+        'service_type': 'building_recognition',
+        **{key: value for key, value in data.items() if value is not None and key != 'request_id'},
+        'exif_metadata': {
+            'has_exif': exif_metadata.get('has_exif', False),
+            'has_gps': exif_metadata.get('has_gps', False),
+            'camera_info': {
+                key: camera_info[key] for key in WORKER_CAMERA_FIELDS if camera_info.get(key) is not None
+            }
+        }
+    }
+    return message
+
+
+def _entry_size(entry: Dict[str, Any]) -> int:
+    """SendMessageBatch 크기 제한에 포함되는 본문 + 메시지 속성 바이트 수"""
+    size = len(entry['MessageBody'].encode('utf-8'))
+    for name, attribute in entry.get('MessageAttributes', {}).items():
+        size += len(name.encode('utf-8')) + len(attribute['DataType']) + len(attribute['StringValue'].encode('utf-8'))
+    return size
+
+
+class BatchStats:
+    """
+    배치 전송 통계
+
+    - fill_avg: 배치당 평균 메시지 수 (최대 SQS_BATCH_MAX_MESSAGES)
+    - wait_ms: 메시지가 버퍼에서 기다린 시간, flush_ms: SendMessageBatch 호출 시간
+    """
+
+    def __init__(self):
+        self.batches = 0
+        self.messages = 0
+        self.failed = 0
+        self.offloaded = 0
+        self.bytes_total = 0
+        self.wait_ms_total = 0.0
+        self.wait_ms_max = 0.0
+        self.flush_ms_total = 0.0
+        self.flush_ms_max = 0.0
+
+    def record(self, size: int, wait_ms: List[float], flush_ms: float) -> None:
+        self.batches += 1
+        self.messages += len(wait_ms)
+        self.bytes_total += size
+        self.wait_ms_total += sum(wait_ms)
+        self.wait_ms_max = max(self.wait_ms_max, max(wait_ms))
+        self.flush_ms_total += flush_ms
+        self.flush_ms_max = max(self.flush_ms_max, flush_ms)
+
+    def snapshot(self) -> Dict[str, Any]:
+        batches = self.batches or 1
+        messages = self.messages or 1
+        return {
+            "batches": self.batches,
+            "messages": self.messages,
+            "failed": self.failed,
+            "offloaded": self.offloaded,
+            "fill_avg": round(self.messages / batches, 2),
+            "bytes_avg": round(self.bytes_total / batches),
+            "wait_ms_avg": round(self.wait_ms_total / messages, 3),
+            "wait_ms_max": round(self.wait_ms_max, 3),
+            "flush_ms_avg": round(self.flush_ms_total / batches, 3),
+            "flush_ms_max": round(self.flush_ms_max, 3),
+        }
+
+
+class SQSBatchProducer:
+    """
+    메시지를 모아 SendMessageBatch로 보내는 비동기 프로듀서
+
+    버퍼가 max_messages개가 되거나 다음 메시지를 더하면 max_bytes를 넘을 때 바로 보내고,
+    그 전에는 첫 메시지가 들어온 뒤 max_wait초가 지나면 보냅니다.
+    send()는 해당 메시지의 배치 전송이 끝날 때 MessageId를 반환합니다.
+    """
+
+    def __init__(self, send_batch: Callable[[List[Dict[str, Any]]], Awaitable[Dict[str, Any]]],
+                 max_messages: int, max_bytes: int, max_wait: float):
+        self._send_batch = send_batch
+        self.max_messages = max_messages
+        self.max_bytes = max_bytes
+        self.max_wait = max_wait
+        self._buffer: List[tuple] = []  # (entry, size, future, enqueued_at)
+        self._buffer_bytes = 0
+        self._timer: Optional[asyncio.Task] = None
+        self._inflight: Set[asyncio.Task] = set()
+        self.stats = BatchStats()
+
+    async def send(self, entry: Dict[str, Any]) -> str:
+        size = _entry_size(entry)
+        if size > self.max_bytes:
+            raise ValueError(f"SQS message too large for a batch: {size} bytes")
+
+        if self._buffer and self._buffer_bytes + size > self.max_bytes:
+            self._flush_now()
+
+        future = asyncio.get_running_loop().create_future()
+        self._buffer.append((entry, size, future, time.perf_counter()))
+        self._buffer_bytes += size
+
+        if len(self._buffer) >= self.max_messages:
+            self._flush_now()
+        elif self._timer is None:
+            self._timer = asyncio.ensure_future(self._flush_later())
+        return await future
+
+    async def close(self) -> None:
+        """버퍼에 남은 메시지를 보내고 진행 중인 배치가 끝날 때까지 대기"""
+        if self._buffer:
+            self._flush_now()
+        if self._inflight:
+            await asyncio.gather(*self._inflight, return_exceptions=True)
+
+    @property
+    def pending(self) -> int:
+        return len(self._buffer)
+
+    async def _flush_later(self) -> None:
+        await asyncio.sleep(self.max_wait)
+        self._timer = None
+        if self._buffer:
+            self._flush_now()
+
+    def _flush_now(self) -> None:
+        batch, self._buffer, self._buffer_bytes = self._buffer, [], 0
+        if self._timer is not None and self._timer is not asyncio.current_task():
+            self._timer.cancel()
+        self._timer = None
+        task = asyncio.ensure_future(self._flush(batch))
+        self._inflight.add(task)
+        task.add_done_callback(self._inflight.discard)
+
+    async def _flush(self, batch: List[tuple]) -> None:
+        entries = [{**entry, 'Id': str(index)} for index, (entry, _, _, _) in enumerate(batch)]
+        start = time.perf_counter()
+        try:
+            response = await self._send_batch(entries)
+        except Exception as e:
+            logger.error(f"Failed to send SQS batch of {len(batch)}: {e}")
+            self.stats.failed += len(batch)
+            for _, _, future, _ in batch:
+                if not future.done():
+                    future.set_exception(Exception(f"Failed to queue analysis request: {str(e)}"))
+            return
+
+        flush_ms = (time.perf_counter() - start) * 1000
+        self.stats.record(
+            sum(size for _, size, _, _ in batch),
+            [(start - enqueued_at) * 1000 for _, _, _, enqueued_at in batch],
+            flush_ms
+        )
+
+        for result in response.get('Successful', []):
+            future = batch[int(result['Id'])][2]
+            if not future.done():
+                future.set_result(result['MessageId'])
+        for result in response.get('Failed', []):
+            self.stats.failed += 1
+            future = batch[int(result['Id'])][2]
+            if not future.done():
+                future.set_exception(Exception(
+                    f"Failed to queue analysis request: {result.get('Code')} {result.get('Message', '')}"
+                ))
+
+
 class SQSService:
     def __init__(self):
         self.sqs_client = boto3.client(
             'sqs',
             region_name=settings.AWS_REGION,
+            endpoint_url=settings.SQS_ENDPOINT_URL,
             aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
-            aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY
+            aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
+            config=Config(retries={'mode': 'standard'})
         )
         self.queue_url = settings.SQS_QUEUE_URL
+        self.producer = SQSBatchProducer(
+            self._send_message_batch,
+            max_messages=settings.SQS_BATCH_MAX_MESSAGES,
+            max_bytes=settings.SQS_BATCH_MAX_BYTES,
+            max_wait=settings.SQS_BATCH_MAX_WAIT
+        )
+
+    async def _call(self, method: str, **kwargs) -> Any:
+        """blocking boto3 호출을 스레드 풀에서 실행"""
+        loop = asyncio.get_running_loop()
+        with upstream_call("sqs", method):
+            return await loop.run_in_executor(None, partial(getattr(self.sqs_client, method), **kwargs))
+
+    async def _send_message_batch(self, entries: List[Dict[str, Any]]) -> Dict[str, Any]:
+        return await self._call('send_message_batch', QueueUrl=self.queue_url, Entries=entries)
 
     async def send_analysis_request(self, s3_url: str, analysis_data: dict, request_id: str = None) -> str:
         """
         이미지 분석 요청을 SQS 큐에 전송합니다.
+
+        본문은 워커가 필요한 항목만 남기고 (compact_analysis_message),
+        SQS_PAYLOAD_OFFLOAD_BYTES보다 크면 S3에 저장한 뒤 객체 키만 보냅니다 (S3 버킷 설정 시).
+        SQS_BATCHING_ENABLED이면 다른 요청과 모아 SendMessageBatch로 전송합니다.
         """
         if not request_id:
             request_id = str(uuid.uuid4())
-        
-        message_body = {
-            'request_id': request_id,
-            's3_url': s3_url,
-            'timestamp': datetime.now().isoformat(),
-            'service_type': 'building_recognition',
-            **analysis_data  # 추가 분석 데이터 포함
+
+        message_body = json.dumps(compact_analysis_message(request_id, s3_url, analysis_data), ensure_ascii=False)
+        offloaded = (len(message_body.encode('utf-8')) > settings.SQS_PAYLOAD_OFFLOAD_BYTES
+                     and bool(settings.S3_BUCKET_NAME))
+        if offloaded:
+            message_body = await self._offload_payload(request_id, s3_url, message_body)
+
+        exif_metadata = analysis_data.get('exif_metadata', {})
+        entry = {
+            'MessageBody': message_body,
+            'MessageAttributes': {
+                'RequestType': {
+                    'StringValue': 'building_recognition',
+                    'DataType': 'String'
+                },
+                'RequestId': {
+                    'StringValue': request_id,
+                    'DataType': 'String'
+                },
+                'HasEXIF': {
+                    'StringValue': str(exif_metadata.get('has_exif', False)),
+                    'DataType': 'String'
+                },
+                'HasGPS': {
+                    'StringValue': str(exif_metadata.get('has_gps', False)),
+                    'DataType': 'String'
+                },
+                'PayloadOffloaded': {
+                    'StringValue': str(offloaded),
+                    'DataType': 'String'
+                }
+            }
         }
-        
+
         try:
-            response = self.sqs_client.send_message(
-                QueueUrl=self.queue_url,
-                MessageBody=json.dumps(message_body),
-                MessageAttributes={
-                    'RequestType': {
-                        'StringValue': 'building_recognition',
-                        'DataType': 'String'
-                    },
-                    'RequestId': {
-                        'StringValue': request_id,
-                        'DataType': 'String'
-                    },
-                    'HasEXIF': {
-                        'StringValue': str(analysis_data.get('exif_metadata', {}).get('has_exif', False)),
-                        'DataType': 'String'
-                    },
-                    'HasGPS': {
-                        'StringValue': str(analysis_data.get('exif_metadata', {}).get('has_gps', False)),
-                        'DataType': 'String'
-                    }
-                }
-            )
-            
+            if settings.SQS_BATCHING_ENABLED:
+                await self.producer.send(entry)
+            else:
+                await self._call('send_message', QueueUrl=self.queue_url, **entry)
+
             logger.info(f"Building recognition request sent to SQS: {request_id}")
             return request_id
-            
+
         except ClientError as e:
             logger.error(f"Failed to send message to SQS: {e}")
             raise Exception(f"Failed to queue analysis request: {str(e)}")
 
+    async def _offload_payload(self, request_id: str, s3_url: str, message_body: str) -> str:
+        """큰 본문은 S3 sqs-payloads/{request_id}.json에 저장하고 참조만 담은 본문을 반환"""
+        from services.s3_service import s3_service
+
+        key = f"sqs-payloads/{request_id}.json"
+        await s3_service.put_json(key, message_body)
+        self.producer.stats.offloaded += 1
+        logger.info(f"SQS payload offloaded to S3: {key} ({len(message_body)} chars)")
+        return json.dumps({
+            'request_id': request_id,
+            's3_url': s3_url,
+            'service_type': 'building_recognition',
+            'payload_s3_bucket': s3_service.bucket_name,
+            'payload_s3_key': key
+        })
+
+    async def receive_messages(self, max_messages: int, wait_time: int, visibility_timeout: int,
+                               queue_url: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        메시지 long-poll 수신 (분석 워커용, 수신 횟수와 메시지 속성 포함)
+        """
+        response = await self._call(
+            'receive_message',
+            QueueUrl=queue_url or self.queue_url,
+            MaxNumberOfMessages=max_messages,
+            WaitTimeSeconds=wait_time,
+            VisibilityTimeout=visibility_timeout,
+            AttributeNames=['ApproximateReceiveCount'],
+            MessageAttributeNames=['All']
+        )
+        return response.get('Messages', [])
+
+    async def delete_message_batch(self, receipt_handles: List[str],
+                                   queue_url: Optional[str] = None) -> Dict[str, Any]:
+        """
+        메시지 일괄 삭제 (최대 10개, 응답의 Successful/Failed를 그대로 반환)
+        """
+        return await self._call(
+            'delete_message_batch',
+            QueueUrl=queue_url or self.queue_url,
+            Entries=[{'Id': str(i), 'ReceiptHandle': handle} for i, handle in enumerate(receipt_handles)]
+        )
+
+    async def change_visibility(self, receipt_handle: str, visibility_timeout: int,
+                                queue_url: Optional[str] = None) -> None:
+        """
+        메시지 가시성 제한 시간 변경 (처리 중 연장, 재시도 백오프)
+        """
+        await self._call(
+            'change_message_visibility',
+            QueueUrl=queue_url or self.queue_url,
+            ReceiptHandle=receipt_handle,
+            VisibilityTimeout=visibility_timeout
+        )
+
     async def get_queue_attributes(self) -> dict:
         """
         SQS 큐의 속성 정보를 가져옵니다.
         """
         try:
-            response = self.sqs_client.get_queue_attributes(
+            response = await self._call(
+                'get_queue_attributes',
                 QueueUrl=self.queue_url,
                 AttributeNames=['ApproximateNumberOfMessages', 'ApproximateNumberOfMessagesNotVisible']
             )
@@ -78,4 +349,7 @@ class SQSService:
             logger.error(f"Failed to get queue attributes: {e}")
             return {}
 
+    async def close(self) -> None:
+        await self.producer.close()
+
 sqs_service = SQSService()
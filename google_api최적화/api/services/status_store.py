@@ -0,0 +1,479 @@
+"""
+분석 상태 저장소 - 여러 uvicorn 워커/컨테이너가 같은 상태를 공유합니다.
+
+STATUS_STORE_BACKEND 설정으로 선택합니다.
+- memory: 프로세스 메모리 (TTL 만료 + 최대 개수 제한, 단일 프로세스 개발용)
+- sqlite: WAL 모드 SQLite 파일 (같은 호스트의 여러 워커가 공유)
+- redis : Redis 프로토콜 서버 (여러 호스트/컨테이너가 공유)
+
+레코드는 AnalysisStatus를 JSON으로 직렬화한 dict이며, 상태 변경은
+transition()으로 "현재 상태가 허용 목록에 있을 때만 변경"을 원자적으로 수행합니다.
+변경될 때마다 version이 1씩 증가하고, wait_for_update()로 다음 변경을 기다릴 수 있습니다
+(memory: 프로세스 내 이벤트, redis: pub/sub, sqlite: 같은 프로세스 이벤트 + 주기적 확인).
+"""
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional
+
+from config import settings
+from models import AnalysisStatus
+
+logger = logging.getLogger(__name__)
+
+# 완료/실패 이후에는 다른 상태로 되돌리지 않음
+ACTIVE_STATUSES = ("PENDING", "PROCESSING")
+TERMINAL_STATUSES = ("COMPLETED", "FAILED")
+
+
+def _json_default(value: Any) -> str:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+
+def serialize_status(status: AnalysisStatus) -> Dict[str, Any]:
+    """AnalysisStatus -> JSON으로 저장 가능한 dict (datetime은 ISO 문자열)"""
+    record = json.loads(json.dumps(status.dict(), default=_json_default))
+    record["version"] = 1
+    return record
+
+
+def _apply_updates(record: Dict[str, Any], status: str, updates: Dict[str, Any]) -> Dict[str, Any]:
+    record = dict(record)
+    record.update(json.loads(json.dumps(updates, default=_json_default)))
+    record["status"] = status
+    record["updated_at"] = datetime.now().isoformat()
+    record["version"] = record.get("version", 0) + 1
+    return record
+
+
+class _LocalWaiters:
+    """요청 ID별로 이 프로세스에서 변경을 기다리는 코루틴을 깨우는 이벤트"""
+
+    def __init__(self):
+        self._events: Dict[str, List] = {}  # request_id -> [asyncio.Event, 대기자 수]
+
+    def acquire(self, request_id: str) -> asyncio.Event:
+        entry = self._events.get(request_id)
+        if entry is None:
+            entry = self._events[request_id] = [asyncio.Event(), 0]
+        entry[1] += 1
+        return entry[0]
+
+    def release(self, request_id: str) -> None:
+        entry = self._events.get(request_id)
+        if entry is not None:
+            entry[1] -= 1
+            if entry[1] <= 0:
+                del self._events[request_id]
+
+    def notify(self, request_id: str) -> None:
+        # 이벤트를 교체해 이미 깨어난 대기자가 다음 변경을 다시 기다릴 수 있도록 함
+        entry = self._events.get(request_id)
+        if entry is not None:
+            event = entry[0]
+            entry[0] = asyncio.Event()
+            event.set()
+
+    def __len__(self) -> int:
+        return sum(entry[1] for entry in self._events.values())
+
+
+class StatusStore(ABC):
+    """
+    상태 저장소 인터페이스
+
+    - create(status): 새 요청 상태 저장 후 레코드 반환, 같은 ID의 (만료되지 않은) 레코드가
+      이미 있으면 덮어쓰지 않고 None (동시 요청 중 하나만 성공하도록 원자적으로 처리)
+    - get(request_id): 상태 dict 또는 None (없거나 만료됨)
+    - transition(request_id, status, from_statuses, **updates): 현재 상태가
+      from_statuses 중 하나일 때만 원자적으로 변경하고 변경된 레코드를 반환
+      (조건이 맞지 않거나 레코드가 없으면 None)
+    - wait_for_update(request_id, after_version, timeout): version이 after_version보다
+      커지거나 완료/실패 상태가 될 때까지 기다린 뒤 레코드 반환 (시간 초과 시 현재 레코드)
+    """
+
+    name = "base"
+
+    # 다른 프로세스의 변경을 확인하는 주기 (초, None이면 알림만 사용)
+    poll_interval: Optional[float] = None
+
+    def __init__(self):
+        self._waiters = _LocalWaiters()
+
+    async def _publish(self, request_id: str) -> None:
+        """변경 알림 (기본: 같은 프로세스의 대기자만 깨움)"""
+        self._waiters.notify(request_id)
+
+    async def wait_for_update(self, request_id: str, after_version: int,
+                              timeout: float) -> Optional[Dict[str, Any]]:
+        deadline = time.monotonic() + timeout
+        while True:
+            # 레코드를 읽기 전에 이벤트를 잡아 두어 읽기와 대기 사이의 알림을 놓치지 않음
+            event = self._waiters.acquire(request_id)
+            try:
+                record = await self.get(request_id)
+                if (record is None or record.get("version", 0) > after_version
+                        or record["status"] in TERMINAL_STATUSES):
+                    return record
+
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return record
+                if self.poll_interval is not None:
+                    remaining = min(remaining, self.poll_interval)
+                try:
+                    await asyncio.wait_for(event.wait(), timeout=remaining)
+                except asyncio.TimeoutError:
+                    pass
+            finally:
+                self._waiters.release(request_id)
+
+    @abstractmethod
+    async def create(self, status: AnalysisStatus) -> Optional[Dict[str, Any]]:
+        ...
+
+    @abstractmethod
+    async def get(self, request_id: str) -> Optional[Dict[str, Any]]:
+        ...
+
+    @abstractmethod
+    async def transition(self, request_id: str, status: str,
+                         from_statuses: Optional[Iterable[str]] = ACTIVE_STATUSES,
+                         **updates) -> Optional[Dict[str, Any]]:
+        ...
+
+    @abstractmethod
+    async def delete(self, request_id: str) -> None:
+        ...
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {"backend": self.name}
+
+    async def close(self) -> None:
+        pass
+
+
+class MemoryStatusStore(StatusStore):
+    """
+    프로세스 메모리 저장소 - TTL이 지나면 만료되고 max_size를 넘으면 오래된 것부터 제거
+    이벤트 루프 안에서 await 없이 처리하므로 transition은 그 자체로 원자적입니다.
+    """
+
+    name = "memory"
+
+    def __init__(self, ttl: float, max_size: int):
+        super().__init__()
+        self.ttl = ttl
+        self.max_size = max_size
+        self._records: "OrderedDict[str, tuple]" = OrderedDict()
+        self.evictions = 0
+
+    def _get_live(self, request_id: str) -> Optional[Dict[str, Any]]:
+        entry = self._records.get(request_id)
+        if entry is None:
+            return None
+        expires_at, record = entry
+        if expires_at <= time.monotonic():
+            del self._records[request_id]
+            return None
+        return record
+
+    async def create(self, status: AnalysisStatus) -> Optional[Dict[str, Any]]:
+        if self._get_live(status.request_id) is not None:
+            return None
+        record = serialize_status(status)
+        self._records[status.request_id] = (time.monotonic() + self.ttl, record)
+        while len(self._records) > self.max_size:
+            self._records.popitem(last=False)
+            self.evictions += 1
+        await self._publish(status.request_id)
+        return dict(record)
+
+    async def get(self, request_id: str) -> Optional[Dict[str, Any]]:
+        record = self._get_live(request_id)
+        return dict(record) if record is not None else None
+
+    async def transition(self, request_id: str, status: str,
+                         from_statuses: Optional[Iterable[str]] = ACTIVE_STATUSES,
+                         **updates) -> Optional[Dict[str, Any]]:
+        record = self._get_live(request_id)
+        if record is None or (from_statuses is not None and record["status"] not in from_statuses):
+            return None
+        expires_at = self._records[request_id][0]
+        record = _apply_updates(record, status, updates)
+        self._records[request_id] = (expires_at, record)
+        await self._publish(request_id)
+        return dict(record)
+
+    async def delete(self, request_id: str) -> None:
+        self._records.pop(request_id, None)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {"backend": self.name, "size": len(self._records), "evictions": self.evictions,
+                "waiters": len(self._waiters)}
+
+
+class SQLiteStatusStore(StatusStore):
+    """
+    WAL 모드 SQLite 저장소 - 같은 파일을 여러 프로세스가 동시에 읽고 쓸 수 있습니다.
+    transition은 BEGIN IMMEDIATE 트랜잭션 안에서 읽고 쓰므로 프로세스 간에도 원자적입니다.
+    SQLite에는 프로세스 간 알림이 없으므로 다른 워커의 변경은 poll_interval 주기로 확인합니다.
+    """
+
+    name = "sqlite"
+
+    # 만료 레코드 정리 주기 (쓰기 횟수)
+    PURGE_EVERY = 1000
+
+    def __init__(self, path: str, ttl: float, poll_interval: float = 0.5):
+        super().__init__()
+        self.path = path
+        self.ttl = ttl
+        self.poll_interval = poll_interval
+        self._lock = threading.Lock()
+        self._writes = 0
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(path, timeout=5.0, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS analysis_status ("
+            " request_id TEXT PRIMARY KEY,"
+            " status TEXT NOT NULL,"
+            " data TEXT NOT NULL,"
+            " expires_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_analysis_status_expires ON analysis_status (expires_at)")
+
+    async def _run(self, func, *args):
+        # sqlite3 호출은 블로킹이므로 스레드에서 실행하고, 연결 하나를 잠금으로 보호
+        def locked():
+            with self._lock:
+                return func(*args)
+        return await asyncio.to_thread(locked)
+
+    def _maybe_purge(self) -> None:
+        self._writes += 1
+        if self._writes % self.PURGE_EVERY == 0:
+            self._conn.execute("DELETE FROM analysis_status WHERE expires_at <= ?", (time.time(),))
+
+    def _create(self, record: Dict[str, Any]) -> bool:
+        # 만료된 레코드만 덮어씀 (살아 있는 레코드가 있으면 변경 행 0)
+        now = time.time()
+        cursor = self._conn.execute(
+            "INSERT INTO analysis_status (request_id, status, data, expires_at) VALUES (?, ?, ?, ?)"
+            " ON CONFLICT (request_id) DO UPDATE SET"
+            " status = excluded.status, data = excluded.data, expires_at = excluded.expires_at"
+            " WHERE analysis_status.expires_at <= ?",
+            (record["request_id"], record["status"], json.dumps(record, ensure_ascii=False), now + self.ttl, now),
+        )
+        self._maybe_purge()
+        return cursor.rowcount > 0
+
+    def _get(self, request_id: str) -> Optional[Dict[str, Any]]:
+        row = self._conn.execute(
+            "SELECT data FROM analysis_status WHERE request_id = ? AND expires_at > ?",
+            (request_id, time.time()),
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def _transition(self, request_id: str, status: str, from_statuses, updates) -> Optional[Dict[str, Any]]:
+        conn = self._conn
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            record = self._get(request_id)
+            if record is None or (from_statuses is not None and record["status"] not in from_statuses):
+                conn.execute("COMMIT")
+                return None
+            record = _apply_updates(record, status, updates)
+            conn.execute(
+                "UPDATE analysis_status SET status = ?, data = ? WHERE request_id = ?",
+                (status, json.dumps(record, ensure_ascii=False), request_id),
+            )
+            conn.execute("COMMIT")
+            return record
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def _delete(self, request_id: str) -> None:
+        self._conn.execute("DELETE FROM analysis_status WHERE request_id = ?", (request_id,))
+
+    async def create(self, status: AnalysisStatus) -> Optional[Dict[str, Any]]:
+        record = serialize_status(status)
+        if not await self._run(self._create, record):
+            return None
+        await self._publish(status.request_id)
+        return record
+
+    async def get(self, request_id: str) -> Optional[Dict[str, Any]]:
+        return await self._run(self._get, request_id)
+
+    async def transition(self, request_id: str, status: str,
+                         from_statuses: Optional[Iterable[str]] = ACTIVE_STATUSES,
+                         **updates) -> Optional[Dict[str, Any]]:
+        allowed = tuple(from_statuses) if from_statuses is not None else None
+        record = await self._run(self._transition, request_id, status, allowed, updates)
+        if record is not None:
+            await self._publish(request_id)
+        return record
+
+    async def delete(self, request_id: str) -> None:
+        await self._run(self._delete, request_id)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {"backend": self.name, "path": self.path, "waiters": len(self._waiters)}
+
+    async def close(self) -> None:
+        await self._run(self._conn.close)
+
+
+class RedisStatusStore(StatusStore):
+    """
+    Redis 프로토콜 저장소 (Redis, KeyDB, Valkey 등)
+    레코드는 JSON 문자열 + TTL로 저장하고, transition은 WATCH/MULTI 낙관적 트랜잭션으로
+    다른 워커의 동시 변경이 있으면 다시 시도합니다. (KEEPTTL: Redis 6.0 이상)
+    변경 알림은 pub/sub 채널로 모든 워커에 전달하며, 구독이 끊긴 동안에는
+    poll_interval 주기로 확인합니다.
+    """
+
+    name = "redis"
+
+    MAX_RETRIES = 10
+
+    # pub/sub 구독이 끊긴 경우를 대비한 확인 주기 (초)
+    poll_interval = 5.0
+
+    def __init__(self, url: str, prefix: str, ttl: float):
+        import redis.asyncio as redis_asyncio
+
+        super().__init__()
+        self.client = redis_asyncio.from_url(url)
+        self.prefix = prefix
+        self.ttl = ttl
+        self.channel = f"{prefix}events"
+        self.conflicts = 0
+        self._listener: Optional[asyncio.Task] = None
+
+    async def _publish(self, request_id: str) -> None:
+        self._waiters.notify(request_id)
+        try:
+            await self.client.publish(self.channel, request_id)
+        except Exception as e:
+            logger.warning(f"상태 변경 알림 발행 실패 ({request_id}): {e}")
+
+    async def _listen(self) -> None:
+        """다른 워커가 발행한 변경 알림을 받아 이 프로세스의 대기자를 깨움 (끊기면 재연결)"""
+        while True:
+            pubsub = self.client.pubsub()
+            try:
+                await pubsub.subscribe(self.channel)
+                async for message in pubsub.listen():
+                    if message["type"] == "message":
+                        self._waiters.notify(message["data"].decode())
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"상태 변경 구독 끊김, 재연결 대기: {e}")
+                await asyncio.sleep(1)
+            finally:
+                await pubsub.close()
+
+    async def wait_for_update(self, request_id: str, after_version: int,
+                              timeout: float) -> Optional[Dict[str, Any]]:
+        if self._listener is None or self._listener.done():
+            self._listener = asyncio.ensure_future(self._listen())
+        return await super().wait_for_update(request_id, after_version, timeout)
+
+    def _key(self, request_id: str) -> str:
+        return f"{self.prefix}{request_id}"
+
+    async def create(self, status: AnalysisStatus) -> Optional[Dict[str, Any]]:
+        record = serialize_status(status)
+        created = await self.client.set(self._key(status.request_id), json.dumps(record, ensure_ascii=False),
+                                        px=int(self.ttl * 1000), nx=True)
+        if not created:
+            return None
+        await self._publish(status.request_id)
+        return record
+
+    async def get(self, request_id: str) -> Optional[Dict[str, Any]]:
+        raw = await self.client.get(self._key(request_id))
+        return json.loads(raw) if raw is not None else None
+
+    async def transition(self, request_id: str, status: str,
+                         from_statuses: Optional[Iterable[str]] = ACTIVE_STATUSES,
+                         **updates) -> Optional[Dict[str, Any]]:
+        from redis.exceptions import WatchError
+
+        key = self._key(request_id)
+        allowed = tuple(from_statuses) if from_statuses is not None else None
+        async with self.client.pipeline(transaction=True) as pipe:
+            for _ in range(self.MAX_RETRIES):
+                try:
+                    await pipe.watch(key)
+                    raw = await pipe.get(key)
+                    if raw is None:
+                        return None
+                    record = json.loads(raw)
+                    if allowed is not None and record["status"] not in allowed:
+                        return None
+                    record = _apply_updates(record, status, updates)
+                    pipe.multi()
+                    pipe.set(key, json.dumps(record, ensure_ascii=False), keepttl=True)
+                    await pipe.execute()
+                    break
+                except WatchError:
+                    self.conflicts += 1
+                    continue
+                finally:
+                    await pipe.reset()
+            else:
+                raise RuntimeError(f"Status transition conflict for {request_id}")
+
+        await self._publish(request_id)
+        return record
+
+    async def delete(self, request_id: str) -> None:
+        await self.client.delete(self._key(request_id))
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {"backend": self.name, "conflicts": self.conflicts, "waiters": len(self._waiters)}
+
+    async def close(self) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+        await self.client.close()
+
+
+def create_status_store(backend: str = None) -> StatusStore:
+    """
+    settings.STATUS_STORE_BACKEND에 따라 상태 저장소를 생성합니다.
+    설정에 실패하면 메모리 저장소를 사용합니다 (여러 워커 간 공유되지 않음).
+    """
+    backend = (backend or settings.STATUS_STORE_BACKEND).lower()
+    try:
+        if backend == "sqlite":
+            return SQLiteStatusStore(settings.STATUS_STORE_SQLITE_PATH, ttl=settings.STATUS_STORE_TTL,
+                                     poll_interval=settings.STATUS_STORE_POLL_INTERVAL)
+        if backend == "redis":
+            return RedisStatusStore(settings.REDIS_URL, prefix=f"{settings.REDIS_KEY_PREFIX}status:",
+                                    ttl=settings.STATUS_STORE_TTL)
+    except Exception as e:
+        logger.warning(f"{backend} 상태 저장소 설정 실패, 메모리 저장소 사용: {e}")
+    return MemoryStatusStore(ttl=settings.STATUS_STORE_TTL, max_size=settings.STATUS_STORE_MAX_SIZE)
+
+
+status_store = create_status_store()
@@ -0,0 +1,53 @@
+"""
+분석 상태 Server-Sent Events 스트림
+"""
+import json
+import time
+from typing import Any, AsyncIterator, Dict, Optional
+
+from config import settings
+from services.status_store import TERMINAL_STATUSES, status_store
+
+
+def format_sse(data: Dict[str, Any], event: str, event_id: Optional[int] = None) -> str:
+    lines = []
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    lines.append(f"event: {event}")
+    lines.append(f"data: {json.dumps(data, ensure_ascii=False)}")
+    return "\n".join(lines) + "\n\n"
+
+
+async def status_events(request_id: str, after_version: int = 0) -> AsyncIterator[str]:
+    """
+    상태가 바뀔 때마다 status 이벤트를 보내고, 완료/실패 후 스트림을 닫습니다.
+
+    - id 필드에 version을 넣어 재연결 시 Last-Event-ID로 이어받을 수 있음
+    - 변경이 없으면 STATUS_STREAM_HEARTBEAT 주기로 주석을 보내 프록시 연결 유지
+    - STATUS_STREAM_TIMEOUT이 지나면 timeout 이벤트 후 종료 (클라이언트가 재연결)
+    """
+    deadline = time.monotonic() + settings.STATUS_STREAM_TIMEOUT
+    yield "retry: 3000\n\n"
+
+    while True:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            yield format_sse({"request_id": request_id}, event="timeout")
+            return
+
+        record = await status_store.wait_for_update(
+            request_id, after_version, min(remaining, settings.STATUS_STREAM_HEARTBEAT)
+        )
+        if record is None:
+            yield format_sse({"request_id": request_id, "error": "REQUEST_NOT_FOUND"}, event="gone")
+            return
+
+        version = record.get("version", 0)
+        if version > after_version:
+            after_version = version
+            yield format_sse(record, event="status", event_id=version)
+        elif record["status"] not in TERMINAL_STATUSES:
+            yield ": keep-alive\n\n"
+
+        if record["status"] in TERMINAL_STATUSES:
+            return
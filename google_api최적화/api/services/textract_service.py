@@ -5,6 +5,8 @@ import boto3
 import logging
 from typing import List, Dict, Optional
 from config import settings
+from utils.metrics import upstream_call
+from utils.tracing import traced
 
 logger = logging.getLogger(__name__)
 
@@ -17,14 +19,16 @@ class TextractService:
             aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY
         )
     
+    @traced("ocr", provider="textract")
     async def extract_text_from_image(self, image_bytes: bytes) -> List[Dict[str, str]]:
         """
         이미지에서 텍스트 추출
         """
         try:
-            response = self.client.detect_document_text(
-                Document={'Bytes': image_bytes}
-            )
+            with upstream_call("textract", "detect_document_text"):
+                response = self.client.detect_document_text(
+                    Document={'Bytes': image_bytes}
+                )
             
             extracted_texts = []
             
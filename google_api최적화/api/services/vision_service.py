@@ -2,67 +2,85 @@
 Google Vision API 서비스 - 한글 텍스트 인식에 특화
 """
 import base64
-import requests
+import hashlib
 import logging
 from typing import List, Dict, Optional
+from utils.http_client import http_client
+from utils.singleflight import SingleFlight
+from utils.tracing import traced
 
 logger = logging.getLogger(__name__)
 
+# 같은 이미지(내용 해시)의 동시 텍스트 추출 요청은 Vision API 호출 하나를 공유
+ocr_flight = SingleFlight("vision_ocr")
+
 class GoogleVisionService:
     def __init__(self, api_key: str = None):
         self.api_key = api_key
         self.base_url = "https://vision.googleapis.com/v1/images:annotate"
     
-    async def extract_korean_text(self, image_bytes: bytes) -> List[Dict[str, str]]:
+    @traced("ocr", provider="google_vision")
+    async def extract_korean_text(self, image_bytes: bytes, content_hash: Optional[str] = None) -> List[Dict[str, str]]:
         """
         Google Vision API로 한글 텍스트 추출
+        content_hash를 넘기면 (ImageContext.sha256) single-flight 키로 쓰고 해시를 다시 계산하지 않습니다.
         """
         if not self.api_key:
             logger.warning("Google Vision API 키가 없어 Mock 데이터 반환")
             return self._mock_korean_text()
         
         try:
-            # 이미지를 base64로 인코딩
-            image_base64 = base64.b64encode(image_bytes).decode('utf-8')
-            
-            # API 요청 데이터
-            request_data = {
-                "requests": [
-                    {
-                        "image": {
-                            "content": image_base64
-                        },
-                        "features": [
-                            {
-                                "type": "TEXT_DETECTION",
-                                "maxResults": 50
-                            }
-                        ],
-                        "imageContext": {
-                            "languageHints": ["ko", "en"]  # 한국어, 영어 우선
-                        }
-                    }
-                ]
-            }
-            
-            # API 호출
-            response = requests.post(
-                f"{self.base_url}?key={self.api_key}",
-                json=request_data,
-                headers={'Content-Type': 'application/json'}
-            )
-            
-            if response.status_code == 200:
-                result = response.json()
-                return self._parse_vision_response(result)
-            else:
-                logger.error(f"Google Vision API 오류: {response.status_code}")
-                return []
-                
+            key = content_hash or hashlib.sha256(image_bytes).hexdigest()
+            texts = await ocr_flight.do(key, lambda: self._detect_text(image_bytes))
+            # 대기자마다 복사본을 돌려주어 결과 수정이 서로 영향을 주지 않도록 함
+            return [dict(text) for text in texts]
         except Exception as e:
             logger.error(f"Google Vision API 호출 실패: {e}")
             return []
     
+    async def _detect_text(self, image_bytes: bytes) -> List[Dict[str, str]]:
+        """
+        Vision API TEXT_DETECTION 호출
+        네트워크 오류는 호출자(및 같은 이미지를 기다리는 모든 호출)에게 전달합니다.
+        """
+        # 이미지를 base64로 인코딩
+        image_base64 = base64.b64encode(image_bytes).decode('utf-8')
+        
+        # API 요청 데이터
+        request_data = {
+            "requests": [
+                {
+                    "image": {
+                        "content": image_base64
+                    },
+                    "features": [
+                        {
+                            "type": "TEXT_DETECTION",
+                            "maxResults": 50
+                        }
+                    ],
+                    "imageContext": {
+                        "languageHints": ["ko", "en"]  # 한국어, 영어 우선
+                    }
+                }
+            ]
+        }
+        
+        # API 호출
+        response = await http_client.post(
+            f"{self.base_url}?key={self.api_key}",
+            json=request_data,
+            headers={'Content-Type': 'application/json'}
+        )
+        
+        if response.status_code == 200:
+            result = response.json()
+            return self._parse_vision_response(result)
+        else:
+            # 응답 오류(쿼터 초과 등)는 결과 없음으로 처리
+            logger.error(f"Google Vision API 오류: {response.status_code}")
+            return []
+    
     def _parse_vision_response(self, response: dict) -> List[Dict[str, str]]:
         """Vision API 응답 파싱"""
         texts = []
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+프로세스 내 분석 큐 (ANALYSIS_QUEUE_BACKEND=local) 로컬 테스트 스크립트 - SQS/AWS 없이 실행
+
+확인 항목: 대기열이 가득 차면 503 + Retry-After, /health가 SQS 없이 200과 analysis_queue 깊이를 반환
+분석 작업은 끝나지 않는 스텁으로 바꿔 대기열이 비워지지 않게 합니다.
+"""
+import asyncio
+import io
+import os
+
+os.environ.update({
+    "ANALYSIS_QUEUE_BACKEND": "local",
+    "LOCAL_QUEUE_WORKERS": "1",
+    "LOCAL_QUEUE_MAX_SIZE": "2",
+    "LOCAL_QUEUE_DRAIN_TIMEOUT": "0.1",
+})
+
+from fastapi.testclient import TestClient  # noqa: E402
+from PIL import Image  # noqa: E402
+
+import main  # noqa: E402
+import services.local_queue_service as local_queue_module  # noqa: E402
+
+
+async def never_finishes(payload, reporter):
+    await asyncio.sleep(3600)
+
+
+def jpeg_bytes() -> bytes:
+    buffer = io.BytesIO()
+    Image.new("RGB", (64, 48), (120, 90, 60)).save(buffer, "JPEG")
+    return buffer.getvalue()
+
+
+def test_local_queue():
+    local_queue_module.analyze_message = never_finishes
+    image = jpeg_bytes()
+    form = {"device_latitude": "37.5796", "device_longitude": "126.9770"}
+
+    with TestClient(main.app) as client:
+        # 1. 실행 1건 + 대기 2건까지 접수, 그 다음 요청은 503
+        print("1. 대기열 포화 시 거절")
+        statuses = []
+        for index in range(4):
+            response = client.post("/api/v1/capture-photo", data=form,
+                                   files={"file": (f"photo{index}.jpg", image, "image/jpeg")})
+            statuses.append(response.status_code)
+        retry_after = response.headers.get("retry-after")
+        ok = statuses == [202, 202, 202, 503] and retry_after is not None
+        print(f"  {'✅' if ok else '❌'} 응답 {statuses}, Retry-After: {retry_after}")
+
+        # 2. SQS 없이 /health 200 + 분석 큐 깊이
+        print("\n2. /health (SQS 미사용)")
+        response = client.get("/health")
+        body = response.json()
+        queue = body.get("analysis_queue", {})
+        ok = (response.status_code == 200 and body["services"]["sqs"] == "not_used"
+              and queue.get("backend") == "local" and queue.get("depth") == 2)
+        print(f"  {'✅' if ok else '❌'} {response.status_code}, sqs: {body.get('services', {}).get('sqs')}, "
+              f"analysis_queue: depth={queue.get('depth')} running={queue.get('running')} "
+              f"rejected={queue.get('rejected')}")
+
+
+if __name__ == "__main__":
+    test_local_queue()
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+S3 업로드 로컬 테스트 스크립트 (AWS 계정 없이 S3 호환 서버로 실행)
+
+- S3_ENDPOINT_URL이 설정되어 있으면 그 서버(MinIO 등)를 사용
+- 없으면 moto 서버를 프로세스 안에서 띄워 사용 (pip install "moto[server]")
+
+확인 항목: 단일 업로드, 같은 이미지 재업로드 시 생략, 멀티파트 업로드(mmap 스풀), 동시 업로드
+"""
+import asyncio
+import hashlib
+import logging
+import mmap
+import os
+import tempfile
+import time
+
+from config import settings
+
+BUCKET = "historical-api-local-test"
+
+
+def start_local_s3():
+    """S3 호환 서버 준비 (moto 서버를 띄운 경우 종료할 수 있도록 서버 객체 반환)"""
+    if settings.S3_ENDPOINT_URL:
+        return None
+    from moto.server import ThreadedMotoServer
+
+    logging.getLogger("werkzeug").setLevel(logging.ERROR)
+    server = ThreadedMotoServer(ip_address="127.0.0.1", port=0)
+    server.start()
+    host, port = server.get_host_and_port()
+    settings.S3_ENDPOINT_URL = f"http://{host}:{port}"
+    settings.AWS_ACCESS_KEY_ID = settings.AWS_ACCESS_KEY_ID or "testing"
+    settings.AWS_SECRET_ACCESS_KEY = settings.AWS_SECRET_ACCESS_KEY or "testing"
+    return server
+
+
+def spooled_image(size: int) -> mmap.mmap:
+    """업로드 스풀처럼 임시 파일을 mmap으로 연 이미지"""
+    spool = tempfile.TemporaryFile()
+    spool.write(os.urandom(size))
+    spool.flush()
+    return mmap.mmap(spool.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+async def _run():
+    settings.S3_BUCKET_NAME = BUCKET
+    from services.s3_service import S3Service, get_s3_client
+    from utils.image_context import ImageContext
+
+    client = get_s3_client()
+    try:
+        client.create_bucket(
+            Bucket=BUCKET, CreateBucketConfiguration={'LocationConstraint': settings.AWS_REGION}
+        )
+    except client.exceptions.BucketAlreadyOwnedByYou:
+        pass
+    s3 = S3Service()
+    gps = {'latitude': 37.5796, 'longitude': 126.9770}
+
+    print(f"엔드포인트: {settings.S3_ENDPOINT_URL}, 버킷: {BUCKET}")
+    print("=" * 50)
+
+    # 1. 단일 업로드 + 같은 이미지 재업로드
+    print("1. 단일 업로드 / 재업로드 생략")
+    data = os.urandom(200 * 1024)
+    url = await s3.upload_image(data, "image/jpeg", gps)
+    await s3.upload_image(data, "image/jpeg", gps)
+    stats = s3.stats.snapshot()
+    print(f"  URL: {url}")
+    print(f"  {'✅' if stats['dedup_hits'] == 1 else '❌'} 재업로드 생략: {stats}")
+
+    # 2. 멀티파트 업로드 (스풀 mmap에서 파트 단위로 업로드)
+    print("\n2. 멀티파트 업로드")
+    size = settings.S3_MULTIPART_CHUNK_SIZE * 2 + 1024 * 1024
+    image = ImageContext(spooled_image(size))
+    start = time.perf_counter()
+    url = await s3.upload_image(image, "image/jpeg", gps)
+    key = url.split(f"/{BUCKET}/", 1)[1]
+    stored = client.get_object(Bucket=BUCKET, Key=key)['Body'].read()
+    ok = hashlib.sha256(stored).hexdigest() == image.sha256
+    print(f"  {'✅' if ok else '❌'} {size / 1048576:.0f}MB 업로드 {(time.perf_counter() - start) * 1000:.0f}ms, 내용 일치: {ok}")
+
+    # 3. 동시 업로드 (공유 클라이언트 커넥션 풀 + 실행기)
+    count = 32
+    print(f"\n3. 동시 업로드 {count}건 x 1MB")
+    dedup_enabled = settings.STORAGE_DEDUP_ENABLED
+    settings.STORAGE_DEDUP_ENABLED = False
+    try:
+        payloads = [os.urandom(1024 * 1024) for _ in range(count)]
+        start = time.perf_counter()
+        urls = await asyncio.gather(*(s3.upload_image(payload, "image/jpeg", gps) for payload in payloads))
+        elapsed = time.perf_counter() - start
+    finally:
+        settings.STORAGE_DEDUP_ENABLED = dedup_enabled
+    ok = len(set(urls)) == count
+    print(f"  {'✅' if ok else '❌'} {len(set(urls))}/{count}건 업로드 {elapsed * 1000:.0f}ms "
+          f"(풀 {settings.S3_MAX_POOL_CONNECTIONS}, 동시 {settings.S3_MAX_CONCURRENCY})")
+
+
+def test_s3_upload():
+    import services.s3_service as s3_module
+
+    saved = {name: getattr(settings, name) for name in
+             ("S3_ENDPOINT_URL", "S3_BUCKET_NAME", "AWS_ACCESS_KEY_ID", "AWS_SECRET_ACCESS_KEY")}
+    server = start_local_s3()
+    try:
+        asyncio.run(_run())
+    finally:
+        if server:
+            server.stop()
+        # 다른 테스트가 종료된 테스트 서버로 접속하지 않도록 설정과 공유 클라이언트를 되돌림
+        for name, value in saved.items():
+            setattr(settings, name, value)
+        s3_module._s3_client = None
+
+
+if __name__ == "__main__":
+    test_s3_upload()
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+SQS 분석 요청 전송 로컬 테스트 스크립트 (AWS 계정 없이 SQS 호환 서버로 실행)
+
+- SQS_ENDPOINT_URL이 설정되어 있으면 그 서버(ElasticMQ 등)를 사용
+- 없으면 moto 서버를 프로세스 안에서 띄워 사용 (pip install "moto[server]")
+
+확인 항목: 메시지 본문 축소, 동시 요청 배치 전송 (send_message vs SendMessageBatch),
+큰 본문의 S3 참조 전송
+"""
+import asyncio
+import json
+import logging
+import time
+
+from config import settings
+
+QUEUE_NAME = "historical-api-local-test"
+BUCKET = "historical-api-local-test"
+
+
+def start_local_aws():
+    """SQS/S3 호환 서버 준비 (moto 서버를 띄운 경우 종료할 수 있도록 서버 객체 반환)"""
+    if settings.SQS_ENDPOINT_URL:
+        return None
+    from moto.server import ThreadedMotoServer
+
+    logging.getLogger("werkzeug").setLevel(logging.ERROR)
+    server = ThreadedMotoServer(ip_address="127.0.0.1", port=0)
+    server.start()
+    host, port = server.get_host_and_port()
+    settings.SQS_ENDPOINT_URL = settings.S3_ENDPOINT_URL = f"http://{host}:{port}"
+    settings.AWS_ACCESS_KEY_ID = settings.AWS_ACCESS_KEY_ID or "testing"
+    settings.AWS_SECRET_ACCESS_KEY = settings.AWS_SECRET_ACCESS_KEY or "testing"
+    return server
+
+
+def analysis_data(index: int) -> dict:
+    """capture-photo가 만드는 것과 같은 형태의 분석 요청 (원본 EXIF 포함)"""
+    return {
+        'gps_coordinates': {'latitude': 37.5796, 'longitude': 126.9770, 'source': 'exif'},
+        'place_info': {'place_name': '경복궁', 'address': '서울 종로구 사직로 161', 'category': '관광명소'},
+        'exif_metadata': {
+            'has_exif': True,
+            'has_gps': True,
+            'gps_coordinates': {'latitude': 37.5796, 'longitude': 126.9770},
+            'camera_info': {'make': 'Apple', 'model': 'iPhone 15', 'datetime': '2024:05:01 12:00:00',
+                            'width': 4032, 'height': 3024, 'iso': None},
+            'exif_data': {f'Tag{tag}': 'x' * 40 for tag in range(60)} | {'Index': index}
+        }
+    }
+
+
+def drain(client, queue_url: str) -> list:
+    messages = []
+    while True:
+        response = client.receive_message(QueueUrl=queue_url, MaxNumberOfMessages=10, MessageAttributeNames=['All'])
+        batch = response.get('Messages', [])
+        if not batch:
+            return messages
+        messages.extend(batch)
+        client.delete_message_batch(
+            QueueUrl=queue_url,
+            Entries=[{'Id': str(i), 'ReceiptHandle': m['ReceiptHandle']} for i, m in enumerate(batch)]
+        )
+
+
+async def _run():
+    settings.S3_BUCKET_NAME = BUCKET
+    import boto3
+    from services.s3_service import get_s3_client, s3_service
+    from services.sqs_service import SQSService, compact_analysis_message
+
+    sqs_client = boto3.client(
+        'sqs', region_name=settings.AWS_REGION, endpoint_url=settings.SQS_ENDPOINT_URL,
+        aws_access_key_id=settings.AWS_ACCESS_KEY_ID, aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY
+    )
+    settings.SQS_QUEUE_URL = sqs_client.create_queue(QueueName=QUEUE_NAME)['QueueUrl']
+    s3_client = get_s3_client()
+    s3_service.bucket_name = BUCKET  # 큰 본문 저장용 (공유 인스턴스는 import 시점의 설정으로 생성됨)
+    try:
+        s3_client.create_bucket(Bucket=BUCKET, CreateBucketConfiguration={'LocationConstraint': settings.AWS_REGION})
+    except s3_client.exceptions.BucketAlreadyOwnedByYou:
+        pass
+    drain(sqs_client, settings.SQS_QUEUE_URL)
+
+    print(f"엔드포인트: {settings.SQS_ENDPOINT_URL}, 큐: {settings.SQS_QUEUE_URL}")
+    print("=" * 50)
+
+    # 1. 메시지 본문 축소
+    print("1. 메시지 본문 축소 (원본 EXIF 제외)")
+    full = json.dumps({'request_id': 'x', 's3_url': 'y', **analysis_data(0)}, ensure_ascii=False)
+    compact = json.dumps(compact_analysis_message('x', 'y', analysis_data(0)), ensure_ascii=False)
+    print(f"  {'✅' if len(compact) < len(full) else '❌'} {len(full.encode())} → {len(compact.encode())} bytes")
+
+    # 2. 동시 요청 전송
+    count = 200
+    print(f"\n2. 동시 분석 요청 {count}건")
+    for batching in (False, True):
+        settings.SQS_BATCHING_ENABLED = batching
+        sqs = SQSService()
+        start = time.perf_counter()
+        await asyncio.gather(*(
+            sqs.send_analysis_request(f"s3://{BUCKET}/photos/{i}.jpg", analysis_data(i)) for i in range(count)
+        ))
+        elapsed = time.perf_counter() - start
+        received = len(drain(sqs_client, settings.SQS_QUEUE_URL))
+        calls = sqs.producer.stats.batches if batching else count
+        label = "SendMessageBatch" if batching else "send_message (기존)"
+        print(f"  {'✅' if received == count else '❌'} {label:<20} API 호출 {calls:4d}, {elapsed * 1000:6.0f}ms, 수신 {received}")
+    print(f"  배치 통계: {sqs.producer.stats.snapshot()}")
+
+    # 3. 큰 본문은 S3에 두고 참조만 전송
+    print("\n3. 큰 본문 S3 참조 전송")
+    data = analysis_data(0)
+    data['place_info'] = {**data['place_info'], 'description': '가' * settings.SQS_PAYLOAD_OFFLOAD_BYTES}
+    await sqs.send_analysis_request(f"s3://{BUCKET}/photos/large.jpg", data, "large-payload-request")
+    message = drain(sqs_client, settings.SQS_QUEUE_URL)[0]
+    body = json.loads(message['Body'])
+    stored = json.loads(s3_client.get_object(Bucket=body['payload_s3_bucket'], Key=body['payload_s3_key'])['Body'].read())
+    ok = stored['place_info']['description'] == data['place_info']['description']
+    print(f"  {'✅' if ok else '❌'} 본문 {len(message['Body'])} bytes, 참조: {body['payload_s3_key']}, 원본 일치: {ok}")
+
+
+def test_sqs_batching():
+    import services.s3_service as s3_module
+
+    bucket_name = s3_module.s3_service.bucket_name
+    saved = {name: getattr(settings, name) for name in
+             ("SQS_ENDPOINT_URL", "S3_ENDPOINT_URL", "SQS_QUEUE_URL", "S3_BUCKET_NAME",
+              "SQS_BATCHING_ENABLED", "AWS_ACCESS_KEY_ID", "AWS_SECRET_ACCESS_KEY")}
+    server = start_local_aws()
+    try:
+        asyncio.run(_run())
+    finally:
+        if server:
+            server.stop()
+        # 다른 테스트가 종료된 테스트 서버로 접속하지 않도록 설정과 공유 클라이언트를 되돌림
+        for name, value in saved.items():
+            setattr(settings, name, value)
+        s3_module.s3_service.bucket_name = bucket_name
+        s3_module._s3_client = None
+
+
+if __name__ == "__main__":
+    test_sqs_batching()
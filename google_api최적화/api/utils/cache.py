@@ -0,0 +1,233 @@
+"""
+캐시 유틸리티 - 지오해시, TTL/LRU 메모리 백엔드, Redis 호환 백엔드
+"""
+import json
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+# 캐시에 키가 없음을 나타내는 값 (None 자체도 캐시할 수 있도록 별도 객체 사용)
+CACHE_MISS = object()
+
+_GEOHASH_BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+
+
+def geohash_encode(latitude: float, longitude: float, precision: int = 7) -> str:
+    """
+    위도/경도를 지오해시 문자열로 변환합니다.
+    precision 7 ≈ 153m x 153m, 8 ≈ 38m x 19m 셀
+    """
+    lat_range = [-90.0, 90.0]
+    lng_range = [-180.0, 180.0]
+    chars = []
+    bits = 0
+    bit_count = 0
+    even = True
+
+    while len(chars) < precision:
+        if even:
+            mid = (lng_range[0] + lng_range[1]) / 2
+            if longitude >= mid:
+                bits = (bits << 1) | 1
+                lng_range[0] = mid
+            else:
+                bits <<= 1
+                lng_range[1] = mid
+        else:
+            mid = (lat_range[0] + lat_range[1]) / 2
+            if latitude >= mid:
+                bits = (bits << 1) | 1
+                lat_range[0] = mid
+            else:
+                bits <<= 1
+                lat_range[1] = mid
+        even = not even
+        bit_count += 1
+
+        if bit_count == 5:
+            chars.append(_GEOHASH_BASE32[bits])
+            bits = 0
+            bit_count = 0
+
+    return "".join(chars)
+
+
+class CacheStats:
+    """캐시 적중/미스 카운터"""
+
+    def __init__(self):
+        self.hits = 0
+        self.negative_hits = 0
+        self.misses = 0
+        self.sets = 0
+        self.errors = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "hits": self.hits,
+            "negative_hits": self.negative_hits,
+            "misses": self.misses,
+            "sets": self.sets,
+            "errors": self.errors,
+            "hit_ratio": round(self.hit_ratio, 4),
+        }
+
+
+class MemoryCacheBackend:
+    """프로세스 메모리 캐시 (TTL 만료 + 최대 크기 초과 시 LRU 제거)"""
+
+    name = "memory"
+
+    def __init__(self, max_size: int = 10000):
+        self.max_size = max_size
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self.evictions = 0
+
+    async def get(self, key: str) -> Any:
+        entry = self._entries.get(key)
+        if entry is None:
+            return CACHE_MISS
+
+        expires_at, value = entry
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self._entries[key]
+            return CACHE_MISS
+
+        self._entries.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        expires_at = time.monotonic() + ttl if ttl else None
+        self._entries[key] = (expires_at, value)
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    async def delete(self, key: str) -> None:
+        self._entries.pop(key, None)
+
+    async def clear(self) -> None:
+        self._entries.clear()
+
+    def size(self) -> int:
+        return len(self._entries)
+
+
+class RedisCacheBackend:
+    """
+    Redis 프로토콜 호환 캐시 (Redis, KeyDB, Valkey 등)
+    값은 JSON으로 저장하며, 크기 제한은 서버의 maxmemory-policy(allkeys-lru)로 관리합니다.
+    """
+
+    name = "redis"
+
+    def __init__(self, url: str, prefix: str):
+        import redis.asyncio as redis_asyncio
+
+        self.client = redis_asyncio.from_url(url)
+        self.prefix = prefix
+
+    async def get(self, key: str) -> Any:
+        raw = await self.client.get(self.prefix + key)
+        if raw is None:
+            return CACHE_MISS
+        return json.loads(raw)
+
+    async def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        raw = json.dumps(value, ensure_ascii=False)
+        if ttl:
+            await self.client.set(self.prefix + key, raw, px=int(ttl * 1000))
+        else:
+            await self.client.set(self.prefix + key, raw)
+
+    async def delete(self, key: str) -> None:
+        await self.client.delete(self.prefix + key)
+
+    async def clear(self) -> None:
+        async for key in self.client.scan_iter(match=f"{self.prefix}*"):
+            await self.client.delete(key)
+
+    def size(self) -> Optional[int]:
+        return None
+
+
+def create_cache_backend(name: str, max_size: int):
+    """
+    settings.CACHE_BACKEND에 따라 캐시 백엔드를 생성합니다.
+    Redis 연결 설정에 실패하면 메모리 백엔드를 사용합니다.
+    """
+    if settings.CACHE_BACKEND == "redis":
+        try:
+            return RedisCacheBackend(settings.REDIS_URL, prefix=f"{settings.REDIS_KEY_PREFIX}{name}:")
+        except Exception as e:
+            logger.warning(f"Redis 캐시 백엔드 설정 실패, 메모리 캐시 사용: {e}")
+    return MemoryCacheBackend(max_size=max_size)
+
+
+class Cache:
+    """
+    이름공간별 캐시 (백엔드 + 기본 TTL + 통계)
+    백엔드 오류는 캐시 미스로 처리해 업스트림 호출을 막지 않습니다.
+    """
+
+    def __init__(self, name: str, ttl: Optional[float], max_size: int = 10000, backend=None):
+        self.name = name
+        self.ttl = ttl
+        self.backend = backend or create_cache_backend(name, max_size)
+        self.stats = CacheStats()
+        cache_registry.append(self)
+
+    async def get(self, key: str) -> Any:
+        try:
+            value = await self.backend.get(key)
+        except Exception as e:
+            self.stats.errors += 1
+            logger.warning(f"캐시 조회 실패 ({self.name}): {e}")
+            value = CACHE_MISS
+
+        if value is CACHE_MISS:
+            self.stats.misses += 1
+        else:
+            self.stats.hits += 1
+            if value is None:
+                self.stats.negative_hits += 1
+        return value
+
+    async def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        try:
+            await self.backend.set(key, value, ttl if ttl is not None else self.ttl)
+            self.stats.sets += 1
+        except Exception as e:
+            self.stats.errors += 1
+            logger.warning(f"캐시 저장 실패 ({self.name}): {e}")
+
+    async def clear(self) -> None:
+        await self.backend.clear()
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "backend": self.backend.name,
+            "size": self.backend.size(),
+            "evictions": getattr(self.backend, "evictions", None),
+            **self.stats.snapshot(),
+        }
+
+
+# /health 등에서 전체 캐시 통계를 조회하기 위한 등록부
+cache_registry: List[Cache] = []
+
+
+def cache_stats() -> Dict[str, Dict[str, Any]]:
+    return {cache.name: cache.snapshot() for cache in cache_registry}
@@ -0,0 +1,73 @@
+"""
+비동기 동시 실행 헬퍼
+"""
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Dict, Optional, Sequence, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+async def first_hit_in_order(aws: Sequence[Awaitable[Optional[T]]]) -> Optional[T]:
+    """
+    우선순위 순으로 정렬된 작업들을 동시에 실행하고,
+    결과가 있는(None이 아닌) 가장 높은 우선순위의 값을 반환합니다.
+
+    상위 작업이 모두 끝나 결과가 확정되는 즉시 나머지 작업은 취소합니다.
+    개별 작업의 예외는 결과 없음으로 취급합니다.
+    """
+    tasks = [asyncio.ensure_future(aw) for aw in aws]
+    try:
+        for index, task in enumerate(tasks):
+            try:
+                result = await task
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"우선순위 {index} 작업 실패, 다음 순위로 진행: {e}")
+                continue
+
+            if result is not None:
+                return result
+        return None
+    finally:
+        for task in tasks:
+            if not task.done():
+                task.cancel()
+
+
+async def run_stage(
+    name: str,
+    aw: Awaitable[T],
+    timeout: float,
+    timings: Dict[str, Dict[str, Any]]
+) -> Optional[T]:
+    """
+    분석 단계 하나를 제한 시간 안에서 실행하고 소요 시간과 결과 상태를 timings[name]에 기록합니다.
+
+    상태: ok(결과 있음) / empty(결과 없음) / timeout / error
+    시간 초과나 예외는 None으로 반환해 나머지 단계의 결과(부분 결과)는 그대로 사용할 수 있게 합니다.
+    """
+    start = time.perf_counter()
+    try:
+        result = await asyncio.wait_for(aw, timeout=timeout)
+    except asyncio.TimeoutError:
+        timings[name] = {'status': 'timeout', 'elapsed_ms': _elapsed_ms(start)}
+        logger.warning(f"분석 단계 '{name}' 시간 초과 ({timeout}s)")
+        return None
+    except asyncio.CancelledError:
+        raise
+    except Exception as e:
+        timings[name] = {'status': 'error', 'elapsed_ms': _elapsed_ms(start), 'error': str(e)}
+        logger.warning(f"분석 단계 '{name}' 실패: {e}")
+        return None
+
+    timings[name] = {'status': 'ok' if result else 'empty', 'elapsed_ms': _elapsed_ms(start)}
+    return result
+
+
+def _elapsed_ms(start: float) -> float:
+    return round((time.perf_counter() - start) * 1000, 1)
@@ -1,9 +1,10 @@
-from PIL import Image
-from PIL.ExifTags import TAGS, GPSTAGS
-import io
 import logging
-from typing import Optional, Dict, Tuple
+import math
+from typing import Optional, Dict, Tuple, Union
 from datetime import datetime
+from utils.image_context import ImageContext
+from utils.image_executor import image_executor
+from utils.tracing import traced
 
 logger = logging.getLogger(__name__)
 
@@ -13,27 +14,12 @@ class EXIFProcessor:
     """
     
     @staticmethod
-    def extract_exif_data(image_data: bytes) -> Dict:
+    def extract_exif_data(image_data: Union[bytes, ImageContext]) -> Dict:
         """
         이미지에서 EXIF 데이터를 추출합니다.
+        ImageContext를 넘기면 이미 파싱된 결과를 재사용합니다.
         """
-        try:
-            image = Image.open(io.BytesIO(image_data))
-            exif_data = {}
-            
-            # 기본 EXIF 정보 추출
-            if hasattr(image, '_getexif'):
-                exif = image._getexif()
-                if exif is not None:
-                    for tag_id, value in exif.items():
-                        tag = TAGS.get(tag_id, tag_id)
-                        exif_data[tag] = value
-            
-            return exif_data
-            
-        except Exception as e:
-            logger.error(f"EXIF 데이터 추출 실패: {e}")
-            return {}
+        return ImageContext.ensure(image_data).exif
     
     @staticmethod
     def extract_gps_from_exif(exif_data: Dict) -> Optional[Tuple[float, float]]:
@@ -76,6 +62,33 @@ class EXIFProcessor:
             logger.error(f"GPS 좌표 추출 실패: {e}")
             return None
     
+    @staticmethod
+    def _to_float(value) -> Optional[float]:
+        try:
+            value = float(value)
+        except (TypeError, ValueError):
+            return None
+        return None if math.isnan(value) else round(value, 4)
+    
+    @staticmethod
+    def _to_int(value) -> Optional[int]:
+        if isinstance(value, (tuple, list)):  # 일부 카메라는 ISO를 배열로 기록
+            value = value[0] if value else None
+        try:
+            return int(value)
+        except (TypeError, ValueError):
+            return None
+    
+    @staticmethod
+    def _format_exposure(value) -> Optional[str]:
+        """노출 시간을 '1/120' 또는 '2.0' 형태의 문자열로 변환"""
+        seconds = EXIFProcessor._to_float(value)
+        if not seconds or seconds <= 0:
+            return None
+        if seconds < 1:
+            return f"1/{round(1 / seconds)}"
+        return str(seconds)
+    
     @staticmethod
     def extract_camera_info(exif_data: Dict) -> Dict:
         """
@@ -101,10 +114,11 @@ class EXIFProcessor:
             camera_info['height'] = exif_data.get('ExifImageHeight', 0)
             
             # 카메라 설정
-            camera_info['iso'] = exif_data.get('ISOSpeedRatings')
-            camera_info['focal_length'] = exif_data.get('FocalLength')
-            camera_info['aperture'] = exif_data.get('FNumber')
-            camera_info['exposure_time'] = exif_data.get('ExposureTime')
+            # (PIL은 IFDRational, 헤더 리더는 float를 반환하므로 CameraInfo 타입에 맞게 변환)
+            camera_info['iso'] = EXIFProcessor._to_int(exif_data.get('ISOSpeedRatings'))
+            camera_info['focal_length'] = EXIFProcessor._to_float(exif_data.get('FocalLength'))
+            camera_info['aperture'] = EXIFProcessor._to_float(exif_data.get('FNumber'))
+            camera_info['exposure_time'] = EXIFProcessor._format_exposure(exif_data.get('ExposureTime'))
             
             # 방향 정보 (나침반)
             camera_info['orientation'] = exif_data.get('Orientation')
@@ -115,7 +129,7 @@ class EXIFProcessor:
         return camera_info
     
     @staticmethod
-    def process_image_metadata(image_data: bytes) -> Dict:
+    def process_image_metadata(image_data: Union[bytes, ImageContext]) -> Dict:
         """
         이미지에서 모든 메타데이터를 추출하고 처리합니다.
         """
@@ -152,5 +166,20 @@ class EXIFProcessor:
         except Exception as e:
             logger.error(f"이미지 메타데이터 처리 실패: {e}")
             return result
+    
+    @staticmethod
+    @traced("exif")
+    async def process_image_metadata_async(image_data: Union[bytes, ImageContext]) -> Dict:
+        """
+        process_image_metadata와 같지만 EXIF를 아직 읽지 않았다면 이미지 작업 실행기에서 읽습니다.
+        (validate_image_content_async를 거친 ImageContext는 이미 EXIF가 있으므로 바로 처리)
+        """
+        image = ImageContext.ensure(image_data)
+        if not image.exif_loaded:
+            exif_data = await image_executor.run(
+                "exif", EXIFProcessor.extract_exif_data, image_executor.payload(image)
+            )
+            image.apply_inspection({'exif': exif_data})
+        return EXIFProcessor.process_image_metadata(image)
 
 exif_processor = EXIFProcessor()
@@ -0,0 +1,295 @@
+"""
+헤더 전용 EXIF 리더 - 픽셀 데이터를 디코드하지 않고 필요한 태그만 읽습니다.
+
+JPEG APP1, PNG eXIf, WebP EXIF 청크에서 TIFF 블록을 찾아
+GPS IFD와 카메라 정보에 필요한 태그만 디코드합니다 (MakerNote 등은 건너뜀).
+지원하지 않는 형식이거나 구조가 예상과 다르면 None을 반환하며,
+호출자는 기존 PIL 경로로 대체합니다.
+
+read_trailing_exif_fields는 파일 앞부분만 받은 경우(S3 직접 업로드 finalize)
+이미지 데이터 뒤에 있는 WebP EXIF 청크 / PNG eXIf 청크를 Range 읽기로 찾아 읽습니다.
+"""
+import struct
+import zlib
+from typing import Any, Awaitable, Callable, Dict, Optional, Union
+
+EXIF_IFD_POINTER = 0x8769
+GPS_IFD_POINTER = 0x8825
+
+# IFD0 태그 (PIL.ExifTags.TAGS 이름과 동일하게 반환)
+IFD0_TAGS = {
+    0x010F: 'Make',
+    0x0110: 'Model',
+    0x0112: 'Orientation',
+    0x0132: 'DateTime',
+}
+
+# Exif 서브 IFD 태그 (EXIFProcessor.extract_camera_info에서 사용하는 항목)
+EXIF_TAGS = {
+    0x8827: 'ISOSpeedRatings',
+    0x829A: 'ExposureTime',
+    0x829D: 'FNumber',
+    0x920A: 'FocalLength',
+    0xA002: 'ExifImageWidth',
+    0xA003: 'ExifImageHeight',
+}
+
+# GPS IFD 태그 (PIL과 같이 숫자 키 사용: 1=LatitudeRef, 2=Latitude, 3=LongitudeRef, 4=Longitude)
+GPS_TAGS = {1, 2, 3, 4, 5, 6}
+
+# TIFF 타입별 (struct 포맷, 바이트 크기)
+_TYPE_FORMATS = {
+    1: ('B', 1),    # BYTE
+    2: ('s', 1),    # ASCII
+    3: ('H', 2),    # SHORT
+    4: ('L', 4),    # LONG
+    5: ('LL', 8),   # RATIONAL
+    7: ('B', 1),    # UNDEFINED
+    9: ('l', 4),    # SLONG
+    10: ('ll', 8),  # SRATIONAL
+    11: ('f', 4),   # FLOAT
+    12: ('d', 8),   # DOUBLE
+}
+
+_PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+
+# 앞부분 뒤의 EXIF를 찾을 때의 제한
+# - WebP: 청크 헤더를 하나씩 Range 읽기 하므로 확인할 청크 수 제한 (정지 이미지는 보통 3~5개)
+# - PNG: IDAT 청크가 많아 청크 목록을 따라가지 않고 파일 끝부분에서 eXIf 청크를 찾음 (IEND 바로 앞)
+# - 두 형식 모두 EXIF 청크가 이보다 크면 읽지 않음
+TRAILING_WEBP_MAX_CHUNKS = 16
+TRAILING_PNG_TAIL_BYTES = 64 * 1024
+TRAILING_EXIF_MAX_BYTES = 256 * 1024
+_WEBP_VP8X_EXIF_FLAG = 0x08
+
+# read_range(start, end): [start, end) 구간의 bytes를 반환하는 비동기 함수
+RangeReader = Callable[[int, int], Awaitable[bytes]]
+
+
+class ExifFormatError(ValueError):
+    """예상하지 못한 EXIF 구조 (PIL 경로로 대체)"""
+
+
+def find_tiff_block(data: Union[bytes, memoryview]) -> Optional[memoryview]:
+    """
+    컨테이너에서 EXIF TIFF 블록을 찾습니다.
+    EXIF가 없으면 빈 memoryview, 지원하지 않는 형식이면 None을 반환합니다.
+    """
+    view = memoryview(data)
+
+    if view[:2] == b'\xff\xd8':
+        return _find_jpeg_exif(view)
+    if view[:8] == _PNG_SIGNATURE:
+        return _find_png_exif(view)
+    if view[:4] == b'RIFF' and view[8:12] == b'WEBP':
+        return _find_webp_exif(view)
+    return None
+
+
+def _strip_exif_header(block: memoryview) -> memoryview:
+    return block[6:] if block[:6] == b'Exif\x00\x00' else block
+
+
+def _find_jpeg_exif(view: memoryview) -> Optional[memoryview]:
+    offset = 2
+    length = len(view)
+    while offset + 4 <= length:
+        if view[offset] != 0xFF:
+            raise ExifFormatError("JPEG marker expected")
+        marker = view[offset + 1]
+        if marker == 0xFF:  # 채움 바이트
+            offset += 1
+            continue
+        if marker in (0xD9, 0xDA):  # EOI / SOS: 이후는 압축된 이미지 데이터
+            break
+        if 0xD0 <= marker <= 0xD7 or marker == 0x01:  # 길이 없는 마커
+            offset += 2
+            continue
+
+        segment_length = struct.unpack_from('>H', view, offset + 2)[0]
+        segment = view[offset + 4:offset + 2 + segment_length]
+        if marker == 0xE1 and segment[:6] == b'Exif\x00\x00':
+            return segment[6:]
+        offset += 2 + segment_length
+    return view[:0]
+
+
+def _find_png_exif(view: memoryview) -> Optional[memoryview]:
+    offset = 8
+    length = len(view)
+    while offset + 8 <= length:
+        chunk_length, chunk_type = struct.unpack_from('>L4s', view, offset)
+        data_start = offset + 8
+        if chunk_type == b'eXIf':
+            return _strip_exif_header(view[data_start:data_start + chunk_length])
+        if chunk_type in (b'tEXt', b'zTXt', b'iTXt') and bytes(view[data_start:data_start + 21]) == b'Raw profile type exif':
+            return None  # ImageMagick 방식 텍스트 EXIF는 PIL로 처리
+        if chunk_type == b'IEND':
+            break
+        offset = data_start + chunk_length + 4  # CRC
+    return view[:0]
+
+
+def _find_webp_exif(view: memoryview) -> Optional[memoryview]:
+    offset = 12
+    length = len(view)
+    while offset + 8 <= length:
+        fourcc, chunk_length = struct.unpack_from('<4sL', view, offset)
+        data_start = offset + 8
+        if fourcc == b'EXIF':
+            return _strip_exif_header(view[data_start:data_start + chunk_length])
+        offset = data_start + chunk_length + (chunk_length & 1)  # 짝수 패딩
+    return view[:0]
+
+
+class _TiffReader:
+    def __init__(self, block: memoryview):
+        if len(block) < 8:
+            raise ExifFormatError("TIFF header too short")
+        byte_order = bytes(block[:2])
+        if byte_order == b'II':
+            self.endian = '<'
+        elif byte_order == b'MM':
+            self.endian = '>'
+        else:
+            raise ExifFormatError("invalid TIFF byte order")
+        if struct.unpack_from(self.endian + 'H', block, 2)[0] != 42:
+            raise ExifFormatError("invalid TIFF magic")
+        self.block = block
+        self.first_ifd = struct.unpack_from(self.endian + 'L', block, 4)[0]
+
+    def read_ifd(self, offset: int, wanted) -> Dict[int, Any]:
+        """IFD에서 wanted에 포함된 태그만 디코드합니다."""
+        block = self.block
+        endian = self.endian
+        count = struct.unpack_from(endian + 'H', block, offset)[0]
+        values = {}
+        for index in range(count):
+            entry = offset + 2 + index * 12
+            tag, field_type, value_count = struct.unpack_from(endian + 'HHL', block, entry)
+            if tag not in wanted or field_type not in _TYPE_FORMATS:
+                continue
+            values[tag] = self._read_value(field_type, value_count, entry + 8)
+        return values
+
+    def _read_value(self, field_type: int, value_count: int, value_offset: int) -> Any:
+        fmt, size = _TYPE_FORMATS[field_type]
+        total = size * value_count
+        if total > 4:
+            value_offset = struct.unpack_from(self.endian + 'L', self.block, value_offset)[0]
+        if value_offset + total > len(self.block):
+            raise ExifFormatError("value out of range")
+
+        if field_type == 2:
+            raw = bytes(self.block[value_offset:value_offset + value_count])
+            return raw.split(b'\x00', 1)[0].decode('latin-1', 'replace').strip()
+        if field_type == 7:
+            return bytes(self.block[value_offset:value_offset + value_count])
+
+        items = struct.unpack_from(self.endian + fmt * value_count, self.block, value_offset)
+        if field_type in (5, 10):
+            items = tuple(
+                numerator / denominator if denominator else float('nan')
+                for numerator, denominator in zip(items[::2], items[1::2])
+            )
+        return items[0] if value_count == 1 else items
+
+
+def read_exif_fields(data: Union[bytes, memoryview]) -> Optional[Dict[str, Any]]:
+    """
+    위치/카메라 정보에 필요한 EXIF 태그만 읽습니다.
+
+    반환 형식은 EXIFProcessor.extract_exif_data와 같습니다 (태그 이름 키, GPSInfo는 숫자 키 딕셔너리).
+    EXIF가 없으면 빈 딕셔너리, 지원하지 않는 형식이나 해석할 수 없는 구조면 None을 반환합니다.
+    """
+    try:
+        block = find_tiff_block(data)
+    except (struct.error, ExifFormatError, IndexError):
+        return None
+    if block is None:
+        return None
+    if len(block) == 0:
+        return {}
+    return read_tiff_fields(block)
+
+
+def read_tiff_fields(block: Union[bytes, memoryview]) -> Optional[Dict[str, Any]]:
+    """컨테이너에서 꺼낸 TIFF 블록(EXIF 청크 본문)에서 태그를 읽습니다 (해석할 수 없으면 None)."""
+    try:
+        block = _strip_exif_header(memoryview(block))
+        reader = _TiffReader(block)
+        ifd0 = reader.read_ifd(reader.first_ifd, set(IFD0_TAGS) | {EXIF_IFD_POINTER, GPS_IFD_POINTER})
+
+        exif_data = {IFD0_TAGS[tag]: value for tag, value in ifd0.items() if tag in IFD0_TAGS}
+
+        if EXIF_IFD_POINTER in ifd0:
+            sub_ifd = reader.read_ifd(ifd0[EXIF_IFD_POINTER], EXIF_TAGS)
+            exif_data.update({EXIF_TAGS[tag]: value for tag, value in sub_ifd.items()})
+
+        if GPS_IFD_POINTER in ifd0:
+            exif_data['GPSInfo'] = reader.read_ifd(ifd0[GPS_IFD_POINTER], GPS_TAGS)
+
+        return exif_data
+
+    except (struct.error, ExifFormatError, IndexError):
+        return None
+
+
+async def read_trailing_exif_fields(head: bytes, total_size: int,
+                                    read_range: RangeReader) -> Optional[Dict[str, Any]]:
+    """
+    파일 앞부분(head)에 없던 EXIF를 이미지 데이터 뒤에서 찾아 읽습니다.
+
+    WebP는 EXIF 청크가 이미지 데이터(VP8/VP8L) 뒤에, PNG는 eXIf 청크가 IDAT 뒤에 올 수 있어
+    앞부분만으로는 GPS를 놓칩니다. JPEG는 APP1이 항상 앞에 있으므로 대상이 아닙니다.
+    찾지 못했거나 제한(TRAILING_*)을 넘으면 None을 반환합니다.
+    """
+    if len(head) >= total_size:
+        return None
+    if head[:4] == b'RIFF' and head[8:12] == b'WEBP':
+        block = await _read_trailing_webp_exif(head, total_size, read_range)
+    elif head[:8] == _PNG_SIGNATURE:
+        block = await _read_trailing_png_exif(head, total_size, read_range)
+    else:
+        return None
+    return read_tiff_fields(block) if block else None
+
+
+async def _read_trailing_webp_exif(head: bytes, total_size: int, read_range: RangeReader) -> Optional[bytes]:
+    # EXIF는 확장 형식(VP8X)에서만 가능하며, VP8X 플래그로 EXIF 유무를 미리 알 수 있음
+    if head[12:16] != b'VP8X' or len(head) < 21 or not head[20] & _WEBP_VP8X_EXIF_FLAG:
+        return None
+
+    end = min(total_size, struct.unpack_from('<L', head, 4)[0] + 8)
+    offset = 12
+    for _ in range(TRAILING_WEBP_MAX_CHUNKS):
+        if offset + 8 > end:
+            break
+        header = head[offset:offset + 8] if offset + 8 <= len(head) else await read_range(offset, offset + 8)
+        fourcc, chunk_length = struct.unpack('<4sL', header)
+        data_start = offset + 8
+        if fourcc == b'EXIF':
+            if chunk_length > TRAILING_EXIF_MAX_BYTES or data_start + chunk_length > end:
+                return None
+            if data_start + chunk_length <= len(head):
+                return head[data_start:data_start + chunk_length]
+            return await read_range(data_start, data_start + chunk_length)
+        offset = data_start + chunk_length + (chunk_length & 1)
+    return None
+
+
+async def _read_trailing_png_exif(head: bytes, total_size: int, read_range: RangeReader) -> Optional[bytes]:
+    start = max(len(head), total_size - TRAILING_PNG_TAIL_BYTES)
+    tail = await read_range(start, total_size)
+
+    # 압축 데이터 안에 우연히 b'eXIf'가 있을 수 있으므로 길이와 CRC가 맞는 청크만 인정
+    position = tail.rfind(b'eXIf')
+    while position >= 4:
+        chunk_length = struct.unpack_from('>L', tail, position - 4)[0]
+        data_end = position + 4 + chunk_length
+        if chunk_length <= TRAILING_EXIF_MAX_BYTES and data_end + 4 <= len(tail):
+            data = tail[position + 4:data_end]
+            if zlib.crc32(b'eXIf' + data) == struct.unpack_from('>L', tail, data_end)[0]:
+                return data
+        position = tail.rfind(b'eXIf', 0, position)
+    return None
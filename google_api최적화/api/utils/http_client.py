@@ -0,0 +1,99 @@
+"""
+공유 비동기 HTTP 클라이언트 - 카카오/구글 API 호출용 keep-alive 커넥션 풀
+"""
+import asyncio
+import logging
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+import httpx
+
+from config import settings
+from utils.metrics import http_upstream, record_upstream_status, upstream_call
+from utils.tracing import span
+
+logger = logging.getLogger(__name__)
+
+
+def _http2_available() -> bool:
+    """h2 패키지가 설치되어 있을 때만 HTTP/2 사용"""
+    try:
+        import h2  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+class AsyncHTTPClient:
+    """
+    프로세스 전체에서 공유하는 httpx.AsyncClient 래퍼
+    호스트별 동시 연결 수를 제한해 한 업스트림이 풀 전체를 점유하지 않도록 합니다.
+    """
+
+    def __init__(
+        self,
+        timeout: float = settings.HTTP_TIMEOUT,
+        connect_timeout: float = settings.HTTP_CONNECT_TIMEOUT,
+        max_connections: int = settings.HTTP_MAX_CONNECTIONS,
+        max_keepalive_connections: int = settings.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+        max_connections_per_host: int = settings.HTTP_MAX_CONNECTIONS_PER_HOST,
+        http2: bool = settings.HTTP2_ENABLED,
+    ):
+        self.timeout = httpx.Timeout(timeout, connect=connect_timeout)
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+        )
+        self.max_connections_per_host = max_connections_per_host
+        self.http2 = http2 and _http2_available()
+        self._client: Optional[httpx.AsyncClient] = None
+        self._host_limits: Dict[str, asyncio.Semaphore] = {}
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """첫 요청 시점에 클라이언트를 생성합니다 (이벤트 루프 안에서 생성되도록)."""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout,
+                limits=self.limits,
+                http2=self.http2,
+            )
+            logger.info(f"HTTP 클라이언트 생성 (http2={self.http2})")
+        return self._client
+
+    def _host_semaphore(self, url: str) -> asyncio.Semaphore:
+        host = urlsplit(url).netloc
+        semaphore = self._host_limits.get(host)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.max_connections_per_host)
+            self._host_limits[host] = semaphore
+        return semaphore
+
+    async def request(self, method: str, url: str, **kwargs) -> httpx.Response:
+        parts = urlsplit(url)
+        service, operation = http_upstream(url, method)
+        with span("http", method=method, host=parts.netloc, path=parts.path) as record:
+            async with self._host_semaphore(url):
+                with upstream_call(service, operation):
+                    response = await self.client.request(method, url, **kwargs)
+            record_upstream_status(service, operation, response.status_code)
+            if record is not None:
+                record.set(status_code=response.status_code)
+            return response
+
+    async def get(self, url: str, **kwargs) -> httpx.Response:
+        return await self.request("GET", url, **kwargs)
+
+    async def post(self, url: str, **kwargs) -> httpx.Response:
+        return await self.request("POST", url, **kwargs)
+
+    async def aclose(self) -> None:
+        """커넥션 풀 정리 (애플리케이션 종료 시 호출)"""
+        if self._client is not None and not self._client.is_closed:
+            await self._client.aclose()
+        self._client = None
+        self._host_limits.clear()
+
+
+# 공유 HTTP 클라이언트 인스턴스
+http_client = AsyncHTTPClient()
@@ -0,0 +1,236 @@
+"""
+요청 단위 이미지 컨텍스트 - 검증, EXIF 추출, 저장이 같은 파싱 결과를 공유합니다.
+"""
+import hashlib
+import io
+import logging
+import mmap
+import struct
+from typing import Any, Dict, Optional, Tuple, Union
+
+from PIL import Image
+from PIL.ExifTags import TAGS
+
+from config import settings
+from utils.exif_reader import read_exif_fields
+
+logger = logging.getLogger(__name__)
+
+FORMAT_CONTENT_TYPES = {
+    'JPEG': 'image/jpeg',
+    'PNG': 'image/png',
+    'WEBP': 'image/webp',
+}
+
+
+class ImageContext:
+    """
+    업로드 한 건당 한 번 생성되는 이미지 컨텍스트
+
+    PIL의 Image.open은 헤더만 읽으므로 처음 접근할 때 한 번 열고,
+    포맷/크기/EXIF를 캐시합니다. Image.verify()는 이미지 객체를 무효화하므로
+    verify() 전에 필요한 헤더 정보를 모두 읽어 둡니다.
+
+    큰 업로드는 bytes 대신 임시 파일의 읽기 전용 mmap을 받아 메모리에 복사하지 않습니다.
+    헤더/EXIF/저장 단계는 buffer를 그대로 사용하고, data는 bytes가 필요한 호출부를 위해
+    처음 접근할 때 한 번만 복사합니다.
+
+    header_only=True는 파일 앞부분만 받은 경우(S3 직접 업로드 finalize)입니다.
+    PIL의 WebP 플러그인은 열 때 전체 데이터를 디코드하므로, 실패하면 WebP 헤더에서 포맷/크기만 읽습니다.
+    """
+
+    def __init__(self, data: Union[bytes, mmap.mmap], declared_content_type: Optional[str] = None,
+                 header_only: bool = False):
+        self._buffer = data
+        self.header_only = header_only
+        self._bytes: Optional[bytes] = data if isinstance(data, bytes) else None
+        self.declared_content_type = declared_content_type
+        self._image: Optional[Image.Image] = None
+        self._opened = False
+        self._open_error: Optional[Exception] = None
+        self._format: Optional[str] = None
+        self._dimensions: Optional[Tuple[int, int]] = None
+        self._exif: Optional[Dict[str, Any]] = None
+        self._verified = False
+        self._sha256: Optional[str] = None
+
+    @classmethod
+    def ensure(cls, image: Union["ImageContext", bytes]) -> "ImageContext":
+        """bytes를 받는 기존 호출부와의 호환을 위해 필요할 때만 컨텍스트를 생성합니다."""
+        return image if isinstance(image, cls) else cls(image)
+
+    def _open(self) -> Optional[Image.Image]:
+        if not self._opened:
+            self._opened = True
+            try:
+                self._image = Image.open(self._stream())
+                self._format = self._image.format
+                self._dimensions = self._image.size
+            except Exception as e:
+                dimensions = webp_header_dimensions(self._buffer) if self.header_only else None
+                if dimensions is None:
+                    self._open_error = e
+                else:
+                    self._format = 'WEBP'
+                    self._dimensions = dimensions
+        if self._open_error is not None:
+            raise self._open_error
+        return self._image
+
+    def _stream(self):
+        if isinstance(self._buffer, mmap.mmap):
+            self._buffer.seek(0)
+            return self._buffer
+        return io.BytesIO(self._buffer)
+
+    @property
+    def buffer(self) -> Union[bytes, mmap.mmap]:
+        """복사 없이 읽을 수 있는 원본 버퍼 (bytes 또는 mmap)"""
+        return self._buffer
+
+    @property
+    def data(self) -> bytes:
+        """이미지 전체 bytes (mmap인 경우 처음 접근할 때 복사)"""
+        if self._bytes is None:
+            self._bytes = bytes(self._buffer)
+        return self._bytes
+
+    @property
+    def size_bytes(self) -> int:
+        return len(self._buffer)
+
+    def close(self) -> None:
+        """
+        mmap 버퍼를 닫습니다 (bytes 버퍼면 아무 일도 하지 않으며, 여러 번 호출해도 됩니다).
+        요청/사진 처리가 끝난 뒤 호출하며, 이후에는 이미 복사해 둔 data와 캐시된 헤더 정보만 사용할 수 있습니다.
+        """
+        self._image = None
+        if isinstance(self._buffer, mmap.mmap) and not self._buffer.closed:
+            try:
+                self._buffer.close()
+            except BufferError as e:
+                # 아직 참조 중인 memoryview가 있으면 닫을 수 없음 (참조가 사라질 때 GC가 해제)
+                logger.warning(f"이미지 버퍼 닫기 실패: {e}")
+
+    @property
+    def sha256(self) -> str:
+        """내용 해시 (hex, 저장 키/분석 결과 캐시 키로 사용, 한 번만 계산)"""
+        if self._sha256 is None:
+            self._sha256 = hashlib.sha256(self._buffer).hexdigest()
+        return self._sha256
+
+    @property
+    def format(self) -> Optional[str]:
+        self._open()
+        return self._format
+
+    @property
+    def dimensions(self) -> Tuple[int, int]:
+        """(너비, 높이) 픽셀"""
+        self._open()
+        return self._dimensions
+
+    @property
+    def content_type(self) -> Optional[str]:
+        """실제 파일 포맷 기준 Content-Type (판별 불가 시 클라이언트가 보낸 값)"""
+        try:
+            return FORMAT_CONTENT_TYPES.get(self.format, self.declared_content_type)
+        except Exception:
+            return self.declared_content_type
+
+    @property
+    def exif(self) -> Dict[str, Any]:
+        """태그 이름을 키로 하는 EXIF 딕셔너리 (EXIF가 없거나 읽을 수 없으면 빈 딕셔너리)"""
+        if self._exif is None:
+            if settings.EXIF_FAST_PATH:
+                # 컨테이너 헤더에서 필요한 태그만 읽음 (픽셀 디코드 없음)
+                exif_data = read_exif_fields(self._buffer)
+                if exif_data is not None:
+                    self._exif = exif_data
+                    return self._exif
+
+            exif_data = {}
+            try:
+                image = self._open()
+                if hasattr(image, '_getexif'):
+                    exif = image._getexif()
+                    if exif is not None:
+                        for tag_id, value in exif.items():
+                            exif_data[TAGS.get(tag_id, tag_id)] = value
+            except Exception as e:
+                logger.error(f"EXIF 데이터 추출 실패: {e}")
+            self._exif = exif_data
+        return self._exif
+
+    @property
+    def exif_loaded(self) -> bool:
+        return self._exif is not None
+
+    def apply_inspection(self, summary: Dict[str, Any]) -> None:
+        """워커(스레드/프로세스)에서 inspect_image로 얻은 결과를 이 컨텍스트에 반영합니다."""
+        if 'exif' in summary:
+            self._exif = summary['exif']
+        if summary.get('dimensions') is not None:
+            self._opened = True
+            self._image = None
+            self._format = summary['format']
+            self._dimensions = tuple(summary['dimensions'])
+            self._verified = True
+
+    @property
+    def gps(self) -> Optional[Tuple[float, float]]:
+        """EXIF GPS 좌표 (위도, 경도)"""
+        from utils.exif_processor import EXIFProcessor
+        return EXIFProcessor.extract_gps_from_exif(self.exif)
+
+    def verify(self) -> None:
+        """
+        이미지 무결성 검사 (한 번만 실행)
+        """
+        if self._verified:
+            return
+        image = self._open()
+        self.exif  # verify()가 이미지 객체를 무효화하기 전에 EXIF를 읽어 둠
+
+        # PNG처럼 EXIF를 읽느라 픽셀까지 디코드한 경우 디코드 성공 자체가 무결성 검사이므로
+        # (verify는 open 직후에만 가능) 디코드하지 않은 경우에만 verify를 실행합니다.
+        if getattr(image, 'im', None) is None:
+            image.verify()
+        self._verified = True
+        self._image = None
+
+
+def webp_header_dimensions(head: Union[bytes, mmap.mmap]) -> Optional[Tuple[int, int]]:
+    """WebP 첫 청크(VP8X/VP8/VP8L) 헤더의 캔버스 크기 (WebP가 아니거나 해석할 수 없으면 None)"""
+    if head[:4] != b'RIFF' or head[8:12] != b'WEBP' or len(head) < 30:
+        return None
+    fourcc = head[12:16]
+    if fourcc == b'VP8X':
+        width = int.from_bytes(head[24:27], 'little') + 1
+        height = int.from_bytes(head[27:30], 'little') + 1
+        return width, height
+    if fourcc == b'VP8 ' and head[23:26] == b'\x9d\x01\x2a':
+        width, height = struct.unpack_from('<HH', head, 26)
+        return width & 0x3FFF, height & 0x3FFF
+    if fourcc == b'VP8L' and head[20] == 0x2F:
+        bits = int.from_bytes(head[21:25], 'little')
+        return (bits & 0x3FFF) + 1, ((bits >> 14) & 0x3FFF) + 1
+    return None
+
+
+def inspect_image(buffer: Union[bytes, mmap.mmap]) -> Dict[str, Any]:
+    """
+    이미지 작업 실행기에서 실행하는 검증 + 헤더 요약 (ImageContext.apply_inspection으로 반영)
+    프로세스 경계를 넘을 수 있도록 예외를 던지지 않고 pickle 가능한 dict만 반환합니다.
+    """
+    image = ImageContext(buffer)
+    try:
+        image.verify()
+        return {
+            'format': image.format,
+            'dimensions': image.dimensions,
+            'exif': image.exif,
+            'error': None,
+        }
+    except Exception as e:
+        return {'error': str(e)}
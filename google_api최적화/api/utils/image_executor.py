@@ -0,0 +1,193 @@
+"""
+이미지 작업 실행기 - 디코드/검증/EXIF 같은 CPU 작업을 이벤트 루프 밖에서 실행합니다.
+
+- IMAGE_EXECUTOR: "thread" (기본), "process", "inline" (이벤트 루프에서 직접 실행)
+- 실행 중 + 대기 중인 작업이 워커 수 + IMAGE_EXECUTOR_MAX_QUEUE 를 넘으면
+  503 + Retry-After 로 즉시 거절 (대기열이 끝없이 늘어나지 않도록)
+- 단계(stage)별 대기 시간과 실행 시간을 /health 에 노출
+
+프로세스 풀에서는 인자와 반환값이 pickle 되므로 작업 함수는 bytes를 받아
+평범한 dict/tuple만 반환해야 합니다. HTTPException 같은 응답 예외는 pickle 할 수
+없으므로 워커에서 던지지 않고, 호출한 쪽에서 결과를 보고 변환합니다.
+"""
+import asyncio
+import logging
+import multiprocessing
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, TypeVar
+
+from config import settings
+from utils.responses import APIException
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+def _timed_call(func: Callable[..., T], args: tuple) -> tuple:
+    """워커에서 실행: (결과, 시작 시각, 실행 시간 ms)"""
+    started_at = time.time()
+    start = time.perf_counter()
+    result = func(*args)
+    return result, started_at, (time.perf_counter() - start) * 1000
+
+
+def _warm_up_worker() -> None:
+    import utils.image_context  # noqa: F401  (PIL 플러그인/설정 임포트)
+
+
+class StageStats:
+    """단계별 처리 통계"""
+
+    def __init__(self):
+        self.completed = 0
+        self.errors = 0
+        self.rejected = 0
+        self.queue_wait_ms_total = 0.0
+        self.queue_wait_ms_max = 0.0
+        self.exec_ms_total = 0.0
+        self.exec_ms_max = 0.0
+
+    def record(self, queue_wait_ms: float, exec_ms: float) -> None:
+        self.completed += 1
+        self.queue_wait_ms_total += queue_wait_ms
+        self.queue_wait_ms_max = max(self.queue_wait_ms_max, queue_wait_ms)
+        self.exec_ms_total += exec_ms
+        self.exec_ms_max = max(self.exec_ms_max, exec_ms)
+
+    def snapshot(self) -> Dict[str, Any]:
+        completed = self.completed or 1
+        return {
+            "completed": self.completed,
+            "errors": self.errors,
+            "rejected": self.rejected,
+            "queue_wait_ms_avg": round(self.queue_wait_ms_total / completed, 3),
+            "queue_wait_ms_max": round(self.queue_wait_ms_max, 3),
+            "exec_ms_avg": round(self.exec_ms_total / completed, 3),
+            "exec_ms_max": round(self.exec_ms_max, 3),
+        }
+
+
+class ImageWorkExecutor:
+    """
+    설정에 따라 스레드/프로세스 풀을 지연 생성하고, 대기열 한도를 넘으면 503으로 거절합니다.
+    """
+
+    def __init__(self, kind: str, max_workers: int, max_queue: int, retry_after: int):
+        if kind not in ("thread", "process", "inline"):
+            raise ValueError(f"Unknown IMAGE_EXECUTOR: {kind}")
+        self.kind = kind
+        self.max_workers = max(1, max_workers)
+        self.max_queue = max(0, max_queue)
+        self.retry_after = retry_after
+        self._executor: Optional[Executor] = None
+        self._pending = 0
+        self.stages: Dict[str, StageStats] = {}
+
+    @property
+    def is_process_pool(self) -> bool:
+        return self.kind == "process"
+
+    @property
+    def capacity(self) -> int:
+        return self.max_workers + self.max_queue
+
+    @property
+    def executor(self) -> Optional[Executor]:
+        if self._executor is None and self.kind != "inline":
+            if self.kind == "process":
+                # 이벤트 루프/스레드가 떠 있는 프로세스를 fork 하지 않도록 spawn 사용
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix="image-work",
+                )
+            logger.info(f"이미지 작업 실행기 생성: {self.kind} x {self.max_workers} (대기열 {self.max_queue})")
+        return self._executor
+
+    def payload(self, image) -> Any:
+        """워커에 넘길 이미지 버퍼 (프로세스 풀은 pickle 가능한 bytes, 그 외에는 복사 없는 버퍼)"""
+        return image.data if self.is_process_pool else image.buffer
+
+    async def run(self, stage: str, func: Callable[..., T], *args) -> T:
+        stats = self.stages.setdefault(stage, StageStats())
+
+        if self._pending >= self.capacity:
+            stats.rejected += 1
+            raise APIException(
+                status_code=503,
+                error="IMAGE_WORKERS_BUSY",
+                message="이미지 처리 대기열이 가득 찼습니다. 잠시 후 다시 시도해 주세요.",
+                headers={"Retry-After": str(self.retry_after)},
+            )
+
+        submitted_at = time.time()
+        try:
+            if self.kind == "inline":
+                result, started_at, exec_ms = _timed_call(func, args)
+            else:
+                result, started_at, exec_ms = await self._submit(func, args)
+        except Exception:
+            stats.errors += 1
+            raise
+
+        stats.record(max(0.0, (started_at - submitted_at) * 1000), exec_ms)
+        return result
+
+    async def _submit(self, func: Callable[..., T], args: tuple) -> tuple:
+        loop = asyncio.get_running_loop()
+        future = self.executor.submit(_timed_call, func, args)
+        self._pending += 1
+
+        # 요청이 취소되어도 워커에서 실제로 끝날 때까지 자리를 차지하도록 완료 시점에 반환
+        def release(_):
+            try:
+                loop.call_soon_threadsafe(self._release)
+            except RuntimeError:  # 종료 중 이벤트 루프가 이미 닫힌 경우
+                pass
+
+        future.add_done_callback(release)
+        return await asyncio.wrap_future(future)
+
+    def _release(self) -> None:
+        self._pending -= 1
+
+    async def warm_up(self) -> None:
+        """프로세스 풀 워커를 미리 띄워 첫 요청이 프로세스 생성/임포트 시간을 기다리지 않도록 합니다."""
+        if not self.is_process_pool:
+            return
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*(
+            loop.run_in_executor(self.executor, _warm_up_worker) for _ in range(self.max_workers)
+        ))
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "kind": self.kind,
+            "workers": self.max_workers,
+            "max_queue": self.max_queue,
+            "pending": self._pending,
+            "stages": {name: stats.snapshot() for name, stats in self.stages.items()},
+        }
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)  # 대기 중인 작업은 취소, 실행 중인 작업만 마무리
+            self._executor = None
+
+
+image_executor = ImageWorkExecutor(
+    kind=settings.IMAGE_EXECUTOR,
+    max_workers=settings.IMAGE_EXECUTOR_WORKERS,
+    max_queue=settings.IMAGE_EXECUTOR_MAX_QUEUE,
+    retry_after=settings.IMAGE_EXECUTOR_RETRY_AFTER,
+)
+
+
+def image_executor_stats() -> Dict[str, Any]:
+    return image_executor.snapshot()
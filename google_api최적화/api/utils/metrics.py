@@ -0,0 +1,243 @@
+"""
+Prometheus 메트릭 - /metrics 로 노출합니다.
+
+- MetricsMiddleware: 라우트(경로 템플릿)별 요청 수/지연 시간, 업로드 본문 크기
+- upstream_call("s3", "put_object"): 업스트림(카카오/구글 지도/구글 비전/Textract/S3/SQS) 호출 지연 시간과 오류 수
+- 캐시 적중률, single-flight 합치기 비율, 로컬 분석 큐 깊이는 수집(scrape) 시점에 기존 통계(snapshot)에서 읽음
+  (요청 경로에서는 카운터를 따로 올리지 않음)
+- EventLoopLagMonitor: METRICS_LOOP_LAG_INTERVAL마다 sleep이 늦게 깨어난 시간 = 이벤트 루프 지연
+
+메트릭은 전용 레지스트리(registry)에 등록되며, 분석 워커는 WORKER_METRICS_PORT로 같은 레지스트리를 노출합니다.
+"""
+import asyncio
+import logging
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, Optional, Tuple
+from urllib.parse import urlsplit
+
+from prometheus_client import CONTENT_TYPE_LATEST, CollectorRegistry, Counter, Gauge, Histogram, generate_latest
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+from starlette.routing import Match
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+registry = CollectorRegistry(auto_describe=True)
+
+# 요청 지연 시간 (업로드/분석 요청은 수백 ms~수 초)
+_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+# 업로드 본문 크기 (100KB ~ 200MB, 앨범 일괄 업로드 포함)
+_SIZE_BUCKETS = tuple(float(kb * 1024) for kb in (100, 500, 1024, 2048, 5120, 10240, 20480, 51200, 102400, 204800))
+# 이벤트 루프 지연 (수 ms를 넘으면 블로킹 호출 의심)
+_LAG_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+
+http_requests = Counter(
+    "http_requests_total", "HTTP 요청 수", ["method", "route", "status"], registry=registry
+)
+http_request_duration = Histogram(
+    "http_request_duration_seconds", "HTTP 요청 처리 시간 (응답 본문 전송 완료까지)", ["method", "route"],
+    buckets=_LATENCY_BUCKETS, registry=registry
+)
+http_request_size = Histogram(
+    "http_request_size_bytes", "요청 본문 크기 (POST/PUT 업로드)", ["route"],
+    buckets=_SIZE_BUCKETS, registry=registry
+)
+http_requests_in_progress = Gauge(
+    "http_requests_in_progress", "처리 중인 HTTP 요청 수", registry=registry
+)
+upstream_duration = Histogram(
+    "upstream_request_duration_seconds", "업스트림 호출 시간", ["service", "operation"],
+    buckets=_LATENCY_BUCKETS, registry=registry
+)
+upstream_errors = Counter(
+    "upstream_errors_total", "업스트림 호출 오류 (예외 또는 4xx/5xx 응답)", ["service", "operation", "error"],
+    registry=registry
+)
+event_loop_lag = Histogram(
+    "event_loop_lag_seconds", "이벤트 루프 지연 (예정 시각보다 늦게 깨어난 시간)",
+    buckets=_LAG_BUCKETS, registry=registry
+)
+event_loop_lag_max = Gauge(
+    "event_loop_lag_max_seconds", "직전 측정 구간의 이벤트 루프 지연", registry=registry
+)
+
+# HTTP 업스트림은 호스트로 서비스를 구분 (그 외 호스트는 "http", 경로 대신 메서드로 집계)
+UPSTREAM_HOSTS = {
+    "dapi.kakao.com": "kakao",
+    "maps.googleapis.com": "google_maps",
+    "vision.googleapis.com": "google_vision",
+}
+
+
+def http_upstream(url: str, method: str) -> Tuple[str, str]:
+    parts = urlsplit(url)
+    service = UPSTREAM_HOSTS.get(parts.hostname or "")
+    if service is None:
+        return "http", method
+    return service, parts.path
+
+
+@contextmanager
+def upstream_call(service: str, operation: str) -> Iterator[None]:
+    """업스트림 호출 하나의 시간과 예외를 기록"""
+    start = time.perf_counter()
+    try:
+        yield
+    except Exception as e:
+        upstream_errors.labels(service, operation, type(e).__name__).inc()
+        raise
+    finally:
+        upstream_duration.labels(service, operation).observe(time.perf_counter() - start)
+
+
+def record_upstream_status(service: str, operation: str, status_code: int) -> None:
+    if status_code >= 400:
+        upstream_errors.labels(service, operation, f"http_{status_code}").inc()
+
+
+class _StatsCollector:
+    """수집 시점에 캐시/single-flight/분석 큐 통계를 읽어 메트릭으로 변환"""
+
+    def collect(self):
+        from services.local_queue_service import analysis_queue_stats
+        from utils.cache import cache_stats
+        from utils.singleflight import singleflight_stats
+
+        caches = cache_stats()
+        hits = CounterMetricFamily("cache_hits", "캐시 적중 수 (결과 없음 캐시 적중 포함)", labels=["cache"])
+        misses = CounterMetricFamily("cache_misses", "캐시 미스 수", labels=["cache"])
+        ratio = GaugeMetricFamily("cache_hit_ratio", "캐시 적중률", labels=["cache"])
+        size = GaugeMetricFamily("cache_entries", "캐시 항목 수", labels=["cache"])
+        for name, stats in caches.items():
+            hits.add_metric([name], stats["hits"])
+            misses.add_metric([name], stats["misses"])
+            ratio.add_metric([name], stats["hit_ratio"])
+            size.add_metric([name], stats["size"])
+        yield from (hits, misses, ratio, size)
+
+        coalesced = CounterMetricFamily("singleflight_coalesced", "진행 중인 같은 호출에 합쳐진 호출 수", labels=["group"])
+        for name, stats in singleflight_stats().items():
+            coalesced.add_metric([name], stats["coalesced"])
+        yield coalesced
+
+        queue = analysis_queue_stats()
+        if queue["backend"] == "local":
+            yield GaugeMetricFamily("analysis_queue_depth", "로컬 분석 큐 대기 작업 수", value=queue["depth"])
+            yield GaugeMetricFamily("analysis_queue_running", "로컬 분석 큐 실행 중 작업 수", value=queue["running"])
+
+    def describe(self):
+        # 수집 시점에 만들어지는 메트릭이므로 등록 시 collect()를 호출하지 않도록 함
+        return []
+
+
+registry.register(_StatsCollector())
+
+
+class MetricsMiddleware:
+    """
+    라우트별 요청 수/처리 시간과 업로드 본문 크기를 기록합니다 (ASGI 미들웨어).
+    라벨은 실제 경로가 아닌 경로 템플릿(/api/v1/analysis-status/{request_id})이며, 일치하는 라우트가 없으면 "unmatched".
+    라우팅 전에 끝난 요청(UploadSizeLimitMiddleware의 413 등)은 경로를 라우트 목록과 대조해 라벨을 정합니다.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self._routes: Dict[Callable, str] = {}
+
+    def _route(self, scope) -> str:
+        endpoint = scope.get("endpoint")
+        if endpoint is None:
+            return self._match_path(scope)
+        route = self._routes.get(endpoint)
+        if route is None:
+            # Starlette가 scope에 endpoint만 남기므로 앱의 라우트 목록에서 경로 템플릿을 찾아 캐시 (Mount는 app)
+            route = next(
+                (r.path for r in scope["app"].routes if getattr(r, "endpoint", getattr(r, "app", None)) is endpoint),
+                "unmatched"
+            )
+            self._routes[endpoint] = route
+        return route
+
+    @staticmethod
+    def _match_path(scope) -> str:
+        # 실제 경로는 종류가 무한하므로 캐시하지 않음 (라우팅되지 않은 요청에서만 호출)
+        app = scope.get("app")
+        if app is None:
+            return "unmatched"
+        for route in app.routes:
+            match, _ = route.matches(scope)
+            if match != Match.NONE:
+                return route.path
+        return "unmatched"
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        start = time.perf_counter()
+        status = 500
+        received = 0
+
+        async def receive_counted():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+            return message
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        counts_body = method in ("POST", "PUT")
+        http_requests_in_progress.inc()
+        try:
+            await self.app(scope, receive_counted if counts_body else receive, send_with_status)
+        finally:
+            http_requests_in_progress.dec()
+            route = self._route(scope)
+            http_requests.labels(method, route, str(status)).inc()
+            http_request_duration.labels(method, route).observe(time.perf_counter() - start)
+            if counts_body and received:
+                http_request_size.labels(route).observe(received)
+
+
+class EventLoopLagMonitor:
+    """interval마다 sleep이 예정보다 늦게 깨어난 시간을 기록 (블로킹 호출이 루프를 막은 시간)"""
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        if self._task is None and self.interval > 0:
+            self._task = asyncio.ensure_future(self._run())
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, loop.time() - expected)
+            event_loop_lag.observe(lag)
+            event_loop_lag_max.set(lag)
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+
+loop_lag_monitor = EventLoopLagMonitor(settings.METRICS_LOOP_LAG_INTERVAL)
+
+
+def render_metrics() -> Tuple[bytes, str]:
+    """Prometheus 텍스트 형식 (본문, Content-Type)"""
+    return generate_latest(registry), CONTENT_TYPE_LATEST
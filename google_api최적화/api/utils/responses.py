@@ -5,7 +5,7 @@ import logging
 
 logger = logging.getLogger(__name__)
 
-def create_error_response(status_code: int, error: str, message: str, request_id: str = None) -> JSONResponse:
+def create_error_response(status_code: int, error: str, message: str, request_id: str = None, headers: dict = None) -> JSONResponse:
     """
     표준화된 에러 응답을 생성합니다.
     """
@@ -19,7 +19,8 @@ def create_error_response(status_code: int, error: str, message: str, request_id
     
     return JSONResponse(
         status_code=status_code,
-        content=error_response.dict()
+        content=error_response.dict(),
+        headers=headers
     )
 
 def create_success_response(data: dict, status_code: int = 200) -> JSONResponse:
@@ -35,9 +36,9 @@ class APIException(HTTPException):
     """
     커스텀 API 예외 클래스
     """
-    def __init__(self, status_code: int, error: str, message: str, request_id: str = None):
+    def __init__(self, status_code: int, error: str, message: str, request_id: str = None, headers: dict = None):
         self.status_code = status_code
         self.error = error
         self.message = message
         self.request_id = request_id
-        super().__init__(status_code=status_code, detail=message)
+        super().__init__(status_code=status_code, detail=message, headers=headers)
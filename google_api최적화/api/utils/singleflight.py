@@ -0,0 +1,68 @@
+"""
+Single-flight - 같은 키로 동시에 들어온 호출을 하나의 업스트림 호출로 합칩니다.
+"""
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, List, TypeVar
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """
+    진행 중인 호출이 있으면 새 호출은 같은 결과(또는 예외)를 기다립니다.
+    호출이 끝나면 키를 비우므로 결과를 저장하지는 않습니다 (캐시와 함께 사용).
+    결과 객체는 대기자 모두에게 같은 인스턴스로 전달되므로 호출자가 수정하지 않는 값(dict 등 복사본)을 반환하세요.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self.calls = 0
+        self.coalesced = 0
+        self.errors = 0
+        singleflight_registry.append(self)
+
+    async def do(self, key: str, func: Callable[[], Awaitable[T]]) -> T:
+        if not settings.SINGLEFLIGHT_ENABLED:
+            return await func()
+
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(func())
+            self._inflight[key] = task
+            self.calls += 1
+            task.add_done_callback(lambda done, key=key: self._finish(key, done))
+        else:
+            self.coalesced += 1
+
+        # 대기 중인 호출 하나가 취소되어도 공유 작업은 계속 진행되도록 shield
+        return await asyncio.shield(task)
+
+    def _finish(self, key: str, task: asyncio.Task) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled() and task.exception() is not None:
+            self.errors += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        total = self.calls + self.coalesced
+        return {
+            "calls": self.calls,
+            "coalesced": self.coalesced,
+            "coalesced_ratio": round(self.coalesced / total, 4) if total else 0.0,
+            "errors": self.errors,
+            "inflight": len(self._inflight),
+        }
+
+
+# /health 등에서 전체 single-flight 통계를 조회하기 위한 등록부
+singleflight_registry: List[SingleFlight] = []
+
+
+def singleflight_stats() -> Dict[str, Dict[str, Any]]:
+    return {group.name: group.snapshot() for group in singleflight_registry}
@@ -0,0 +1,270 @@
+"""
+요청 단위 추적 - 요청 하나가 검증/EXIF/장소 조회/OCR/저장/큐 전송에 쓴 시간을 구간(span)별로 기록합니다.
+
+- TracingMiddleware가 HTTP 요청마다 Trace를 만들어 contextvar로 전달하고,
+  응답에 Server-Timing 헤더(구간 이름별 합계 ms)를 붙입니다
+- span("exif") / @traced("geocode")로 감싼 구간이 현재 Trace에 기록됩니다 (Trace 밖에서는 아무것도 하지 않음)
+- 분석 워커/로컬 큐 작업은 start_trace()로 작업마다 Trace를 만듭니다
+- TRACING_EXPORTER
+  - memory: 끝난 Trace를 최근 TRACING_MEMORY_MAX_TRACES개까지 메모리에 보관 (/api/v1/debug/traces)
+  - otel  : opentelemetry-api가 설치되어 있으면 같은 이름/속성의 OpenTelemetry span도 생성
+            (SDK/exporter는 배포 환경에서 설정, 설정이 없으면 OpenTelemetry API가 no-op으로 동작)
+  - none  : 내보내지 않음 (Server-Timing 헤더만)
+"""
+import contextvars
+import functools
+import logging
+import time
+import uuid
+from collections import deque
+from contextlib import contextmanager, nullcontext
+from typing import Any, Deque, Dict, Iterator, List, Optional
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+_current_trace: contextvars.ContextVar[Optional["Trace"]] = contextvars.ContextVar("trace", default=None)
+_current_span: contextvars.ContextVar[Optional["Span"]] = contextvars.ContextVar("span", default=None)
+
+
+def _otel_tracer():
+    """opentelemetry-api가 설치되어 있을 때만 OpenTelemetry tracer 사용"""
+    try:
+        from opentelemetry import trace
+    except ImportError:
+        logger.warning("TRACING_EXPORTER=otel 이지만 opentelemetry-api가 설치되어 있지 않아 memory로 기록합니다")
+        return None
+    return trace.get_tracer("historical-place-api")
+
+
+def _otel_attributes(attributes: Dict[str, Any]) -> Dict[str, Any]:
+    # OpenTelemetry 속성 값은 str/bool/int/float만 허용
+    return {
+        key: value if isinstance(value, (str, bool, int, float)) else str(value)
+        for key, value in attributes.items() if value is not None
+    }
+
+
+class Span:
+    __slots__ = ("name", "span_id", "parent_id", "start", "duration_ms", "attributes", "error")
+
+    def __init__(self, name: str, parent_id: Optional[str], attributes: Dict[str, Any]):
+        self.name = name
+        self.span_id = uuid.uuid4().hex[:16]
+        self.parent_id = parent_id
+        self.start = time.perf_counter()
+        self.duration_ms: Optional[float] = None
+        self.attributes = attributes
+        self.error: Optional[str] = None
+
+    def set(self, **attributes) -> None:
+        self.attributes.update(attributes)
+
+    def to_dict(self, trace_start: float) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "start_ms": round((self.start - trace_start) * 1000, 3),
+            "duration_ms": round(self.duration_ms, 3) if self.duration_ms is not None else None,
+            "attributes": self.attributes,
+            "error": self.error,
+        }
+
+
+class Trace:
+    """요청(또는 분석 작업) 하나의 구간 기록"""
+
+    def __init__(self, name: str, request_id: Optional[str] = None, **attributes):
+        self.trace_id = uuid.uuid4().hex
+        self.name = name
+        self.request_id = request_id
+        self.attributes = attributes
+        self.start = time.perf_counter()
+        self.started_at = time.time()
+        self.duration_ms: Optional[float] = None
+        self.spans: List[Span] = []
+
+    def elapsed_ms(self) -> float:
+        return (time.perf_counter() - self.start) * 1000
+
+    def stages(self) -> Dict[str, Dict[str, Any]]:
+        """구간 이름별 합계 시간과 횟수 (끝난 구간만)"""
+        stages: Dict[str, Dict[str, Any]] = {}
+        for span in self.spans:
+            if span.duration_ms is None:
+                continue
+            stage = stages.setdefault(span.name, {"ms": 0.0, "count": 0})
+            stage["ms"] += span.duration_ms
+            stage["count"] += 1
+        for stage in stages.values():
+            stage["ms"] = round(stage["ms"], 3)
+        return stages
+
+    def server_timing(self) -> str:
+        entries = []
+        for name, stage in self.stages().items():
+            desc = f';desc="x{stage["count"]}"' if stage["count"] > 1 else ""
+            entries.append(f"{name}{desc};dur={stage['ms']:.1f}")
+        entries.append(f"total;dur={self.elapsed_ms():.1f}")
+        return ", ".join(entries)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "trace_id": self.trace_id,
+            "name": self.name,
+            "request_id": self.request_id,
+            "attributes": self.attributes,
+            "started_at": self.started_at,
+            "duration_ms": round(self.duration_ms if self.duration_ms is not None else self.elapsed_ms(), 3),
+            "spans": [span.to_dict(self.start) for span in self.spans],
+        }
+
+
+class Tracer:
+    """
+    Trace 생성/종료와 내보내기 (TRACING_EXPORTER)
+    """
+
+    def __init__(self, enabled: bool, exporter: str, max_traces: int):
+        if exporter not in ("memory", "otel", "none"):
+            raise ValueError(f"Unknown TRACING_EXPORTER: {exporter}")
+        self.enabled = enabled
+        self._otel = _otel_tracer() if enabled and exporter == "otel" else None
+        self.exporter = "memory" if exporter == "otel" and self._otel is None else exporter
+        self._recent: Deque[Dict[str, Any]] = deque(maxlen=max(1, max_traces))
+        self.traces = 0
+        self.spans = 0
+
+    def _otel_span(self, name: str, attributes: Dict[str, Any]):
+        if self._otel is None:
+            return nullcontext()
+        return self._otel.start_as_current_span(name, attributes=_otel_attributes(attributes))
+
+    @contextmanager
+    def start_trace(self, name: str, request_id: Optional[str] = None, **attributes) -> Iterator[Optional[Trace]]:
+        if not self.enabled:
+            yield None
+            return
+        trace = Trace(name, request_id, **attributes)
+        trace_token = _current_trace.set(trace)
+        span_token = _current_span.set(None)
+        try:
+            with self._otel_span(name, {"request_id": request_id, **attributes}):
+                yield trace
+        finally:
+            trace.duration_ms = trace.elapsed_ms()
+            _current_span.reset(span_token)
+            _current_trace.reset(trace_token)
+            self._finish(trace)
+
+    @contextmanager
+    def span(self, name: str, **attributes) -> Iterator[Optional[Span]]:
+        trace = _current_trace.get()
+        if trace is None:
+            yield None
+            return
+        parent = _current_span.get()
+        record = Span(name, parent.span_id if parent else None, attributes)
+        trace.spans.append(record)
+        token = _current_span.set(record)
+        try:
+            with self._otel_span(name, {"request_id": trace.request_id, **attributes}):
+                yield record
+        except BaseException as e:
+            record.error = type(e).__name__
+            raise
+        finally:
+            record.duration_ms = (time.perf_counter() - record.start) * 1000
+            _current_span.reset(token)
+
+    def _finish(self, trace: Trace) -> None:
+        self.traces += 1
+        self.spans += len(trace.spans)
+        if self.exporter == "memory":
+            self._recent.append(trace.to_dict())
+
+    def recent(self, request_id: Optional[str] = None, limit: int = 20) -> List[Dict[str, Any]]:
+        traces = [trace for trace in reversed(self._recent) if request_id is None or trace["request_id"] == request_id]
+        return traces[:limit]
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "exporter": self.exporter,
+            "traces": self.traces,
+            "spans": self.spans,
+            "retained": len(self._recent),
+        }
+
+
+tracer = Tracer(
+    enabled=settings.TRACING_ENABLED,
+    exporter=settings.TRACING_EXPORTER,
+    max_traces=settings.TRACING_MEMORY_MAX_TRACES,
+)
+
+start_trace = tracer.start_trace
+span = tracer.span
+
+
+def current_trace() -> Optional[Trace]:
+    return _current_trace.get()
+
+
+def tag_request(request_id: str) -> None:
+    """현재 Trace에 request_id 기록 (핸들러가 request_id를 만든 뒤 호출)"""
+    trace = _current_trace.get()
+    if trace is not None:
+        trace.request_id = request_id
+
+
+def traced(name: str, **attributes):
+    """async 함수 전체를 span으로 감싸는 데코레이터"""
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            with span(name, **attributes):
+                return await func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def debug_timing() -> Dict[str, Any]:
+    """
+    TRACING_DEBUG_RESPONSE일 때 응답 JSON에 넣을 단계별 시간 ({"timing": ...}), 아니면 빈 dict
+    """
+    trace = _current_trace.get()
+    if trace is None or not settings.TRACING_DEBUG_RESPONSE:
+        return {}
+    return {"timing": {"trace_id": trace.trace_id, "total_ms": round(trace.elapsed_ms(), 3), "stages": trace.stages()}}
+
+
+class TracingMiddleware:
+    """
+    HTTP 요청마다 Trace를 시작하고 응답 헤더에 Server-Timing을 추가합니다 (ASGI 미들웨어).
+    스트리밍 응답은 헤더를 보내는 시점까지 끝난 구간만 포함됩니다.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not tracer.enabled:
+            await self.app(scope, receive, send)
+            return
+
+        with start_trace(f"{scope['method']} {scope['path']}", method=scope["method"], path=scope["path"]) as trace:
+            async def send_with_timing(message):
+                if message["type"] == "http.response.start":
+                    headers = list(message.get("headers", []))
+                    headers.append((b"server-timing", trace.server_timing().encode("latin-1")))
+                    message = {**message, "headers": headers}
+                await send(message)
+
+            await self.app(scope, receive, send_with_timing)
+
+
+def tracing_stats() -> Dict[str, Any]:
+    return tracer.snapshot()
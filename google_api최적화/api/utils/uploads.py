@@ -0,0 +1,275 @@
+"""
+업로드 수신 - 요청 본문 크기를 수신 중에 제한하고, 매직 넘버로 형식을 판별합니다.
+
+- UploadSizeLimitMiddleware: Content-Length 또는 실제 수신 바이트가 한도를 넘으면
+  multipart 파싱이 본문 전체를 받기 전에 413으로 중단
+- read_image_upload: 파일 앞부분으로 형식을 판별하고, 큰 파일은 스풀된 임시 파일을
+  mmap으로 열어 요청당 메모리 사용량을 UPLOAD_SPOOL_MAX_MEMORY 수준으로 유지
+- spool_request_body / open_image_archive: 앨범 일괄 업로드용 zip/tar 본문을 임시 파일로
+  받은 뒤 이미지 항목을 하나씩 읽음 (한 번에 한 항목만 메모리에 올림)
+"""
+import logging
+import mmap
+import os
+import tarfile
+import tempfile
+import zipfile
+from typing import Any, AsyncIterator, Dict, Iterator, Optional, Tuple, Union
+
+from fastapi import HTTPException, UploadFile
+from starlette.concurrency import run_in_threadpool
+
+from config import settings
+from utils.image_context import ImageContext
+from utils.responses import create_error_response
+
+logger = logging.getLogger(__name__)
+
+SNIFF_BYTES = 32
+
+
+def sniff_image_type(head: bytes) -> Optional[str]:
+    """파일 앞부분의 매직 넘버로 Content-Type 판별 (지원하지 않는 형식이면 None)"""
+    if head.startswith(b'\xff\xd8\xff'):
+        return 'image/jpeg'
+    if head.startswith(b'\x89PNG\r\n\x1a\n'):
+        return 'image/png'
+    if head[:4] == b'RIFF' and head[8:12] == b'WEBP':
+        return 'image/webp'
+    return None
+
+
+def _file_size(fileobj) -> int:
+    position = fileobj.tell()
+    fileobj.seek(0, os.SEEK_END)
+    size = fileobj.tell()
+    fileobj.seek(position)
+    return size
+
+
+def _map_file(fileobj) -> mmap.mmap:
+    # SpooledTemporaryFile.fileno()는 메모리에 있던 내용을 디스크로 옮긴 뒤 fd를 반환
+    fileobj.flush()
+    return mmap.mmap(fileobj.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def _too_large_detail() -> str:
+    return f"File size too large. Maximum size is {settings.MAX_FILE_SIZE} bytes"
+
+
+def _body_too_large_detail(limit: int) -> str:
+    return f"Request body too large. Maximum size is {limit} bytes"
+
+
+async def read_image_upload(file: UploadFile) -> ImageContext:
+    """
+    업로드 파일을 검증하고 ImageContext로 읽어 옵니다.
+    클라이언트가 보낸 Content-Type 대신 파일 시그니처로 형식을 판별합니다.
+    큰 파일은 mmap으로 읽으므로 호출부는 처리가 끝나면 ImageContext.close()를 호출해야 합니다.
+    """
+    await file.seek(0)
+    content_type = sniff_image_type(await file.read(SNIFF_BYTES))
+    if content_type is None or content_type not in settings.ALLOWED_IMAGE_TYPES:
+        raise HTTPException(
+            status_code=415,
+            detail=f"Unsupported file type. Allowed types: {', '.join(settings.ALLOWED_IMAGE_TYPES)}"
+        )
+
+    size = file.size if file.size is not None else await run_in_threadpool(_file_size, file.file)
+    if size > settings.MAX_FILE_SIZE:
+        raise HTTPException(status_code=413, detail=_too_large_detail())
+
+    if size <= settings.UPLOAD_SPOOL_MAX_MEMORY:
+        await file.seek(0)
+        return ImageContext(await file.read(), content_type)
+
+    # 큰 파일은 임시 파일을 그대로 매핑 (페이지 캐시를 사용하므로 힙에 복사되지 않음)
+    return ImageContext(await run_in_threadpool(_map_file, file.file), content_type)
+
+
+async def spool_request_body(request, max_size: int) -> tempfile.SpooledTemporaryFile:
+    """
+    요청 본문을 임시 파일로 받습니다 (UPLOAD_SPOOL_MAX_MEMORY까지는 메모리, 넘으면 디스크).
+    수신한 바이트가 max_size를 넘으면 나머지를 받지 않고 413으로 중단합니다.
+    """
+    content_length = request.headers.get("content-length")
+    if content_length and content_length.isdigit() and int(content_length) > max_size:
+        raise HTTPException(status_code=413, detail=_body_too_large_detail(max_size))
+
+    spool = tempfile.SpooledTemporaryFile(max_size=settings.UPLOAD_SPOOL_MAX_MEMORY)
+    received = 0
+    try:
+        async for chunk in request.stream():
+            received += len(chunk)
+            if received > max_size:
+                raise HTTPException(status_code=413, detail=_body_too_large_detail(max_size))
+            # 메모리 한도를 넘는 쓰기부터는 디스크로 옮기기(rollover)/디스크 쓰기이므로 스레드에서 실행
+            if received > settings.UPLOAD_SPOOL_MAX_MEMORY:
+                await run_in_threadpool(spool.write, chunk)
+            else:
+                spool.write(chunk)
+        spool.seek(0)
+        return spool
+    except BaseException:
+        spool.close()
+        raise
+
+
+def _is_hidden_member(name: str) -> bool:
+    # macOS 압축 시 생기는 리소스 포크(__MACOSX/, ._파일)와 숨김 파일 제외
+    base = os.path.basename(name)
+    return name.startswith("__MACOSX/") or base.startswith(".") or not base
+
+
+def open_image_archive(fileobj) -> Iterator[Tuple[str, Optional[bytes]]]:
+    """
+    zip/tar(gz/bz2/xz) 본문을 열고, 파일 항목을 (이름, 내용) 순서대로 읽는 이터레이터를 반환합니다.
+    MAX_FILE_SIZE보다 큰 항목은 읽지 않고 내용을 None으로 반환합니다.
+    압축 형식이 아니면 바로 ValueError가 발생하고, 항목 읽기는 블로킹 I/O이므로 next()를 스레드에서 호출합니다.
+    """
+    fileobj.seek(0)
+    if zipfile.is_zipfile(fileobj):
+        fileobj.seek(0)
+        return _iter_zip(zipfile.ZipFile(fileobj))
+
+    fileobj.seek(0)
+    try:
+        return _iter_tar(tarfile.open(fileobj=fileobj, mode="r:*"))
+    except tarfile.TarError:
+        raise ValueError("Unsupported archive format")
+
+
+def _iter_zip(archive: zipfile.ZipFile) -> Iterator[Tuple[str, Optional[bytes]]]:
+    with archive:
+        for info in archive.infolist():
+            if info.is_dir() or _is_hidden_member(info.filename):
+                continue
+            if info.file_size > settings.MAX_FILE_SIZE:
+                yield info.filename, None
+                continue
+            yield info.filename, archive.read(info)
+
+
+def _iter_tar(archive: tarfile.TarFile) -> Iterator[Tuple[str, Optional[bytes]]]:
+    with archive:
+        for member in archive:
+            if not member.isfile() or _is_hidden_member(member.name):
+                continue
+            if member.size > settings.MAX_FILE_SIZE:
+                yield member.name, None
+                continue
+            yield member.name, archive.extractfile(member).read()
+
+
+def upload_error(e: HTTPException) -> Dict[str, Any]:
+    """일괄 업로드에서 사진 하나의 오류 정보 (요청 전체를 실패시키지 않고 결과 줄로 보고)"""
+    return {"error": getattr(e, "error", "HTTP_ERROR"), "status_code": e.status_code, "message": str(e.detail)}
+
+
+async def read_album_upload(file: UploadFile) -> Union[ImageContext, Dict[str, Any]]:
+    """앨범 업로드 파일 하나 읽기 (형식/크기가 맞지 않으면 예외 대신 오류 정보 반환)"""
+    try:
+        return await read_image_upload(file)
+    except HTTPException as e:
+        return upload_error(e)
+
+
+async def iter_archive_photos(members: Iterator[Tuple[str, Optional[bytes]]],
+                              fileobj) -> AsyncIterator[Tuple[str, Union[ImageContext, Dict[str, Any]]]]:
+    """
+    open_image_archive 항목을 (이름, ImageContext 또는 오류 정보)로 반환합니다.
+    다음 항목은 요청할 때만 스레드에서 읽으며, 끝나면 압축 파일과 임시 파일을 닫습니다.
+    """
+    try:
+        while True:
+            member = await run_in_threadpool(next, members, None)
+            if member is None:
+                return
+            name, data = member
+            if data is None:
+                yield name, upload_error(HTTPException(status_code=413, detail=_too_large_detail()))
+                continue
+            content_type = sniff_image_type(data[:SNIFF_BYTES])
+            if content_type is None or content_type not in settings.ALLOWED_IMAGE_TYPES:
+                yield name, upload_error(HTTPException(
+                    status_code=415,
+                    detail=f"Unsupported file type. Allowed types: {', '.join(settings.ALLOWED_IMAGE_TYPES)}"
+                ))
+                continue
+            yield name, ImageContext(data, content_type)
+    finally:
+        members.close()
+        fileobj.close()
+
+
+class UploadSizeLimitMiddleware:
+    """
+    multipart 요청 본문 크기 제한 (ASGI 미들웨어)
+
+    Content-Length가 한도를 넘으면 본문을 읽지 않고 바로 413을 반환하고,
+    chunked 전송은 수신한 바이트를 세다가 한도를 넘는 순간 413으로 중단합니다.
+    path_limits의 경로(접두사)는 기본 한도 대신 지정한 한도를 사용합니다 (일괄 업로드 등).
+    """
+
+    def __init__(self, app, max_body_size: int, path_limits: Optional[Dict[str, int]] = None):
+        self.app = app
+        self.max_body_size = max_body_size
+        self.path_limits = path_limits or {}
+
+    def _limit(self, scope) -> int:
+        path = scope.get("path", "")
+        for prefix, limit in self.path_limits.items():
+            if path.startswith(prefix):
+                return limit
+        return self.max_body_size
+
+    def _detail(self, limit: int) -> str:
+        return _too_large_detail() if limit == self.max_body_size else _body_too_large_detail(limit)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self._is_multipart(scope):
+            await self.app(scope, receive, send)
+            return
+
+        limit = self._limit(scope)
+        content_length = self._content_length(scope)
+        if content_length is not None and content_length > limit:
+            logger.warning(f"업로드 거부 (Content-Length {content_length} bytes): {scope.get('path')}")
+            response = create_error_response(
+                status_code=413,
+                error="HTTP_ERROR",
+                message=self._detail(limit)
+            )
+            await response(scope, receive, send)
+            return
+
+        received = 0
+
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > limit:
+                    # FastAPI 폼 파싱 중 발생하므로 HTTPException 핸들러가 413 응답을 만듦
+                    raise HTTPException(status_code=413, detail=self._detail(limit))
+            return message
+
+        await self.app(scope, limited_receive, send)
+
+    @staticmethod
+    def _is_multipart(scope) -> bool:
+        for name, value in scope.get("headers", []):
+            if name == b"content-type":
+                return value.lower().startswith(b"multipart/form-data")
+        return False
+
+    @staticmethod
+    def _content_length(scope) -> Optional[int]:
+        for name, value in scope.get("headers", []):
+            if name == b"content-length":
+                try:
+                    return int(value)
+                except ValueError:
+                    return None
+        return None
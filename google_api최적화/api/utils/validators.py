@@ -1,7 +1,10 @@
+import uuid
 from fastapi import HTTPException, UploadFile
-from PIL import Image
-import io
+from typing import Union
 from config import settings
+from utils.image_context import ImageContext, inspect_image
+from utils.image_executor import image_executor
+from utils.tracing import traced
 
 def validate_image_file(file: UploadFile) -> None:
     """
@@ -21,27 +24,65 @@ def validate_image_file(file: UploadFile) -> None:
             detail=f"Unsupported file type. Allowed types: {', '.join(settings.ALLOWED_IMAGE_TYPES)}"
         )
 
-def validate_image_content(image_data: bytes) -> None:
+def validate_image_content(image_data: Union[bytes, ImageContext]) -> None:
     """
     이미지 데이터의 내용을 검증합니다.
+    ImageContext를 넘기면 검증 중 읽은 헤더/EXIF를 이후 단계에서 재사용합니다.
     """
+    image = ImageContext.ensure(image_data)
+    
     try:
-        # PIL로 이미지 열기 시도
-        image = Image.open(io.BytesIO(image_data))
-        image.verify()  # 이미지 무결성 검사
-        
-        # 이미지 크기 제한 (선택사항)
-        if image.size[0] > 4096 or image.size[1] > 4096:
-            raise HTTPException(
-                status_code=413,
-                detail="Image dimensions too large. Maximum size is 4096x4096 pixels"
-            )
-            
+        # PIL로 이미지 열기 시도 및 무결성 검사
+        image.verify()
+        width, height = image.dimensions
     except Exception as e:
         raise HTTPException(
             status_code=400,
             detail=f"Invalid image file: {str(e)}"
         )
+    
+    _check_dimensions(width, height)
+
+@traced("validate")
+async def validate_image_content_async(image_data: Union[bytes, ImageContext]) -> None:
+    """
+    validate_image_content와 같지만 디코드/무결성 검사를 이미지 작업 실행기에서 실행합니다.
+    실행기가 포화 상태면 503 (Retry-After) APIException이 발생합니다.
+    """
+    image = ImageContext.ensure(image_data)
+    
+    summary = await image_executor.run("validate", inspect_image, image_executor.payload(image))
+    if summary['error'] is not None:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid image file: {summary['error']}"
+        )
+    image.apply_inspection(summary)
+    
+    _check_dimensions(*image.dimensions)
+
+def validate_image_header(image: ImageContext) -> None:
+    """
+    이미지 앞부분(헤더)만으로 형식과 크기를 검증합니다.
+    S3 직접 업로드처럼 본문 전체를 받지 않는 경로용이며, 픽셀 무결성 검사는 분석 단계에서 합니다.
+    """
+    try:
+        width, height = image.dimensions
+    except Exception as e:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid image file: {str(e)}"
+        )
+    
+    _check_dimensions(width, height)
+
+def _check_dimensions(width: int, height: int) -> None:
+    # 이미지 크기 제한 (선택사항)
+    if width > 4096 or height > 4096:
+        raise HTTPException(
+            status_code=413,
+            detail="Image dimensions too large. Maximum size is 4096x4096 pixels"
+        )
 
 def validate_gps_coordinates(latitude: float, longitude: float) -> None:
     """
@@ -65,6 +106,20 @@ def validate_gps_coordinates(latitude: float, longitude: float) -> None:
         import logging
         logging.warning(f"GPS coordinates outside Korea region: {latitude}, {longitude}")
 
+def validate_upload_id(upload_id: str) -> None:
+    """
+    직접 업로드 ID 검증 - create_direct_upload가 발급한 UUID 형식만 허용합니다.
+    """
+    try:
+        valid = str(uuid.UUID(upload_id)) == upload_id
+    except (TypeError, ValueError):
+        valid = False
+    if not valid:
+        raise HTTPException(
+            status_code=400,
+            detail="Invalid upload ID format"
+        )
+
 def validate_request_id(request_id: str) -> None:
     """
     요청 ID의 형식을 검증합니다.
@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+분석 워커 - SQS 분석 요청 큐를 소비합니다.
+
+실행: python worker.py  (API 서버는 ANALYSIS_QUEUE_BACKEND=sqs 로 실행)
+
+- ReceiveMessage long-poll(WORKER_WAIT_TIME)로 받고 WORKER_MAX_IN_FLIGHT개까지 동시에 처리
+- 처리 중인 메시지는 가시성 제한 시간의 절반마다 연장해 느린 분석이 다른 워커에 중복 전달되지 않게 함
+- 완료된 메시지는 DeleteMessageBatch로 모아 삭제
+- 실패한 메시지는 백오프 후 다시 받도록 두고, WORKER_MAX_RECEIVES번째 실패면 FAILED 보고 후 삭제
+- SIGINT/SIGTERM: 새 메시지 수신을 멈추고 처리 중인 메시지를 마친 뒤 종료
+- WORKER_METRICS_PORT를 지정하면 업스트림(S3/SQS/Textract 등) 호출 메트릭을 Prometheus 형식으로 노출
+"""
+import asyncio
+import json
+import logging
+import signal
+import time
+from typing import Any, Dict, List, Optional, Set
+
+from config import settings
+from services.analysis_pipeline import ResultReporter, analyze_message, create_reporter, resolve_payload
+from services.sqs_service import sqs_service
+from utils.http_client import http_client
+from utils.metrics import loop_lag_monitor, registry
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger("worker")
+
+
+class DeleteBatcher:
+    """처리 완료된 메시지의 receipt handle을 모아 DeleteMessageBatch로 삭제"""
+
+    def __init__(self, queue_url: str, max_wait: float = 0.5):
+        self.queue_url = queue_url
+        self.max_wait = max_wait
+        self._handles: List[str] = []
+        self._timer: Optional[asyncio.Task] = None
+        self._inflight: Set[asyncio.Task] = set()
+        self.deleted = 0
+
+    def add(self, receipt_handle: str) -> None:
+        self._handles.append(receipt_handle)
+        if len(self._handles) >= 10:
+            self._flush_now()
+        elif self._timer is None:
+            self._timer = asyncio.ensure_future(self._flush_later())
+
+    async def close(self) -> None:
+        if self._handles:
+            self._flush_now()
+        if self._inflight:
+            await asyncio.gather(*self._inflight, return_exceptions=True)
+
+    async def _flush_later(self) -> None:
+        await asyncio.sleep(self.max_wait)
+        self._timer = None
+        if self._handles:
+            self._flush_now()
+
+    def _flush_now(self) -> None:
+        handles, self._handles = self._handles, []
+        if self._timer is not None and self._timer is not asyncio.current_task():
+            self._timer.cancel()
+        self._timer = None
+        task = asyncio.ensure_future(self._delete(handles))
+        self._inflight.add(task)
+        task.add_done_callback(self._inflight.discard)
+
+    async def _delete(self, handles: List[str]) -> None:
+        try:
+            response = await sqs_service.delete_message_batch(handles, queue_url=self.queue_url)
+            self.deleted += len(response.get('Successful', []))
+            for failed in response.get('Failed', []):
+                logger.warning(f"메시지 삭제 실패 (가시성 만료 후 다시 전달됨): {failed}")
+        except Exception as e:
+            logger.error(f"메시지 일괄 삭제 실패 ({len(handles)}건): {e}")
+
+
+class AnalysisWorker:
+    def __init__(self, queue_url: str, reporter: ResultReporter,
+                 max_in_flight: int = settings.WORKER_MAX_IN_FLIGHT,
+                 wait_time: int = settings.WORKER_WAIT_TIME,
+                 visibility_timeout: int = settings.WORKER_VISIBILITY_TIMEOUT,
+                 max_receives: int = settings.WORKER_MAX_RECEIVES,
+                 job_timeout: float = settings.WORKER_JOB_TIMEOUT):
+        self.queue_url = queue_url
+        self.reporter = reporter
+        self.max_in_flight = max_in_flight
+        self.wait_time = wait_time
+        self.visibility_timeout = visibility_timeout
+        self.max_receives = max_receives
+        self.job_timeout = job_timeout
+        self.deleter = DeleteBatcher(queue_url)
+        self._active: Set[asyncio.Task] = set()
+        self._stopping = asyncio.Event()
+        self.stats = {"received": 0, "completed": 0, "retried": 0, "failed": 0, "extended": 0}
+        self._job_ms_total = 0.0
+
+    def stop(self) -> None:
+        if not self._stopping.is_set():
+            logger.info(f"종료 요청: 처리 중인 메시지 {len(self._active)}건을 마친 뒤 종료합니다")
+            self._stopping.set()
+
+    async def run(self) -> None:
+        logger.info(f"분석 워커 시작: {self.queue_url} (동시 {self.max_in_flight}, 파이프라인 {settings.ANALYSIS_PIPELINE})")
+        while not self._stopping.is_set():
+            free = self.max_in_flight - len(self._active)
+            if free <= 0:
+                await asyncio.wait(self._active, return_when=asyncio.FIRST_COMPLETED)
+                continue
+
+            messages = await self._receive(min(10, free))
+            for message in messages:
+                task = asyncio.ensure_future(self._handle(message))
+                self._active.add(task)
+                task.add_done_callback(self._active.discard)
+
+        if self._active:
+            await asyncio.gather(*self._active, return_exceptions=True)
+        await self.deleter.close()
+        logger.info(f"분석 워커 종료: {self.snapshot()}")
+
+    def snapshot(self) -> Dict[str, Any]:
+        completed = self.stats["completed"] or 1
+        return {**self.stats, "deleted": self.deleter.deleted, "in_flight": len(self._active),
+                "job_ms_avg": round(self._job_ms_total / completed, 1)}
+
+    async def _receive(self, max_messages: int) -> List[Dict[str, Any]]:
+        """long-poll 수신 (종료 요청이 오면 기다리지 않고 반환)"""
+        receive = asyncio.ensure_future(sqs_service.receive_messages(
+            max_messages, self.wait_time, self.visibility_timeout, queue_url=self.queue_url
+        ))
+        stopping = asyncio.ensure_future(self._stopping.wait())
+        done, _ = await asyncio.wait({receive, stopping}, return_when=asyncio.FIRST_COMPLETED)
+        stopping.cancel()
+        if receive not in done:
+            # 이미 받은 메시지는 가시성 제한 시간이 지나면 다시 전달됨
+            receive.cancel()
+            return []
+        try:
+            messages = receive.result()
+        except Exception as e:
+            logger.error(f"메시지 수신 실패: {e}")
+            await asyncio.sleep(1)
+            return []
+        self.stats["received"] += len(messages)
+        return messages
+
+    async def _handle(self, message: Dict[str, Any]) -> None:
+        handle = message['ReceiptHandle']
+        receive_count = int(message.get('Attributes', {}).get('ApproximateReceiveCount', 1))
+        try:
+            body = json.loads(message['Body'])
+            request_id = body['request_id']
+        except (ValueError, KeyError) as e:
+            logger.error(f"처리할 수 없는 메시지 삭제: {e}")
+            self.stats["failed"] += 1
+            self.deleter.add(handle)
+            return
+
+        heartbeat = asyncio.ensure_future(self._extend_visibility(handle))
+        start = time.perf_counter()
+        try:
+            payload = await resolve_payload(body)
+            await asyncio.wait_for(analyze_message(payload, self.reporter), timeout=self.job_timeout)
+            self._job_ms_total += (time.perf_counter() - start) * 1000
+            self.stats["completed"] += 1
+            self.deleter.add(handle)
+            logger.info(f"분석 완료: {request_id} ({(time.perf_counter() - start) * 1000:.0f}ms)")
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            await self._handle_failure(request_id, handle, receive_count, e)
+        finally:
+            heartbeat.cancel()
+
+    async def _handle_failure(self, request_id: str, handle: str, receive_count: int, error: Exception) -> None:
+        if receive_count >= self.max_receives:
+            logger.error(f"분석 실패 ({receive_count}회), FAILED 처리: {request_id} - {error}")
+            self.stats["failed"] += 1
+            try:
+                await self.reporter.fail(request_id, f"Analysis failed: {error}")
+            except Exception as e:
+                logger.error(f"실패 보고 실패: {request_id} - {e}")
+            self.deleter.add(handle)
+            return
+
+        # 백오프 후 다시 전달되도록 가시성 제한 시간을 줄임
+        backoff = min(self.visibility_timeout, 5 * 2 ** (receive_count - 1))
+        logger.warning(f"분석 실패 ({receive_count}회), {backoff}s 후 재시도: {request_id} - {error}")
+        self.stats["retried"] += 1
+        try:
+            await sqs_service.change_visibility(handle, backoff, queue_url=self.queue_url)
+        except Exception as e:
+            logger.warning(f"재시도 가시성 변경 실패 (기존 제한 시간 후 재전달): {e}")
+
+    async def _extend_visibility(self, handle: str) -> None:
+        """처리하는 동안 가시성 제한 시간의 절반마다 연장"""
+        interval = max(1.0, self.visibility_timeout / 2)
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await sqs_service.change_visibility(handle, self.visibility_timeout, queue_url=self.queue_url)
+                self.stats["extended"] += 1
+            except Exception as e:
+                logger.warning(f"가시성 연장 실패: {e}")
+
+
+async def main() -> None:
+    if not settings.SQS_QUEUE_URL:
+        raise SystemExit("SQS_QUEUE_URL이 설정되지 않았습니다")
+
+    if settings.WORKER_METRICS_PORT:
+        from prometheus_client import start_http_server
+
+        start_http_server(settings.WORKER_METRICS_PORT, registry=registry)
+        loop_lag_monitor.start()
+        logger.info(f"메트릭 노출: :{settings.WORKER_METRICS_PORT}/metrics")
+
+    worker = AnalysisWorker(settings.SQS_QUEUE_URL, create_reporter())
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, worker.stop)
+    try:
+        await worker.run()
+    finally:
+        await loop_lag_monitor.stop()
+        await http_client.aclose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())